@@ -0,0 +1,128 @@
+#
+# Copyright (c) 2022, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Compare the write and read throughput of parquet write profiles
+
+Example usage::
+
+    python benchmarks/parquet_write_profiles.py --rows 5000000 --cpu
+    python benchmarks/parquet_write_profiles.py --input /path/to/data --cpu
+
+Each profile is used to write the same Dataset with ``Dataset.to_parquet``.
+The output is then read back with a new ``Dataset``. The script reports
+the size of the output, and the write and read throughput (in terms of
+in-memory bytes per second).
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+import merlin.io
+from merlin.io.parquet import ParquetWriteProfile
+from merlin.schema import Tags
+
+PROFILES = {
+    "uncompressed": ParquetWriteProfile(),
+    "snappy": ParquetWriteProfile(compression="snappy"),
+    "lz4": ParquetWriteProfile(compression="lz4"),
+    "zstd-1": ParquetWriteProfile(compression="zstd", compression_level=1),
+    "zstd-9": ParquetWriteProfile(compression="zstd", compression_level=9),
+    "zstd-cats-lz4-conts": ParquetWriteProfile(
+        compression="zstd",
+        column_compression={Tags.CONTINUOUS: "lz4"},
+    ),
+    "zstd-page-index": ParquetWriteProfile(compression="zstd", write_page_index=True),
+}
+
+
+def _synthetic_data(rows, seed=42):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "user_id": rng.integers(0, 1_000_000, rows),
+            "item_id": rng.zipf(1.2, rows) % 100_000,
+            "category": rng.choice([f"category_{i}" for i in range(500)], rows),
+            "price": rng.random(rows).astype("float32"),
+            "timestamp": np.sort(rng.integers(1_600_000_000, 1_700_000_000, rows)),
+            "click": rng.integers(0, 2, rows).astype("int8"),
+        }
+    )
+
+
+def _dir_size(path):
+    return sum(
+        os.path.getsize(os.path.join(root, fn)) for root, _, fns in os.walk(path) for fn in fns
+    )
+
+
+def run(dataset, profiles, output_dir, cpu, repeat):
+    nbytes = dataset.to_ddf().memory_usage(deep=True, index=False).sum().compute()
+    if not cpu:
+        nbytes = int(nbytes)
+    print(f"In-memory size: {nbytes / 1e6:.1f} MB\n")
+    print(f"{'profile':<22}{'size (MB)':>12}{'ratio':>8}{'write (MB/s)':>15}{'read (MB/s)':>15}")
+
+    for name in profiles:
+        profile = PROFILES[name]
+        path = os.path.join(output_dir, name)
+        write_times, read_times = [], []
+        for _ in range(repeat):
+            shutil.rmtree(path, ignore_errors=True)
+            start = time.perf_counter()
+            dataset.to_parquet(path, write_profile=profile)
+            write_times.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            merlin.io.Dataset(path, engine="parquet", cpu=cpu).to_ddf().compute()
+            read_times.append(time.perf_counter() - start)
+
+        size = _dir_size(path)
+        print(
+            f"{name:<22}{size / 1e6:>12.1f}{nbytes / size:>8.2f}"
+            f"{nbytes / 1e6 / min(write_times):>15.1f}{nbytes / 1e6 / min(read_times):>15.1f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--input", help="Parquet dataset to rewrite (default: synthetic data)")
+    parser.add_argument("--rows", type=int, default=2_000_000, help="Rows of synthetic data")
+    parser.add_argument("--output", help="Output directory (default: temporary directory)")
+    parser.add_argument("--profiles", nargs="+", default=list(PROFILES), choices=list(PROFILES))
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per profile (best is kept)")
+    parser.add_argument("--cpu", action="store_true", help="Use the CPU reader and writer")
+    args = parser.parse_args()
+
+    if args.input:
+        dataset = merlin.io.Dataset(args.input, engine="parquet", cpu=args.cpu)
+    else:
+        dataset = merlin.io.Dataset(_synthetic_data(args.rows), cpu=args.cpu)
+        dataset.schema["price"] = dataset.schema["price"].with_tags([Tags.CONTINUOUS])
+
+    output_dir = args.output or tempfile.mkdtemp()
+    try:
+        run(dataset, args.profiles, output_dir, args.cpu, args.repeat)
+    finally:
+        if not args.output:
+            shutil.rmtree(output_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
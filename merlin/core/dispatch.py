@@ -290,7 +290,10 @@ def list_val_dtype(ser: SeriesLike) -> np.dtype:
                 ser = ser.list.leaves
             return ser.dtype
         elif isinstance(ser, pd.Series):
-            return pd.core.dtypes.cast.infer_dtype_from(next(iter(pd.core.common.flatten(ser))))[0]
+            for leaf in pd.core.common.flatten(ser):
+                return pd.core.dtypes.cast.infer_dtype_from(leaf)[0]
+            # Only empty lists - The element type is unknown
+            return None
     if isinstance(ser, np.ndarray):
         return ser.dtype
     # adds detection when in merlin column
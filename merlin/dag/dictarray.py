@@ -16,6 +16,8 @@
 from typing import Dict, Optional
 
 import numpy as np
+import pandas as pd
+import pyarrow as pa
 
 import merlin.dtypes as md
 from merlin.core.protocols import SeriesLike
@@ -38,6 +40,93 @@ class Column(SeriesLike):
     def __eq__(self, other):
         return all(self.values == other.values) and self.dtype == other.dtype
 
+    def __len__(self):
+        return len(self.values)
+
+    @property
+    def __array_interface__(self):
+        # Expose the buffer of the underlying host array, so that
+        # `np.asarray(column)` and friends don't need to copy
+        return self.values.__array_interface__
+
+    def __dlpack__(self, stream=None):
+        if stream is None:
+            return self.values.__dlpack__()
+        return self.values.__dlpack__(stream=stream)
+
+    def __dlpack_device__(self):
+        return self.values.__dlpack_device__()
+
+    def to_tensor(self, framework: str):
+        """
+        Convert this column to a tensor from another framework
+
+        The data is shared through DLPack whenever the underlying array
+        and the target framework support it. Otherwise (e.g. for boolean
+        columns, which DLPack can't represent), the values are converted
+        using the framework dtype registered in `merlin.dtypes`.
+
+        Parameters
+        ----------
+        framework : str
+            Name of the target framework ("torch" or "tf")
+
+        Returns
+        -------
+        Any
+            A tensor from the requested framework
+
+        Raises
+        ------
+        ValueError
+            If the framework isn't supported
+        """
+        target_dtype = self.dtype.to(framework)
+
+        if framework in ("torch", "pytorch"):
+            import torch
+
+            try:
+                tensor = torch.from_dlpack(self)
+            except (BufferError, TypeError):
+                tensor = torch.as_tensor(self.values, dtype=target_dtype)
+            return tensor if tensor.dtype == target_dtype else tensor.to(target_dtype)
+
+        if framework in ("tf", "tensorflow"):
+            import tensorflow as tf
+
+            try:
+                tensor = tf.experimental.dlpack.from_dlpack(self.__dlpack__())
+            except (BufferError, TypeError):
+                tensor = tf.convert_to_tensor(self.values, dtype=target_dtype)
+            return tensor if tensor.dtype == target_dtype else tf.cast(tensor, target_dtype)
+
+        raise ValueError(f"Conversion from a Column to {framework} tensors isn't supported.")
+
+    def to_arrow(self) -> pa.Array:
+        """
+        Create an Arrow array from this column
+
+        The conversion is zero-copy for contiguous numeric arrays.
+        Strings, objects and non-contiguous arrays are copied.
+        """
+        return pa.array(self.values)
+
+    @classmethod
+    def from_arrow(cls, array):
+        """
+        Create a column from an Arrow array (or chunked array)
+
+        Numeric arrays without nulls are wrapped without copying. Chunked
+        arrays with more than one chunk have to be combined first.
+        """
+        if isinstance(array, pa.ChunkedArray):
+            if array.num_chunks == 1:
+                array = array.chunk(0)
+            else:
+                array = pa.concat_arrays(array.chunks)
+        return cls(array.to_numpy(zero_copy_only=False))
+
 
 class DictArray:
     """
@@ -121,5 +210,39 @@ class DictArray:
         """
         return DictArray(self.arrays.copy(), self.dtypes.copy())
 
+    def to_arrow(self) -> pa.Table:
+        """
+        Create an Arrow table from the arrays in this DictArray
+
+        The conversion is zero-copy for contiguous numeric arrays.
+        Strings, objects and non-contiguous arrays are copied.
+        """
+        return pa.Table.from_arrays(
+            [pa.array(value) for value in self.arrays.values()], names=self.columns
+        )
+
+    @classmethod
+    def from_arrow(cls, table: pa.Table):
+        """
+        Create a new DictArray from an Arrow table
+
+        Columns are wrapped without copying wherever Arrow allows it
+        (single-chunk numeric columns without nulls).
+        """
+        return cls(
+            {name: Column.from_arrow(table.column(name)).values for name in table.column_names}
+        )
+
+    def to_pandas(self) -> pd.DataFrame:
+        """
+        Create a pandas DataFrame from the arrays in this DictArray
+
+        The conversion is zero-copy for contiguous numeric arrays.
+        Strings, objects and non-contiguous arrays are copied.
+        """
+        # Splitting the blocks keeps Arrow (and pandas) from
+        # consolidating the columns into a single new 2D array
+        return self.to_arrow().to_pandas(split_blocks=True)
+
     def _dtypes_from_values(self, values):
         return {key: value.dtype for key, value in values.items()}
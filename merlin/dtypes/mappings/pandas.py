@@ -22,13 +22,22 @@ from merlin.dtypes.registry import _dtype_registry
 try:
     import pandas as pd
 
+    def pandas_translator(raw_dtype) -> np.dtype:
+        if isinstance(raw_dtype, pd.CategoricalDtype):
+            # Categorical columns have the dtype of their categories
+            category_type = raw_dtype.categories.dtype
+            if category_type == np.dtype("O"):
+                return np.dtype("str")
+            return category_type
+        return np.dtype(raw_dtype.numpy_dtype)
+
     pandas_dtypes = DTypeMapping(
         {
             mn.string: [pd.StringDtype(), pd.StringDtype],
             mn.boolean: [pd.BooleanDtype(), pd.BooleanDtype],
         },
         translator=NumpyPreprocessor(
-            "pandas", lambda raw: np.dtype(raw.numpy_dtype), attrs=["numpy_dtype"]
+            "pandas", pandas_translator, attrs=["numpy_dtype"], classes=[pd.CategoricalDtype]
         ),
     )
     _dtype_registry.register("pandas", pandas_dtypes)
@@ -0,0 +1,81 @@
+#
+# Copyright (c) 2022, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import math
+import uuid
+
+from dask.base import tokenize
+from dask.dataframe.core import new_dd_object
+
+from merlin.io.arrow_utils import _table_to_frame
+from merlin.io.dataset_engine import DatasetEngine
+
+
+class ArrowTableDatasetEngine(DatasetEngine):
+    """ArrowTableDatasetEngine allows NVT to interact with an in-memory
+    ``pyarrow.Table`` in the same way as a dataset on disk.
+
+    The table is split into zero-copy slices (one per partition), and
+    each slice is only converted to a pandas or cudf DataFrame when its
+    partition is computed, so the data is never held in memory twice.
+    """
+
+    def __init__(self, table, npartitions=None, part_size=None, cpu=False):
+        # we're not calling the constructor of the base class - since it has a bunch of
+        # of parameters that assumes we're using files.
+        # pylint: disable=super-init-not-called
+        self.table = table
+        self.cpu = cpu
+        # `id(table)` may be reused by another table once this one is
+        # garbage collected, so it can't be used in the graph names
+        self._token = uuid.uuid4().hex
+
+        # Number of rows in each partition
+        num_rows = table.num_rows
+        if part_size and num_rows:
+            rows_per_part = max(int(part_size / (table.nbytes / num_rows)), 1)
+        else:
+            rows_per_part = max(math.ceil(num_rows / (npartitions or 1)), 1)
+        self.offsets = list(range(0, num_rows, rows_per_part)) or [0]
+
+    def to_ddf(self, columns=None, cpu=None):
+        # Check if we are using cpu
+        cpu = self.cpu if cpu is None else cpu
+        if isinstance(columns, str):
+            columns = [columns]
+        table = self.table if columns is None else self.table.select(columns)
+
+        meta = _table_to_frame(table.schema.empty_table(), cpu)
+        name = "from-arrow-" + tokenize(self._token, self.offsets, columns, cpu)
+        dsk = {
+            (name, i): (_table_to_frame, table.slice(offset, length), cpu)
+            for i, (offset, length) in enumerate(zip(self.offsets, self._partition_lens))
+        }
+        return new_dd_object(dsk, name, meta, [None] * (len(self.offsets) + 1))
+
+    def to_cpu(self):
+        self.cpu = True
+
+    def to_gpu(self):
+        self.cpu = False
+
+    @property
+    def num_rows(self):
+        return self.table.num_rows
+
+    @property
+    def _partition_lens(self):
+        ends = self.offsets[1:] + [self.table.num_rows]
+        return [end - start for start, end in zip(self.offsets, ends)]
@@ -0,0 +1,33 @@
+#
+# Copyright (c) 2022, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+try:
+    import cudf
+except ImportError:
+    cudf = None
+
+
+def _select(table, columns):
+    # Select `columns` (all columns if None) of a `pa.Table`
+    return table if columns is None else table.select(columns)
+
+
+def _table_to_frame(table, cpu):
+    # Convert a `pa.Table` to a pandas (`cpu=True`) or cudf DataFrame
+    if not cpu:
+        return cudf.DataFrame.from_arrow(table)
+    # `split_blocks` avoids consolidating the columns (which would
+    # copy them), so numeric columns without nulls stay zero-copy
+    return table.to_pandas(split_blocks=True)
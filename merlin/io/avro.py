@@ -13,21 +13,36 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+import functools
+import pickle
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 
-import cudf
 import uavro as ua
+
+try:
+    import cudf
+except ImportError:
+    cudf = None
 from dask.base import tokenize
 from dask.dataframe.core import new_dd_object
 
 from merlin.io.dataset_engine import DatasetEngine
+from merlin.io.metadata_cache import get_metadata_cache
 
 
 class AvroDatasetEngine(DatasetEngine):
     """AvroDatasetEngine
 
     Uses `uavro` to decompose dataset into groups of avro blocks.
-    Uses `cudf` to create new partitions.
+    Uses `cudf` to create new partitions (or `uavro` to decode the
+    blocks straight into pandas, with `cpu=True`).
+
+    The block index of every file (the offset, size and row count
+    of each avro block) is scanned once (for all files in parallel),
+    and cached in the process-wide metadata cache. Every piece
+    carries the index of its own blocks, so that `read_partition`
+    can read them without scanning the file again.
     """
 
     def __init__(self, paths, part_size, storage_options=None, cpu=False, **kwargs):
@@ -42,22 +57,17 @@ class AvroDatasetEngine(DatasetEngine):
         if len(self.paths) == 1 and self.fs.isdir(self.paths[0]):
             self.paths = self.fs.glob(self.fs.sep.join([self.paths[0], "*"]))
 
-        if self.cpu:
-            raise ValueError("cpu=True not supported for AvroDatasetEngine.")
-
     def to_ddf(self, columns=None, cpu=None):
 
         # Check if we are using cpu
         cpu = self.cpu if cpu is None else cpu
-        if cpu:
-            raise ValueError("cpu=True not supported for AvroDatasetEngine.")
 
         # Get list of pieces for each output
-        pieces, meta = self.process_metadata(columns=columns)
+        pieces, meta = self.process_metadata(columns=columns, cpu=cpu)
 
         # TODO: Remove warning and avoid use of uavro in read_partition when
         # cudf#6529 is fixed (https://github.com/rapidsai/cudf/issues/6529)
-        if len(pieces) > len(self.paths):
+        if not cpu and len(pieces) > len(self.paths):
             warnings.warn(
                 "Row-subset selection in cudf avro reader is currently broken. "
                 "Using uavro engine until cudf#6529 is addressed. "
@@ -65,93 +75,74 @@ class AvroDatasetEngine(DatasetEngine):
             )
 
         # Construct collection
-        token = tokenize(self.fs, self.paths, self.part_size, columns)
+        token = tokenize(self.fs, self.paths, self.part_size, columns, cpu)
         read_avro_name = "read-avro-partition-" + token
         dsk = {
-            (read_avro_name, i): (AvroDatasetEngine.read_partition, self.fs, piece, columns)
+            (read_avro_name, i): (AvroDatasetEngine.read_partition, self.fs, piece, columns, cpu)
             for i, piece in enumerate(pieces)
         }
         return new_dd_object(dsk, read_avro_name, meta.iloc[:0], [None] * (len(pieces) + 1))
 
     def to_cpu(self):
-        raise ValueError("cpu=True not supported for AvroDatasetEngine.")
+        self.cpu = True
 
     def to_gpu(self):
         self.cpu = False
 
-    def process_metadata(self, columns=None):
-
-        with open(self.paths[0], "rb") as fo:
-            header = ua.core.read_header(fo)
-
-            # Use first block for metadata
-            num_rows = header["blocks"][0]["nrows"]
-            file_byte_count = header["blocks"][0]["size"]
-            meta = cudf.io.read_avro(self.paths[0], skiprows=0, num_rows=num_rows)
-
-            # Convert the desired in-memory GPU size to the expected
-            # on-disk storage size (blocksize)
-            df_byte_count = meta.memory_usage(deep=True).sum()
-            self.blocksize = int(float(file_byte_count) / df_byte_count * self.part_size)
-
-        # Break apart files at the "Avro block" granularity
-        pieces = []
-        for path in self.paths:
-            file_size = self.fs.du(path)
-            if file_size > self.blocksize:
-                part_count = 0
-                with open(path, "rb") as fo:
-                    header = ua.core.read_header(fo)
-                    ua.core.scan_blocks(fo, header, file_size)
-                    blocks = header["blocks"]
-
-                    file_row_offset, part_row_count = 0, 0
-                    file_block_offset, part_block_count = 0, 0
-                    file_byte_offset, part_byte_count = blocks[0]["offset"], 0
-
-                    for i, block in enumerate(blocks):
-                        part_row_count += block["nrows"]
-                        part_block_count += 1
-                        part_byte_count += block["size"]
-                        if part_byte_count >= self.blocksize:
-                            pieces.append(
-                                {
-                                    "path": path,
-                                    "rows": (file_row_offset, part_row_count),
-                                    "blocks": (file_block_offset, part_block_count),
-                                    "bytes": (file_byte_offset, part_byte_count),
-                                }
-                            )
-                            part_count += 1
-                            file_row_offset += part_row_count
-                            file_block_offset += part_block_count
-                            file_byte_offset += part_byte_count
-                            part_row_count = part_block_count = part_byte_count = 0
-
-                    if part_block_count:
-                        pieces.append(
-                            {
-                                "path": path,
-                                "rows": (file_row_offset, part_row_count),
-                                "blocks": (file_block_offset, part_block_count),
-                                "bytes": (file_byte_offset, part_byte_count),
-                            }
-                        )
-                        part_count += 1
-                if part_count == 1:
-                    # No need to specify a byte range since we
-                    # will need to read the entire file anyway.
-                    pieces[-1] = {"path": pieces[-1]["path"]}
-            else:
-                pieces.append({"path": path})
+    @property
+    def num_rows(self):
+        # The block index includes the row count of every block
+        return sum(block["nrows"] for index in self._block_indexes for block in index["blocks"])
+
+    @property  # type: ignore
+    @functools.lru_cache(1)
+    def _partition_lens(self):
+        # Row counts of the blocks of every piece
+        return [sum(block["nrows"] for block in piece["block_index"]) for piece in self._pieces]
+
+    @property  # type: ignore
+    @functools.lru_cache(1)
+    def _block_indexes(self):
+        return _read_block_indexes(self.fs, self.paths)
+
+    @property  # type: ignore
+    @functools.lru_cache(1)
+    def _pieces(self):
+        return _plan_pieces(self.paths, self._block_indexes, self._blocksize)
+
+    @property  # type: ignore
+    @functools.lru_cache(1)
+    def _blocksize(self):
+        # Convert the desired in-memory size to the expected
+        # on-disk storage size (blocksize), using the first block
+        first_block = self._block_indexes[0]["blocks"][0]
+        meta = self._read_meta(self.cpu)
+        df_byte_count = meta.memory_usage(deep=True).sum()
+        return int(float(first_block["size"]) / df_byte_count * self.part_size)
 
-        return pieces, meta
+    def _read_meta(self, cpu):
+        # Use first block for metadata
+        index = self._block_indexes[0]
+        first_block = index["blocks"][0]
+        if cpu:
+            return _read_blocks(self.fs, self.paths[0], index["size"], [first_block])
+        return cudf.io.read_avro(self.paths[0], skiprows=0, num_rows=first_block["nrows"])
+
+    def process_metadata(self, columns=None, cpu=None):
+
+        cpu = self.cpu if cpu is None else cpu
+        meta = self._read_meta(cpu)
+        self.blocksize = self._blocksize
+        return self._pieces, meta
 
     @classmethod
-    def read_partition(cls, fs, piece, columns):
+    def read_partition(cls, fs, piece, columns, cpu=False):
 
         path = piece["path"]
-        if "rows" in piece:
+        if cpu:
+            # Decode the blocks of this piece straight into pandas
+            df = _read_blocks(fs, path, piece["size"], piece["block_index"])
+        elif "rows" in piece:
 
             # See: (https://github.com/rapidsai/cudf/issues/6529)
             # Using `uavro` library for now. This means we must convert
@@ -163,24 +154,8 @@ class AvroDatasetEngine(DatasetEngine):
             #   df = cudf.io.read_avro(
             #       path, skiprows=skiprows, num_rows=num_rows
             #   )
-
-            block_offset, part_blocks = piece["blocks"]
-            file_size = fs.du(piece["path"])
-            with fs.open(piece["path"], "rb") as fo:
-                header = ua.core.read_header(fo)
-                ua.core.scan_blocks(fo, header, file_size)
-                header["blocks"] = header["blocks"][block_offset : block_offset + part_blocks]
-
-                # Adjust the total row count
-                nrows = 0
-                for block in header["blocks"]:
-                    nrows += block["nrows"]
-                header["nrows"] = nrows
-
-                # Read in as pandas and convert to cudf (avoid block scan)
-                df = cudf.from_pandas(
-                    ua.core.filelike_to_dataframe(fo, file_size, header, scan=False)
-                )
+            # Read in as pandas and convert to cudf (avoid block scan)
+            df = cudf.from_pandas(_read_blocks(fs, path, piece["size"], piece["block_index"]))
         else:
             df = cudf.io.read_avro(path)
 
@@ -188,3 +163,116 @@ class AvroDatasetEngine(DatasetEngine):
         if columns is None:
             columns = list(df.columns)
         return df[columns]
+
+
+def _plan_pieces(paths, indexes, blocksize):
+    # Break apart files at the "Avro block" granularity, into
+    # pieces of (roughly) `blocksize` bytes
+    pieces = []
+    for path, index in zip(paths, indexes):
+        file_size, blocks = index["size"], index["blocks"]
+        if file_size > blocksize and blocks:
+            part_count = 0
+
+            file_row_offset, part_row_count = 0, 0
+            file_block_offset, part_block_count = 0, 0
+            file_byte_offset, part_byte_count = blocks[0]["offset"], 0
+
+            for i, block in enumerate(blocks):
+                part_row_count += block["nrows"]
+                part_block_count += 1
+                part_byte_count += block["size"]
+                if part_byte_count >= blocksize:
+                    pieces.append(
+                        _piece(
+                            path,
+                            file_size,
+                            blocks,
+                            (file_row_offset, part_row_count),
+                            (file_block_offset, part_block_count),
+                            (file_byte_offset, part_byte_count),
+                        )
+                    )
+                    part_count += 1
+                    file_row_offset += part_row_count
+                    file_block_offset += part_block_count
+                    file_byte_offset += part_byte_count
+                    part_row_count = part_block_count = part_byte_count = 0
+
+            if part_block_count:
+                pieces.append(
+                    _piece(
+                        path,
+                        file_size,
+                        blocks,
+                        (file_row_offset, part_row_count),
+                        (file_block_offset, part_block_count),
+                        (file_byte_offset, part_byte_count),
+                    )
+                )
+                part_count += 1
+            if part_count == 1:
+                # No need to specify a byte range since we
+                # will need to read the entire file anyway.
+                pieces[-1] = _piece(path, file_size, blocks)
+        else:
+            pieces.append(_piece(path, file_size, blocks))
+    return pieces
+
+
+def _piece(path, file_size, blocks, rows=None, block_range=None, byte_range=None):
+    # Description of an avro file, or of a (multi-block) subset
+    # of the file if `rows`, `block_range` and `byte_range` are set
+    if rows is None:
+        return {"path": path, "size": file_size, "block_index": blocks}
+    block_offset, block_count = block_range
+    return {
+        "path": path,
+        "size": file_size,
+        "rows": rows,
+        "blocks": block_range,
+        "bytes": byte_range,
+        "block_index": blocks[block_offset : block_offset + block_count],
+    }
+
+
+def _read_blocks(fs, path, file_size, blocks):
+    # Decode the avro `blocks` (from the block index) of
+    # a file into a pandas DataFrame
+    with fs.open(path, "rb") as fo:
+        header = ua.core.read_header(fo)
+
+        # Use the block index shipped with the piece,
+        # rather than scanning the blocks of the file
+        header["blocks"] = blocks
+        header["nrows"] = sum(block["nrows"] for block in blocks)
+        return ua.core.filelike_to_dataframe(fo, file_size, header, scan=False)
+
+
+def _read_block_indexes(fs, paths, max_workers=32):
+    # Return the block index of every path (from the
+    # process-wide metadata cache, when possible)
+    indexes = get_metadata_cache().get_many(
+        "avro-block-index",
+        fs,
+        paths,
+        functools.partial(_scan_block_indexes, max_workers=max_workers),
+    )
+    return [pickle.loads(index) for index in indexes]
+
+
+def _scan_block_indexes(fs, paths, infos, max_workers=32):
+    # Scan the blocks of many avro files in parallel
+    if len(paths) == 1:
+        return [_scan_block_index(fs, paths[0], infos[0])]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(paths))) as pool:
+        return list(pool.map(functools.partial(_scan_block_index, fs), paths, infos))
+
+
+def _scan_block_index(fs, path, info):
+    # Serialized block index of a single avro file
+    file_size = int(info["size"])
+    with fs.open(path, "rb") as fo:
+        header = ua.core.read_header(fo)
+        ua.core.scan_blocks(fo, header, file_size)
+    return pickle.dumps({"size": file_size, "blocks": header["blocks"]})
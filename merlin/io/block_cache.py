@@ -0,0 +1,293 @@
+#
+# Copyright (c) 2022, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from dask.utils import parse_bytes
+from fsspec.spec import AbstractBufferedFile, AbstractFileSystem
+
+from merlin.io.fsspec_utils import _cat_ranges
+from merlin.io.metadata_cache import file_identity
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+LOG = logging.getLogger("merlin")
+
+# Maximum number of `fs.info` results kept by a `BlockCacheFileSystem`
+_MAX_CACHED_INFOS = 4096
+
+
+class BlockCache:
+    """Read-through cache of remote file blocks on local disk
+
+    Remote files are split into fixed-size blocks, and every block
+    that is read is stored as a file under ``directory``. Blocks
+    are keyed by the protocol, path, size, etag (or modification
+    time) and offset of the file, so a modified remote file is never
+    served from stale blocks. The keys don't depend on the file
+    system instance, and the blocks are plain files (written
+    atomically), so every process on a node can share the same
+    cache directory.
+
+    The cache is bounded by ``max_bytes``. Reading a block updates
+    its modification time, and the least-recently-used blocks are
+    evicted (by whichever process notices that the cache is too
+    large) once the limit is exceeded.
+
+    Parameters
+    ----------
+    directory : str
+        Local directory (ideally on a fast SSD) to store the blocks in.
+    max_bytes : int or str, default "64GiB"
+        Upper limit for the total size of the cached blocks.
+    block_size : int or str, default "8MiB"
+        Size of the cached blocks.
+    """
+
+    def __init__(self, directory, max_bytes="64GiB", block_size="8MiB"):
+        self.directory = os.path.abspath(os.path.expanduser(str(directory)))
+        self.max_bytes = parse_bytes(max_bytes)
+        self.block_size = parse_bytes(block_size)
+        os.makedirs(self.directory, exist_ok=True)
+        self._written = 0
+        self._lock = threading.Lock()
+
+    def __reduce__(self):
+        return (BlockCache, (self.directory, self.max_bytes, self.block_size))
+
+    def __repr__(self):
+        return (
+            f"BlockCache(directory={self.directory!r}, max_bytes={self.max_bytes}, "
+            f"block_size={self.block_size})"
+        )
+
+    def read(self, fs, path, start, end, info=None):
+        """Return the bytes ``[start, end)`` of ``path``
+
+        Blocks that are missing from the cache are fetched from
+        ``fs`` (contiguous blocks with a single request) and stored.
+        """
+        info = info or fs.info(path)
+        end = min(end, int(info["size"]))
+        if start >= end:
+            return b""
+        prefix = file_identity(fs, path, info=info)
+        first, last = start // self.block_size, (end - 1) // self.block_size
+
+        blocks = {}
+        for block in range(first, last + 1):
+            blocks[block] = self._get(prefix, block)
+
+        # Fetch runs of contiguous missing blocks
+        runs = []
+        for block in range(first, last + 1):
+            if blocks[block] is None:
+                if runs and runs[-1][1] == block:
+                    runs[-1][1] = block + 1
+                else:
+                    runs.append([block, block + 1])
+        if runs:
+            size = int(info["size"])
+            starts = [run[0] * self.block_size for run in runs]
+            ends = [min(run[1] * self.block_size, size) for run in runs]
+            for (run_start, run_stop), data in zip(
+                runs, _cat_ranges(fs, [path] * len(runs), starts, ends)
+            ):
+                for block in range(run_start, run_stop):
+                    offset = (block - run_start) * self.block_size
+                    blocks[block] = data[offset : offset + self.block_size]
+                    self._put(prefix, block, blocks[block])
+
+        data = b"".join(blocks[block] for block in range(first, last + 1))
+        offset = first * self.block_size
+        return data[start - offset : end - offset]
+
+    def _block_path(self, prefix, block):
+        key = hashlib.sha1(repr(prefix + (block * self.block_size,)).encode()).hexdigest()
+        return os.path.join(self.directory, key[:2], key)
+
+    def _get(self, prefix, block):
+        path = self._block_path(prefix, block)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            # Mark as recently used
+            os.utime(path)
+            return data
+        except OSError:
+            return None
+
+    def _put(self, prefix, block, data):
+        path = self._block_path(prefix, block)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temporary file first, so concurrent
+        # readers never see a partially-written block
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as exc:
+            LOG.warning(f"Failed to write block to {self.directory}: {exc}")
+            return
+        with self._lock:
+            self._written += len(data)
+            evict = self._written >= max(self.max_bytes // 16, self.block_size)
+            if evict:
+                self._written = 0
+        if evict:
+            self.evict()
+
+    def nbytes(self):
+        """Total size of the cached blocks"""
+        return sum(size for _, size, _ in self._scan())
+
+    def evict(self):
+        """Evict the least-recently-used blocks if the cache is too large"""
+        lock_file = None
+        if fcntl is not None:
+            # Only one process evicts at a time - Others skip it
+            lock_file = open(os.path.join(self.directory, ".lock"), "w")
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                lock_file.close()
+                return
+        try:
+            blocks = sorted(self._scan())
+            total = sum(size for _, size, _ in blocks)
+            if total <= self.max_bytes:
+                return
+            # Leave some headroom, so we don't evict on every write
+            target = int(0.9 * self.max_bytes)
+            for _, size, path in blocks:
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    pass
+        finally:
+            if lock_file is not None:
+                lock_file.close()
+
+    def _scan(self):
+        # (mtime, size, path) of every cached block
+        for subdir in os.scandir(self.directory):
+            if not subdir.is_dir():
+                continue
+            for entry in os.scandir(subdir.path):
+                if entry.name.endswith(".tmp"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                yield stat.st_mtime, stat.st_size, entry.path
+
+
+class BlockCacheFileSystem(AbstractFileSystem):
+    """File system reading the files of another (remote) file
+    system through a ``BlockCache``
+
+    Only reads are cached - Every other operation is forwarded to
+    the wrapped file system.
+
+    Parameters
+    ----------
+    fs : fsspec.AbstractFileSystem
+        File system to read from.
+    cache : BlockCache
+        Block cache to read through.
+    info_ttl : float, default 60
+        Number of seconds to reuse the result of ``fs.info`` for.
+        The results of (at most) 4096 paths are kept, and the
+        least-recently-used results are dropped.
+    """
+
+    cachable = False
+
+    def __init__(self, fs, cache, info_ttl=60.0, **kwargs):
+        super().__init__(**kwargs)
+        self.fs = fs
+        self.cache = cache
+        self.info_ttl = info_ttl
+        self.protocol = fs.protocol
+        self.sep = fs.sep
+        self.root_marker = fs.root_marker
+        self._infos = OrderedDict()
+        self._infos_lock = threading.Lock()
+
+    def __reduce__(self):
+        return (BlockCacheFileSystem, (self.fs, self.cache, self.info_ttl))
+
+    def _strip_protocol(self, path):
+        return self.fs._strip_protocol(path)
+
+    def info(self, path, **kwargs):
+        path = self._strip_protocol(path)
+        with self._infos_lock:
+            cached = self._infos.get(path)
+            if cached is not None and time.monotonic() - cached[0] < self.info_ttl:
+                self._infos.move_to_end(path)
+                return cached[1]
+        info = self.fs.info(path, **kwargs)
+        with self._infos_lock:
+            self._infos[path] = (time.monotonic(), info)
+            self._infos.move_to_end(path)
+            while len(self._infos) > _MAX_CACHED_INFOS:
+                self._infos.popitem(last=False)
+        return info
+
+    def ls(self, path, detail=True, **kwargs):
+        return self.fs.ls(path, detail=detail, **kwargs)
+
+    def find(self, path, **kwargs):
+        return self.fs.find(path, **kwargs)
+
+    def glob(self, path, **kwargs):
+        return self.fs.glob(path, **kwargs)
+
+    def cat_file(self, path, start=None, end=None, **kwargs):
+        info = self.info(path)
+        size = int(info["size"])
+        start = 0 if start is None else (start if start >= 0 else size + start)
+        end = size if end is None else (end if end >= 0 else size + end)
+        return self.cache.read(self.fs, self._strip_protocol(path), start, end, info=info)
+
+    def _open(self, path, mode="rb", **kwargs):
+        if mode != "rb":
+            return self.fs.open(path, mode=mode, **kwargs)
+        return _BlockCacheFile(self, path, size=int(self.info(path)["size"]), **kwargs)
+
+    def __getattr__(self, name):
+        # Forward everything else to the wrapped file system
+        if name.startswith("__") or name in ("fs", "cache"):
+            raise AttributeError(name)
+        return getattr(self.fs, name)
+
+
+class _BlockCacheFile(AbstractBufferedFile):
+    def _fetch_range(self, start, end):
+        return self.fs.cat_file(self.path, start=start, end=end)
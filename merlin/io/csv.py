@@ -14,6 +14,7 @@
 # limitations under the License.
 #
 import functools
+from concurrent.futures import ThreadPoolExecutor
 
 import dask.dataframe as dd
 
@@ -22,18 +23,55 @@ try:
 except ImportError:
     dask_cudf = None
 import numpy as np
-from dask.bytes import read_bytes
+import pandas as pd
+import pyarrow as pa
+from dask.base import tokenize
 from dask.utils import parse_bytes
-from fsspec.core import get_fs_token_paths
 from fsspec.utils import infer_compression
+from pyarrow import csv as pa_csv
 
 from merlin.io.dataset_engine import DatasetEngine
+from merlin.io.fsspec_utils import _cat_ranges
+from merlin.io.metadata_cache import get_metadata_cache
+
+# `read_csv` arguments supported by the pyarrow-based CPU reader
+_ARROW_CSV_KWARGS = {
+    "sep",
+    "delimiter",
+    "names",
+    "header",
+    "dtype",
+    "usecols",
+    "lineterminator",
+    "compression",
+    "storage_options",
+}
+
+# Number of bytes fetched (at a time) to find the
+# first line terminator after a block boundary
+_NEWLINE_SEARCH_SIZE = 65_536
+
+# Number of bytes read (at a time) to count the lines of a block
+_LINE_COUNT_CHUNK_SIZE = parse_bytes("16MiB")
 
 
 class CSVDatasetEngine(DatasetEngine):
     """CSVDatasetEngine
 
     Thin wrapper around dask_cudf.read_csv.
+
+    On CPU, files are split into newline-aligned blocks of (roughly)
+    `part_size` bytes, using a block index that is computed once per
+    file (and version of the file) and cached in the process-wide
+    metadata cache. Every block is then parsed with the multithreaded
+    pyarrow CSV reader, using column types that are inferred once
+    (from the start of the first file), so that the types don't need
+    to be inferred again for every block. Arguments that the pyarrow
+    reader doesn't support fall back to `dask.dataframe.read_csv`.
+
+    The row count of every block is taken from a one-time count of
+    the (non-empty) lines of the block, which is cached next to the
+    block index, so that `num_rows` never needs to parse the data.
     """
 
     def __init__(self, paths, part_size, storage_options=None, cpu=False, **kwargs):
@@ -53,7 +91,10 @@ class CSVDatasetEngine(DatasetEngine):
         # Check if we are using cpu
         cpu = self.cpu if cpu is None else cpu
         if cpu:
-            ddf = dd.read_csv(self.paths, blocksize=self.part_size, **self.csv_kwargs)
+            if self._arrow_csv_options is not None:
+                ddf = self._read_csv_arrow()
+            else:
+                ddf = dd.read_csv(self.paths, blocksize=self.part_size, **self.csv_kwargs)
         else:
             ddf = dask_cudf.read_csv(self.paths, chunksize=self.part_size, **self.csv_kwargs)
         if columns:
@@ -65,63 +106,362 @@ class CSVDatasetEngine(DatasetEngine):
     def _file_partition_map(self):
         ind = 0
         _pp_map = {}
-        for path, blocks in zip(
-            *_byte_block_counts(
-                self.paths,
-                self.part_size,
-                **self.csv_kwargs,
-            )
-        ):
+        for path, offsets in zip(self.paths, self._block_index()):
+            blocks = len(offsets) - 1
             _pp_map[path.split(self.fs.sep)[-1]] = np.arange(ind, ind + blocks)
             ind += blocks
         return _pp_map
 
+    @property
+    def _partition_lens(self):
+        if not self.cpu:
+            # dask_cudf splits the files into different partitions
+            return None
+        return self._block_row_counts
+
+    @property  # type: ignore
+    @functools.lru_cache(1)
+    def _block_row_counts(self):
+        # Number of rows in every block of `_block_index`
+        # (or None if they can't be counted without parsing)
+        kwargs = self.csv_kwargs
+        header = kwargs.get("header", "infer")
+        if (
+            set(kwargs) - _ARROW_CSV_KWARGS
+            or self._lineterminator != "\n"
+            or header not in ("infer", 0, None)
+        ):
+            # Rows can't be counted from the line terminators alone
+            return None
+        has_header = header == 0 or (header == "infer" and not kwargs.get("names"))
+        lens = []
+        for counts in self._line_counts():
+            counts = counts.copy()
+            if has_header and len(counts) and counts[0]:
+                # The header line is at the start of the first block
+                counts[0] -= 1
+            lens.extend(int(count) for count in counts)
+        return lens
+
+    @property
+    def num_rows(self):
+        if self._block_row_counts is not None:
+            return sum(self._block_row_counts)
+        return len(self.to_ddf().index)
+
     def to_cpu(self):
         self.cpu = True
 
     def to_gpu(self):
         self.cpu = False
 
+    @property
+    def _lineterminator(self):
+        return self.csv_kwargs.get("lineterminator") or "\n"
+
+    @property
+    def _compression(self):
+        compression = self.csv_kwargs.get("compression", "infer")
+        if compression == "infer":
+            compression = infer_compression(self.paths[0])
+        return compression
 
-def _byte_block_counts(
-    urlpath,
-    blocksize,
-    lineterminator=None,
-    compression="infer",
-    storage_options=None,
-    **kwargs,
-):
-    """Return a list of paths and block counts.
+    def _block_index(self):
+        # Block offsets of every file (see `_csv_block_offsets`)
+        blocksize = parse_bytes(self.part_size) if self.part_size else None
+        if self._compression or not blocksize:
+            # Compressed files can't be split
+            return [np.array([0, self.fs.size(path)]) for path in self.paths]
+        lineterminator = self._lineterminator.encode()
+        kind = f"csv-block-index-{blocksize}-{lineterminator.hex()}"
 
-    Logic copied from dask.bytes.read_bytes
+        def _loader(fs, paths, infos):
+            return [
+                _csv_block_offsets(fs, path, int(info["size"]), blocksize, lineterminator).tobytes()
+                for path, info in zip(paths, infos)
+            ]
+
+        index = get_metadata_cache().get_many(kind, self.fs, self.paths, _loader)
+        return [np.frombuffer(offsets, dtype="int64") for offsets in index]
+
+    def _line_counts(self):
+        # Number of (non-empty) lines in every block of every file
+        blocksize = parse_bytes(self.part_size) if self.part_size else None
+        lineterminator = self._lineterminator.encode()
+        kind = f"csv-line-counts-{blocksize}-{self._compression}-{lineterminator.hex()}"
+        return _block_line_counts(self.fs, self.paths, self._block_index(), kind, self._compression)
+
+    @property  # type: ignore
+    @functools.lru_cache(1)
+    def _arrow_csv_options(self):
+        # Options for the pyarrow CSV reader, or `None` if the
+        # arguments of this engine require `dd.read_csv`
+        kwargs = self.csv_kwargs
+        sep = kwargs.get("sep", kwargs.get("delimiter")) or ","
+        header = kwargs.get("header", "infer")
+        if (
+            set(kwargs) - _ARROW_CSV_KWARGS
+            or not hasattr(dd, "from_map")
+            or len(sep) != 1
+            or self._lineterminator != "\n"
+            or header not in ("infer", 0, None)
+            or (header == 0 and kwargs.get("names"))
+            or not self.paths
+        ):
+            return None
+
+        names = kwargs.get("names")
+        has_header = header == 0 or (header == "infer" and not names)
+        parse_options = pa_csv.ParseOptions(delimiter=sep)
+        sample = _read_sample(self.fs, self.paths[0], self._compression)
+        sample_table = pa_csv.read_csv(
+            pa.py_buffer(sample),
+            read_options=pa_csv.ReadOptions(
+                column_names=list(names) if names else None,
+                autogenerate_column_names=not (has_header or names),
+            ),
+            parse_options=parse_options,
+            convert_options=pa_csv.ConvertOptions(strings_can_be_null=True),
+        )
+        column_types = _column_types(sample_table.schema, kwargs.get("dtype"))
+        usecols = kwargs.get("usecols")
+        if usecols is not None:
+            if not all(isinstance(col, str) for col in usecols):
+                return None
+            # Like pandas, keep the columns in file order
+            usecols = [name for name in sample_table.column_names if name in set(usecols)]
+        labels = None
+        if not (has_header or names):
+            # Like pandas, label the columns 0, 1, ... (rather
+            # than with the "f0", "f1", ... names of pyarrow)
+            labels = {name: i for i, name in enumerate(sample_table.column_names)}
+        return {
+            "names": sample_table.column_names,
+            "labels": labels,
+            "has_header": has_header,
+            "parse_options": parse_options,
+            "convert_options": pa_csv.ConvertOptions(
+                column_types=column_types,
+                include_columns=usecols,
+                strings_can_be_null=True,
+            ),
+        }
+
+    def _read_csv_arrow(self):
+        options = self._arrow_csv_options
+        pieces = [
+            (path, int(start), int(end))
+            for path, offsets in zip(self.paths, self._block_index())
+            for start, end in zip(offsets[:-1], offsets[1:])
+        ]
+        meta = _empty_frame(options)
+        return dd.from_map(
+            _read_csv_block,
+            [self.fs] * len(pieces),
+            [piece[0] for piece in pieces],
+            [piece[1] for piece in pieces],
+            [piece[2] for piece in pieces],
+            compression=self._compression,
+            options=options,
+            meta=meta,
+            label="read-csv",
+            token=tokenize(self.paths, self.part_size, self.csv_kwargs),
+            enforce_metadata=False,
+        )
+
+
+def _csv_block_offsets(fs, path, size, blocksize, lineterminator=b"\n"):
+    """Return the offsets of the newline-aligned blocks of a CSV file
+
+    Block ``i`` spans the bytes ``[offsets[i], offsets[i + 1])``. Like
+    ``dask.bytes.read_bytes``, the file is cut every ``blocksize``
+    bytes (spreading the spare bytes over the blocks), and every cut is
+    moved forward to just after the next line terminator. A block is
+    empty if a single line spans it.
     """
+    if size == 0:
+        return np.array([0], dtype="int64")
+    # Shrink the block size to give the same number of blocks as Dask
+    if size % blocksize and size > blocksize:
+        blocksize = size / (size // blocksize)
+    boundaries, place = [], 0
+    while size - place > (blocksize * 2) - 1:
+        place += blocksize
+        boundaries.append(int(place))
+    offsets = [0] + [None] * len(boundaries) + [size]
+    search = _NEWLINE_SEARCH_SIZE
+    pending = list(range(len(boundaries)))
+    starts = list(boundaries)
+    while pending:
+        # Fetch the bytes after every (unresolved) boundary concurrently
+        windows = _cat_ranges(
+            fs,
+            [path] * len(pending),
+            [starts[i] for i in pending],
+            [min(starts[i] + search, size) for i in pending],
+        )
+        unresolved = []
+        for i, window in zip(pending, windows):
+            pos = window.find(lineterminator)
+            if pos >= 0:
+                offsets[i + 1] = starts[i] + pos + len(lineterminator)
+            elif starts[i] + len(window) >= size:
+                offsets[i + 1] = size
+            else:
+                starts[i] += len(window)
+                unresolved.append(i)
+        pending = unresolved
+        search *= 2
+    return np.array(offsets, dtype="int64")
 
-    if lineterminator is not None and len(lineterminator) == 1:
-        kwargs["lineterminator"] = lineterminator
-    else:
-        lineterminator = "\n"
-
-    if compression == "infer":
-        paths = get_fs_token_paths(urlpath, mode="rb", storage_options=storage_options)[2]
-        compression = infer_compression(paths[0])
-
-    if isinstance(blocksize, str):
-        blocksize = parse_bytes(blocksize)
-    if blocksize and compression:
-        blocksize = None
-
-    b_out = read_bytes(
-        urlpath,
-        delimiter=lineterminator.encode(),
-        blocksize=blocksize,
-        sample=False,
-        compression=compression,
-        include_path=True,
-        **(storage_options or {}),
-    )
-    _, values, paths = b_out
 
-    if not isinstance(values[0], (tuple, list)):
-        values = [values]
+def _block_line_counts(fs, paths, offsets, kind, compression, max_workers=32):
+    """Return the number of non-empty lines in every block of every file
 
-    return paths, [len(v) for v in values]
+    ``offsets`` holds the block offsets of every path (see
+    ``_csv_block_offsets``). The lines of every file are counted once
+    (for all files in parallel), and cached in the process-wide
+    metadata cache under ``kind``.
+    """
+    offsets = dict(zip(paths, offsets))
+
+    def _count(path):
+        return _scan_line_counts(fs, path, offsets[path], compression).tobytes()
+
+    def _loader(fs, paths, infos):
+        if len(paths) == 1:
+            return [_count(paths[0])]
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(paths))) as pool:
+            return list(pool.map(_count, paths))
+
+    counts = get_metadata_cache().get_many(kind, fs, paths, _loader)
+    return [np.frombuffer(count, dtype="int64") for count in counts]
+
+
+def _scan_line_counts(fs, path, offsets, compression):
+    # Count the lines of every block `[offsets[i], offsets[i + 1])`
+    # of a file (compressed files are a single block)
+    counts = np.zeros(max(len(offsets) - 1, 0), dtype="int64")
+    with fs.open(path, "rb", compression=compression or None) as f:
+        if compression:
+            counts[:] = _count_stream_lines(f, None)
+            return counts
+        for i, (start, end) in enumerate(zip(offsets[:-1], offsets[1:])):
+            if end > start:
+                f.seek(start)
+                counts[i] = _count_stream_lines(f, end - start)
+    return counts
+
+
+def _count_stream_lines(f, nbytes):
+    # Number of non-empty lines in the next `nbytes` bytes
+    # of `f` (or up to the end of `f` if `nbytes` is None)
+    count, carry, remaining = 0, b"", nbytes
+    while remaining is None or remaining > 0:
+        size = (
+            _LINE_COUNT_CHUNK_SIZE if remaining is None else min(_LINE_COUNT_CHUNK_SIZE, remaining)
+        )
+        chunk = f.read(size)
+        if not chunk:
+            break
+        if remaining is not None:
+            remaining -= len(chunk)
+        # Only count complete lines, and carry the rest over
+        chunk = carry + chunk
+        cut = chunk.rfind(b"\n") + 1
+        count += _count_lines(chunk[:cut])
+        carry = chunk[cut:]
+    return count + bool(carry.strip())
+
+
+def _count_lines(data):
+    # Number of non-empty lines in `data` (which ends with a line
+    # terminator). Like the pandas and pyarrow readers, this skips
+    # blank lines (including the "\r" of "\r\n" terminators)
+    arr = np.frombuffer(data, dtype="uint8")
+    ends = np.flatnonzero(arr == ord("\n"))
+    if not len(ends):
+        return 0
+    starts = np.concatenate([[0], ends[:-1] + 1])
+    lengths = ends - starts
+    lengths -= (lengths > 0) & (arr[ends - 1] == ord("\r"))
+    return int(np.count_nonzero(lengths))
+
+
+def _read_sample(fs, path, compression, sample_size=1_000_000):
+    # Complete lines from the start of a file (used to infer the
+    # names and types of the columns). The sample is extended up
+    # to the end of the first line if that is longer
+    with fs.open(path, "rb", compression=compression) as f:
+        sample = f.read(sample_size)
+        if len(sample) == sample_size:
+            while b"\n" not in sample:
+                chunk = f.read(sample_size)
+                if not chunk:
+                    return sample
+                sample += chunk
+            sample = sample[: sample.rfind(b"\n") + 1]
+    return sample
+
+
+def _column_types(schema, dtype=None):
+    # Arrow types to parse every column with. Inferred temporal
+    # types are parsed as strings instead (like pandas does), and
+    # `dtype` (a single dtype or a dict) overrides the inferred types
+    types = {}
+    for field in schema:
+        if pa.types.is_temporal(field.type) or pa.types.is_null(field.type):
+            types[field.name] = pa.string()
+        else:
+            types[field.name] = field.type
+    if dtype is not None:
+        dtypes = dtype if isinstance(dtype, dict) else {name: dtype for name in types}
+        for name, typ in dtypes.items():
+            if name in types:
+                types[name] = _arrow_type(typ)
+    return types
+
+
+def _arrow_type(dtype):
+    dtype = np.dtype(dtype) if not isinstance(dtype, pd.CategoricalDtype) else dtype
+    if isinstance(dtype, pd.CategoricalDtype) or dtype == np.dtype("O"):
+        return pa.string()
+    return pa.from_numpy_dtype(dtype)
+
+
+def _empty_frame(options):
+    convert_options = options["convert_options"]
+    columns = convert_options.include_columns or options["names"]
+    schema = pa.schema([(name, convert_options.column_types[name]) for name in columns])
+    return _relabel(schema.empty_table().to_pandas(), options)
+
+
+def _relabel(df, options):
+    # Apply the (pandas-style) column labels of `options`
+    if options["labels"]:
+        df = df.rename(columns=options["labels"])
+    return df
+
+
+def _read_csv_block(fs, path, start, end, compression, options):
+    # Parse the bytes `[start, end)` of a CSV file
+    # with the (multithreaded) pyarrow CSV reader
+    if compression:
+        with fs.open(path, "rb", compression=compression) as f:
+            data = f.read()
+    else:
+        data = _cat_ranges(fs, [path], [start], [end])[0] if end > start else b""
+    if not data.strip():
+        return _empty_frame(options)
+    read_options = pa_csv.ReadOptions(
+        column_names=options["names"],
+        skip_rows=1 if options["has_header"] and start == 0 and data else 0,
+        use_threads=True,
+    )
+    table = pa_csv.read_csv(
+        pa.py_buffer(data),
+        read_options=read_options,
+        parse_options=options["parse_options"],
+        convert_options=options["convert_options"],
+    )
+    return _relabel(table.to_pandas(), options)
@@ -16,17 +16,19 @@
 import collections
 
 import dask
+import numpy as np
 import pandas as pd
 from dask.base import tokenize
 from dask.dataframe.core import _concat, new_dd_object
 from dask.delayed import Delayed
 from dask.highlevelgraph import HighLevelGraph
+from dask.utils import natural_sort_key
 
 from merlin.core.dispatch import annotate
 from merlin.core.utils import ensure_optimize_dataframe_graph, global_dask_client
 from merlin.io.shuffle import Shuffle
 from merlin.io.worker import clean_worker_cache, get_worker_cache
-from merlin.io.writer_factory import _writer_cls_factory, writer_factory
+from merlin.io.writer_factory import _writer_cls, _writer_cls_factory, writer_factory
 
 
 class DaskSubgraph:
@@ -67,6 +69,8 @@ def _write_output_partition(
     num_threads,
     cpu,
     suffix,
+    write_profile=None,
+    max_inflight_bytes=None,
 ):
     df_size = len(df)
     out_files_per_proc = out_files_per_proc or 1
@@ -85,6 +89,8 @@ def _write_output_partition(
                 num_threads=num_threads,
                 cpu=cpu,
                 suffix=suffix,
+                write_profile=write_profile,
+                max_inflight_bytes=max_inflight_bytes,
             )
             writer.set_col_names(labels=label_names, cats=cat_names, conts=cont_names)
             writer_cache[processed_path] = writer
@@ -136,6 +142,8 @@ def _write_partitioned(
     output_format,
     num_threads,
     cpu,
+    write_profile=None,
+    max_inflight_bytes=None,
 ):
     # Logic copied from cudf/cudf/io/parquet.py
     data_cols = df.columns.drop(partition_cols)
@@ -152,6 +160,8 @@ def _write_partitioned(
         num_threads=num_threads,
         cpu=cpu,
         fns=fns,
+        write_profile=write_profile,
+        max_inflight_bytes=max_inflight_bytes,
     )
     writer.set_col_names(labels=label_names, cats=cat_names, conts=cont_names)
 
@@ -176,6 +186,8 @@ def _write_subgraph(
     num_threads,
     cpu,
     suffix,
+    write_profile=None,
+    max_inflight_bytes=None,
 ):
 
     fns = fns if isinstance(fns, (tuple, list)) else (fns,)
@@ -188,6 +200,8 @@ def _write_subgraph(
         num_threads=num_threads,
         cpu=cpu,
         fns=[fn + suffix for fn in fns],
+        write_profile=write_profile,
+        max_inflight_bytes=max_inflight_bytes,
     )
     writer.set_col_names(labels=label_names, cats=cat_names, conts=cont_names)
 
@@ -203,16 +217,25 @@ def _write_subgraph(
     return writer.close()
 
 
-def _write_metadata_files(md_list, output_path, output_format, cpu, schema):
+# Maximum number of metadata objects merged by each
+# task of the `_write_metadata_files` tree reduction
+_METADATA_SPLIT_EVERY = 32
+
+
+def _merge_metadata(md_list, output_format, cpu, per_directory=False):
+    # Merge a list of (general, special) metadata tuples
+    # into one (the "special" metadata is merged in order)
+    general_md = _merge_general_metadata([md[0] for md in md_list])
+    special_md = _writer_cls(output_format, cpu=cpu).merge_special_metadata(
+        [md[1] for md in md_list], per_directory=per_directory
+    )
+    return general_md, special_md
+
+
+def _write_metadata_files(md_list, output_path, output_format, cpu, schema, per_directory=False):
 
     # Separate and merge metadata
-    general_md = []
-    special_md = []
-    for md in md_list:
-        general_md.append(md[0])
-        special_md.append(md[1])
-    general_md = _merge_general_metadata(general_md)
-    special_md = dict(collections.ChainMap(*special_md))
+    general_md, special_md = _merge_metadata(md_list, output_format, cpu, per_directory)
 
     # Write metadata files
     if not isinstance(output_path, str):
@@ -222,6 +245,113 @@ def _write_metadata_files(md_list, output_path, output_format, cpu, schema):
     wc.write_special_metadata(special_md, fs, output_path)
 
 
+def _metadata_tree(dsk, name, task_list, output_format, cpu, per_directory):
+    # Add a tree reduction of the metadata returned by the tasks
+    # in `task_list` to `dsk`, so that the metadata of a large
+    # dataset is not merged on a single task. Returns the keys
+    # of the last level of the tree (in order)
+    depth = 0
+    while len(task_list) > _METADATA_SPLIT_EVERY:
+        merged = []
+        for i in range(0, len(task_list), _METADATA_SPLIT_EVERY):
+            merged.append((name, depth, len(merged)))
+            dsk[merged[-1]] = (
+                _merge_metadata,
+                task_list[i : i + _METADATA_SPLIT_EVERY],
+                output_format,
+                cpu,
+                per_directory,
+            )
+        task_list = merged
+        depth += 1
+    return task_list
+
+
+# Name of the temporary Z-order key column used by `_sort_ddf`
+_ZORDER_KEY = "__zorder_key__"
+
+# Maximum number of rows sampled to choose the Z-order bins
+_ZORDER_SAMPLE_ROWS = 100_000
+
+
+def _sort_ddf(ddf, sort_by=None, cluster_by=None):
+    """Sort a Dask collection by the `sort_by` columns, or cluster
+    it along a Z-order curve of the `cluster_by` columns
+
+    The rows are range-partitioned on the (first) sort key, and
+    each partition is sorted in memory. Without a distributed
+    client, Dask's "disk" shuffle spills the intermediate data to
+    the local ``temporary-directory``. Note that all the rows with
+    the same value of the first key land in the same partition, so
+    a skewed first key (or one with few distinct values) can produce
+    partitions much larger than the input partitions. If both
+    options are given, the `sort_by` columns order the rows with the
+    same Z-order key.
+    """
+    by = list(sort_by or [])
+    if cluster_by:
+        ddf = _add_zorder_key(ddf, list(cluster_by))
+        by = [_ZORDER_KEY] + by
+
+    if isinstance(ddf._meta, pd.DataFrame):
+        # Dask can only range-partition on a single column,
+        # but sorting every partition by all the `by` columns
+        # still results in a global (lexicographic) order
+        ddf = ddf.sort_values(by[0], sort_function_kwargs={"by": by})
+    else:
+        ddf = ddf.sort_values(by)
+
+    if cluster_by:
+        ddf = ddf.drop(columns=[_ZORDER_KEY])
+    return ddf
+
+
+def _add_zorder_key(ddf, columns):
+    # Each column is mapped to (up to) 2**bits quantile bins of a
+    # sample of its values, so that any dtype (including strings)
+    # and skewed distributions can be interleaved into the key
+    bits = min(16, 64 // len(columns))
+    per_part = max(1, _ZORDER_SAMPLE_ROWS // ddf.npartitions)
+    sample = (
+        ddf[columns]
+        .map_partitions(lambda df: df.sample(n=min(len(df), per_part), random_state=0))
+        .compute()
+    )
+    if not isinstance(sample, pd.DataFrame):
+        # The bins are chosen (and applied) on the host
+        sample = sample.to_pandas()
+    boundaries = []
+    for col in columns:
+        values = sample[col].dropna().sort_values().reset_index(drop=True)
+        positions = np.linspace(0, len(values) - 1, 2**bits + 1)[1:-1].astype("int64")
+        boundaries.append(values.iloc[positions].drop_duplicates() if len(values) else None)
+    return ddf.map_partitions(_zorder_key, columns, boundaries, bits)
+
+
+def _zorder_key(df, columns, boundaries, bits):
+    # Interleave the bits of the bin index of every column. The
+    # `boundaries` are pandas Series, so the key columns of cudf
+    # partitions are binned on the host
+    host = df[columns] if isinstance(df, pd.DataFrame) else df[columns].to_pandas()
+    key = None
+    for j, (col, bounds) in enumerate(zip(columns, boundaries)):
+        if bounds is None:
+            continue
+        # Null values go to the last bin
+        values = host[col].fillna(bounds.iloc[-1]) if len(bounds) else host[col]
+        bins = bounds.searchsorted(values, side="right").astype("uint64")
+        # Spread the bins over the full range of `bits` bits (there are
+        # fewer bins if the column has few distinct values)
+        bins = (bins << np.uint64(bits)) // np.uint64(len(bounds) + 1)
+        if key is None:
+            key = bins * np.uint64(0)
+        for bit in range(bits):
+            key |= ((bins >> np.uint64(bit)) & np.uint64(1)) << np.uint64(bit * len(columns) + j)
+    df = df.copy(deep=False)
+    df[_ZORDER_KEY] = np.zeros(len(df), dtype="uint64") if key is None else key
+    return df
+
+
 def _simple_shuffle(ddf, plan):
 
     # Construct graph for a simple shuffle
@@ -255,14 +385,28 @@ def _ddf_to_dataset(
     suffix="",
     partition_on=None,
     schema=None,
+    write_profile=None,
+    max_inflight_bytes=None,
+    per_directory_metadata=False,
 ):
 
     # Construct graph for Dask-based dataset write
     token = tokenize(
-        ddf, shuffle, out_files_per_proc, cat_names, cont_names, label_names, suffix, partition_on
+        ddf,
+        shuffle,
+        out_files_per_proc,
+        cat_names,
+        cont_names,
+        label_names,
+        suffix,
+        partition_on,
+        write_profile,
+        max_inflight_bytes,
+        per_directory_metadata,
     )
     name = "write-processed-" + token
     write_name = name + "-partition" + token
+    md_name = "merge-metadata-" + token
 
     # Check that the data is in the correct place
     assert isinstance(ddf._meta, pd.DataFrame) is cpu
@@ -288,14 +432,17 @@ def _ddf_to_dataset(
                 output_format,
                 num_threads,
                 cpu,
+                write_profile,
+                max_inflight_bytes,
             )
         dsk[name] = (
             _write_metadata_files,
-            task_list,
+            _metadata_tree(dsk, md_name, task_list, output_format, cpu, per_directory_metadata),
             output_path,
             output_format,
             cpu,
             schema,
+            per_directory_metadata,
         )
     elif file_partition_map is not None:
         # Use specified mapping of data to output files
@@ -319,14 +466,19 @@ def _ddf_to_dataset(
                 num_threads,
                 cpu,
                 suffix,
+                write_profile,
+                max_inflight_bytes,
             )
+        # Merge the metadata in output-file order
+        task_list.sort(key=lambda key: natural_sort_key(key[1]))
         dsk[name] = (
             _write_metadata_files,
-            task_list,
+            _metadata_tree(dsk, md_name, task_list, output_format, cpu, per_directory_metadata),
             output_path,
             output_format,
             cpu,
             schema,
+            per_directory_metadata,
         )
     else:
         cached_writers = True
@@ -346,6 +498,8 @@ def _ddf_to_dataset(
                 num_threads,
                 cpu,
                 suffix,
+                write_profile,
+                max_inflight_bytes,
             )
             task_list.append(key)
         dsk[name] = (lambda x: x, task_list)
@@ -365,28 +519,28 @@ def _ddf_to_dataset(
 
     if cached_writers:
         # Follow-up Shuffling and _metadata creation
-        _finish_dataset(client, ddf, output_path, fs, output_format, cpu, schema)
+        _finish_dataset(
+            client, ddf, output_path, fs, output_format, cpu, schema, per_directory_metadata
+        )
 
 
-def _finish_dataset(client, ddf, output_path, fs, output_format, cpu, schema):
-    # Finish data writing
+def _finish_dataset(
+    client, ddf, output_path, fs, output_format, cpu, schema, per_directory_metadata=False
+):
+    # Finish data writing (the metadata of each worker
+    # is merged on the worker before it is gathered)
     if client:
         client.cancel(ddf)
         ddf = None
-        out = client.run(_worker_finish, output_path)
-
-        general_md = []
-        special_md = []
-        for (gen, spec) in out.values():
-            general_md.append(gen)
-            if spec:
-                special_md.append(spec)
-
-        general_md = _merge_general_metadata(general_md)
-        special_md = dict(collections.ChainMap(*special_md))
+        out = client.run(_worker_finish, output_path, output_format, cpu, per_directory_metadata)
+        general_md, special_md = _merge_metadata(
+            list(out.values()), output_format, cpu, per_directory_metadata
+        )
     else:
         ddf = None
-        general_md, special_md = _worker_finish(output_path)
+        general_md, special_md = _worker_finish(
+            output_path, output_format, cpu, per_directory_metadata
+        )
 
     # Write metadata on client
     if not isinstance(output_path, str):
@@ -403,24 +557,24 @@ def _finish_dataset(client, ddf, output_path, fs, output_format, cpu, schema):
         clean_worker_cache("writer")
 
 
-def _worker_finish(processed_path):
+def _worker_finish(processed_path, output_format, cpu, per_directory_metadata=False):
     general_md, special_md = {}, {}
     with get_worker_cache("writer") as writer_cache:
         writer = writer_cache.get(processed_path, None)
         if writer:
             general_md, special_md = writer.close()
 
-    return general_md, special_md
+    return _merge_metadata([(general_md, special_md)], output_format, cpu, per_directory_metadata)
 
 
 def _merge_general_metadata(meta_list):
     """Combine list of "general" metadata dicts into
     a single dict
     """
-    if not meta_list:
-        return {}
     meta = None
     for md in meta_list:
+        if not md:
+            continue
         if meta:
             if "data_paths" in md:
                 meta["data_paths"] += md["data_paths"]
@@ -432,4 +586,4 @@ def _merge_general_metadata(meta_list):
                 meta["data_paths"] = []
             if "file_stats" not in meta:
                 meta["file_stats"] = []
-    return meta
+    return meta or {}
@@ -21,6 +21,7 @@ except ImportError:
 from dask.dataframe.core import new_dd_object
 from dask.highlevelgraph import HighLevelGraph
 
+from merlin.core.dispatch import is_dataframe_object
 from merlin.io.dataset_engine import DatasetEngine
 
 
@@ -36,6 +37,7 @@ class DataFrameDatasetEngine(DatasetEngine):
         self._ddf = ddf
         self.cpu = cpu
         self.moved_collection = moved_collection or False
+        self._lens = _in_memory_partition_lens(ddf)
 
     def to_ddf(self, columns=None, cpu=None):
         # Check if we are using cpu
@@ -66,8 +68,17 @@ class DataFrameDatasetEngine(DatasetEngine):
 
     @property
     def num_rows(self):
+        if self._lens is not None:
+            return sum(self._lens)
         return len(self._ddf)
 
+    @property
+    def _partition_lens(self):
+        # Only known if the partitions were in memory when
+        # the engine was created (the lengths don't change
+        # when the collection is moved between host and device)
+        return self._lens
+
     def _move_ddf(self, destination):
         """Move the collection between cpu and gpu memory."""
         _ddf = self._ddf
@@ -123,3 +134,17 @@ class DataFrameDatasetEngine(DatasetEngine):
 
         else:
             raise ValueError(f"destination {destination} not recognized.")
+
+
+def _in_memory_partition_lens(ddf):
+    # Return the length of every partition of `ddf` if all
+    # partitions are in-memory DataFrames (like the partitions
+    # of `from_pandas`), or `None` if any would be computed
+    graph = ddf.__dask_graph__()
+    lens = []
+    for key in ddf.__dask_keys__():
+        part = graph.get(key)
+        if not is_dataframe_object(part):
+            return None
+        lens.append(len(part))
+    return lens
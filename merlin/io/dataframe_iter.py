@@ -15,13 +15,18 @@
 #
 
 
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
 class DataFrameIter:
-    def __init__(self, ddf, columns=None, indices=None, partition_lens=None, epochs=1):
+    def __init__(self, ddf, columns=None, indices=None, partition_lens=None, epochs=1, prefetch=0):
         self.indices = indices if isinstance(indices, list) else range(ddf.npartitions)
         self._ddf = ddf
         self.columns = columns
         self.partition_lens = partition_lens
         self.epochs = epochs
+        self.prefetch = prefetch
 
     def __len__(self):
         if self.partition_lens:
@@ -35,11 +40,36 @@ class DataFrameIter:
         return len(self._ddf) * self.epochs
 
     def __iter__(self):
-        for epoch in range(self.epochs):
-            for i in self.indices:
-                part = self._ddf.get_partition(i)
-                if self.columns:
-                    yield part[self.columns].compute(scheduler="synchronous")
-                else:
-                    yield part.compute(scheduler="synchronous")
-        part = None
+        parts = (i for _ in range(self.epochs) for i in self.indices)
+        if self.prefetch:
+            yield from self._prefetch_iter(parts)
+            return
+        for i in parts:
+            yield self._compute_partition(i)
+
+    def _compute_partition(self, i):
+        part = self._ddf.get_partition(i)
+        if self.columns:
+            part = part[self.columns]
+        return part.compute(scheduler="synchronous")
+
+    def _prefetch_iter(self, parts):
+        # Materialize up to `prefetch` partitions on background
+        # threads while the consumer works on the current one.
+        # At most `prefetch` partitions are in flight (or waiting
+        # to be consumed) at any time, which bounds the memory
+        # used for prefetching.
+        futures = deque()
+        with ThreadPoolExecutor(max_workers=self.prefetch) as pool:
+            try:
+                for i in parts:
+                    futures.append(pool.submit(self._compute_partition, i))
+                    if len(futures) > self.prefetch:
+                        yield futures.popleft().result()
+                while futures:
+                    yield futures.popleft().result()
+            finally:
+                # The consumer may stop early - Don't compute
+                # the partitions that were not started yet
+                for future in futures:
+                    future.cancel()
@@ -17,12 +17,14 @@
 import collections
 import logging
 import math
+import os
 import random
 import warnings
 from pathlib import Path
 
 import dask
 import numpy as np
+import pyarrow as pa
 from dask.base import tokenize
 from dask.dataframe.core import new_dd_object
 from dask.highlevelgraph import HighLevelGraph
@@ -30,6 +32,7 @@ from dask.utils import natural_sort_key, parse_bytes
 from fsspec.core import get_fs_token_paths
 from fsspec.utils import stringify_path
 
+import merlin.dtypes as md
 from merlin.core.dispatch import (
     convert_data,
     hex_to_int,
@@ -38,13 +41,17 @@ from merlin.core.dispatch import (
     list_val_dtype,
 )
 from merlin.core.utils import device_mem_size, global_dask_client, set_client_deprecated
+from merlin.io.arrow_engine import ArrowTableDatasetEngine
 from merlin.io.csv import CSVDatasetEngine
-from merlin.io.dask import _ddf_to_dataset, _simple_shuffle
+from merlin.io.dask import _ddf_to_dataset, _simple_shuffle, _sort_ddf
 from merlin.io.dataframe_engine import DataFrameDatasetEngine
 from merlin.io.dataframe_iter import DataFrameIter
-from merlin.io.parquet import ParquetDatasetEngine
+from merlin.io.ipc import IPCDatasetEngine
+from merlin.io.jsonl import JSONLDatasetEngine
+from merlin.io.lookup_index import LookupIndex, lookup
+from merlin.io.parquet import ParquetDatasetEngine, ParquetWriteProfile
 from merlin.io.shuffle import _check_shuffle_arg
-from merlin.schema import ColumnSchema, Schema
+from merlin.schema import ColumnSchema, Schema, Tags
 from merlin.schema.io.tensorflow_metadata import TensorflowMetadata
 
 try:
@@ -158,14 +165,22 @@ class Dataset:
 
     Parameters
     -----------
-    path_or_source : str, list of str, or <dask.dataframe|cudf|pd>.DataFrame
-        Dataset path (or list of paths), or a DataFrame. If string,
-        should specify a specific file or directory path. If this is a
-        directory path, the directory structure must be flat (nested
-        directories are not yet supported).
+    path_or_source : str, list of str, <dask.dataframe|cudf|pd>.DataFrame, or pyarrow.Table
+        Dataset path (or list of paths), a DataFrame, or an Arrow Table.
+        If string, should specify a specific file or directory path. If
+        this is a directory path, the directory structure must be flat
+        (nested directories are not yet supported). An Arrow Table is
+        split into zero-copy slices of `part_size` bytes (or into
+        `npartitions` slices), which are only converted to DataFrames
+        when they are computed.
     engine : str or DatasetEngine
         DatasetEngine object or string identifier of engine. Current
-        string options include: ("parquet", "csv", "avro"). This argument
+        string options include: ("parquet", "csv", "avro", "ipc", "jsonl").
+        The "ipc" engine reads Arrow IPC (Feather V2) files, and is also
+        selected by the "arrow" and "feather" identifiers. The "jsonl"
+        engine reads newline-delimited JSON files (also selected by
+        "json" and "ndjson"), with an optional `json_schema` argument
+        (a ``pyarrow.Schema``). This argument
         is ignored if path_or_source is a DataFrame type.
     npartitions : int
         Desired number of Dask-collection partitions to produce in
@@ -209,7 +224,26 @@ class Dataset:
     **kwargs :
         Key-word arguments to pass through to Dask.dataframe IO function.
         For the Parquet engine(s), notable arguments include `filters`
-        and `aggregate_files` (the latter is experimental).
+        and `aggregate_files` (the latter is experimental). With
+        `cpu=True`, pass `filter_pushdown=True` to push `filters` down
+        into pyarrow, so that non-matching rows are dropped before they
+        are converted to pandas. Parquet footers are cached in memory
+        and shared by all Dataset objects in the process. Pass
+        `metadata_cache_path` to also persist that cache to a local
+        sidecar file, so that later processes don't need to read the
+        footers again. Pass `partition_plan="bytes"` to pack row-groups
+        into partitions using the row-group sizes recorded in the
+        parquet footers (rather than assuming that every row-group is
+        as large as the first one), or pass a ``ParquetPartitionPlan``
+        to specify the row-groups of each partition explicitly. With
+        `cpu=True`, pass a list of string columns as `read_dictionary`
+        to read them as dictionaries (pandas categoricals) rather than
+        Python objects. `read_dictionary=True` selects the string
+        columns tagged as CATEGORICAL in the schema. Pass a local
+        directory (or a ``merlin.io.block_cache.BlockCache``) as
+        `block_cache` to cache the blocks read from remote storage on
+        local disk, where they are shared by every worker process on
+        the node.
     """
 
     def __init__(
@@ -256,7 +290,18 @@ class Dataset:
             )
 
         npartitions = npartitions or 1
-        if isinstance(path_or_source, dask.dataframe.DataFrame) or is_dataframe_object(
+        if isinstance(path_or_source, pa.Table):
+            # User is passing in an (in-memory) Arrow Table.
+            # Use ArrowTableDatasetEngine to avoid copying it
+            if part_mem_fraction:
+                warnings.warn("part_mem_fraction is ignored for Arrow Table input.")
+            self.engine = ArrowTableDatasetEngine(
+                path_or_source,
+                npartitions=npartitions,
+                part_size=parse_bytes(part_size) if part_size else None,
+                cpu=self.cpu,
+            )
+        elif isinstance(path_or_source, dask.dataframe.DataFrame) or is_dataframe_object(
             path_or_source
         ):
             # User is passing in a <dask.dataframe|cudf|pd>.DataFrame
@@ -320,8 +365,16 @@ class Dataset:
                     self.engine = AvroDatasetEngine(
                         paths, part_size, storage_options=storage_options, cpu=self.cpu, **kwargs
                     )
+                elif engine in ("ipc", "arrow", "feather"):
+                    self.engine = IPCDatasetEngine(
+                        paths, part_size, storage_options=storage_options, cpu=self.cpu, **kwargs
+                    )
+                elif engine in ("jsonl", "json", "ndjson"):
+                    self.engine = JSONLDatasetEngine(
+                        paths, part_size, storage_options=storage_options, cpu=self.cpu, **kwargs
+                    )
                 else:
-                    raise ValueError("Only parquet, csv, and avro supported (for now).")
+                    raise ValueError("Only parquet, csv, avro, ipc, and jsonl supported (for now).")
             else:
                 self.engine = engine(
                     paths, part_size, cpu=self.cpu, storage_options=storage_options
@@ -350,6 +403,16 @@ class Dataset:
                 # df with no schema
                 self.infer_schema()
 
+        if getattr(self.engine, "read_dictionary", None) is True:
+            # Read the string columns tagged as CATEGORICAL as dictionaries
+            self.engine.read_dictionary = [
+                col.name
+                for col in self.schema
+                if Tags.CATEGORICAL in col.tags
+                and col.dtype in (md.string, md.object_)
+                and not col.is_list
+            ]
+
     def to_ddf(self, columns=None, shuffle=False, seed=None):
         """Convert `Dataset` object to `dask_cudf.DataFrame`
 
@@ -590,7 +653,14 @@ class Dataset:
         )
 
     def to_iter(
-        self, columns=None, indices=None, shuffle=False, seed=None, use_file_metadata=None, epochs=1
+        self,
+        columns=None,
+        indices=None,
+        shuffle=False,
+        seed=None,
+        use_file_metadata=None,
+        epochs=1,
+        prefetch=0,
     ):
         """Convert `Dataset` object to a `cudf.DataFrame` iterator.
 
@@ -626,6 +696,12 @@ class Dataset:
         epochs : int
             Number of dataset passes to include within a single iterator.
             This option is used for multi-epoch data-loading. Default is 1.
+        prefetch : int
+            Number of partitions to materialize ahead of the consumer,
+            on background threads. This overlaps IO (and decoding) with
+            the work done on the current partition, at the cost of
+            holding up to `prefetch` additional partitions in memory.
+            Default is 0 (no prefetching).
         """
         if isinstance(columns, str):
             columns = [columns]
@@ -653,8 +729,45 @@ class Dataset:
             indices=indices,
             partition_lens=partition_lens_meta,
             epochs=epochs,
+            prefetch=prefetch,
         )
 
+    def lookup(self, column, values, columns=None):
+        """Read the rows where ``column`` is one of ``values``
+
+        This method requires a parquet dataset written with a lookup
+        index for ``column`` (see the ``lookup_index`` argument of
+        ``to_parquet``). Only the row-groups that may contain the
+        requested values (according to their min/max range and Bloom
+        filter) are read.
+
+        Parameters
+        ----------
+        column : str
+            Key column of the lookup index.
+        values : list
+            Key values to read the rows of.
+        columns : list(str), optional
+            Columns to read. By default, all columns are read.
+
+        Returns
+        -------
+        DataFrame (cudf or pandas) with the matching rows
+        """
+        if not isinstance(self.engine, ParquetDatasetEngine):
+            raise ValueError("Dataset.lookup is only supported for parquet datasets.")
+        fs = self.engine.fs
+        paths = self.engine.stripped_paths
+        if len(paths) == 1 and fs.isdir(paths[0]):
+            root = paths[0]
+        else:
+            root = os.path.commonpath([fs._parent(path) for path in paths])
+
+        table = lookup(fs, root, column, list(values), columns=columns)
+        if table is None:
+            return self.to_ddf(columns=columns)._meta
+        return convert_data(table, cpu=self.cpu)
+
     def to_parquet(
         self,
         output_path,
@@ -671,6 +784,12 @@ class Dataset:
         partition_on=None,
         method="subgraph",
         write_hugectr_keyset=False,
+        write_profile=None,
+        max_inflight_bytes=None,
+        per_directory_metadata=False,
+        lookup_index=None,
+        sort_by=None,
+        cluster_by=None,
     ):
         """Writes out to a parquet dataset
 
@@ -749,6 +868,54 @@ class Dataset:
             Whether to write a HugeCTR keyset output file ("_hugectr.keyset").
             Writing this file can be very slow, and should only be done if you
             are planning to ingest the output data with HugeCTR. Default is False.
+        write_profile : ParquetWriteProfile or dict, optional
+            Encoding and compression options for the output files, such as
+            the codec (and level) of each column or schema tag, the
+            dictionary-encoding policy, the page and row-group size targets,
+            and whether to write statistics and page indexes. A dict is
+            converted with ``ParquetWriteProfile(**write_profile)``. By
+            default, the data is written without compression.
+        max_inflight_bytes : int or str, optional
+            Upper limit for the (in-memory) size of the data that each
+            writer may have queued for its IO threads. When specified
+            (and `num_threads > 1`), the writer returns as soon as the
+            data fits within this budget, so that the next partition is
+            computed while the previous one is being written. By default,
+            the writer waits for every partition to be written.
+        per_directory_metadata : bool, default False
+            Whether to write a separate "_metadata" file to every output
+            directory (e.g. to every hive partition when `partition_on`
+            is used), rather than a single "_metadata" file for the
+            whole dataset. The file paths in each "_metadata" file are
+            relative to its own directory.
+        lookup_index : str, Tags, or list, optional
+            Key columns (or schema tags) to build a lookup index for.
+            The index holds a Bloom filter and the min/max range of each
+            key column for every row-group of the output, and is written
+            to a "_lookup_index.parquet" sidecar file. The rows matching
+            specific key values can then be read from the output dataset
+            with ``Dataset.lookup``, without scanning the whole dataset.
+            Requires a "_metadata" file, so the index is only supported
+            for parquet output.
+        sort_by : str, Tags, or list, optional
+            Columns (or schema tags) to sort the output by. The data is
+            range-partitioned on the first column, and each partition is
+            then sorted (in memory) by all the columns. Without a
+            distributed client, the intermediate data is spilled to
+            Dask's ``temporary-directory``. All the rows with the same
+            value of the first column end up in the same partition, so
+            memory usage is only bounded if that column has many
+            distinct (and evenly spread) values. Sorting results in
+            row-groups with tight min/max statistics, so that filtered
+            reads of the output can skip most row-groups. Cannot be
+            combined with `shuffle` or `preserve_files`.
+        cluster_by : str, Tags, or list, optional
+            Columns (or schema tags) to cluster the output by, along a
+            Z-order curve. Unlike `sort_by`, every column contributes
+            equally to the order of the rows, so that filters on any
+            combination of these columns can skip row-groups. If
+            `sort_by` is also specified, it orders the rows within each
+            Z-order cell.
         """
 
         if partition_on:
@@ -789,6 +956,10 @@ class Dataset:
 
         # Check shuffle argument
         shuffle = _check_shuffle_arg(shuffle)
+        if (sort_by or cluster_by) and (shuffle or preserve_files):
+            raise ValueError(
+                "`sort_by` and `cluster_by` not supported with `shuffle` or `preserve_files`."
+            )
 
         if isinstance(output_files, dict) or (not output_files and preserve_files):
             # Do not shuffle partitions if we are preserving files or
@@ -797,6 +968,13 @@ class Dataset:
         else:
             ddf = self.to_ddf(shuffle=shuffle)
 
+        if sort_by or cluster_by:
+            ddf = _sort_ddf(
+                ddf,
+                sort_by=self._key_columns(sort_by) if sort_by else None,
+                cluster_by=self._key_columns(cluster_by) if cluster_by else None,
+            )
+
         # Deal with `method=="subgraph"`.
         # Convert `output_files` argument to a dict mapping
         if output_files:
@@ -900,6 +1078,11 @@ class Dataset:
             _meta = _set_dtypes(ddf._meta, dtypes)
             ddf = ddf.map_partitions(_set_dtypes, dtypes, meta=_meta)
 
+        # Resolve schema tags in the write profile to column names
+        write_profile = ParquetWriteProfile.from_arg(write_profile)
+        if write_profile is not None:
+            write_profile = write_profile.resolve(self.schema)
+
         fs = get_fs_token_paths(output_path)[0]
         fs.mkdirs(output_path, exist_ok=True)
 
@@ -923,6 +1106,82 @@ class Dataset:
             suffix=suffix,
             partition_on=partition_on,
             schema=self.schema if write_hugectr_keyset else None,
+            write_profile=write_profile,
+            max_inflight_bytes=max_inflight_bytes,
+            per_directory_metadata=per_directory_metadata,
+        )
+
+        if lookup_index:
+            # Index the key columns of the written dataset
+            index_path = fs._strip_protocol(str(output_path))
+            index = LookupIndex.build(fs, index_path, self._key_columns(lookup_index))
+            index.write(fs, index_path)
+
+    def to_ipc(
+        self,
+        output_path,
+        shuffle=None,
+        file_partition_map=None,
+        out_files_per_proc=None,
+        num_threads=0,
+        dtypes=None,
+        suffix=".arrow",
+    ):
+        """Writes out to an Arrow IPC (Feather V2) dataset
+
+        The output files are uncompressed, so that they can be read
+        back (with ``engine="ipc"``) without any decoding.
+
+        Parameters
+        ----------
+        output_path : string
+            Path to write processed/shuffled output data
+        shuffle : merlin.io.Shuffle, optional
+            How to shuffle the output dataset (see ``to_parquet``).
+        file_partition_map : dict
+            Dictionary mapping of output file names to partition indices
+            that should be written to that file name.  If this argument
+            is passed, only the partitions included in the dictionary
+            will be written to disk, and the `output_files_per_proc` argument
+            will be ignored.
+        out_files_per_proc : integer
+            Number of files to create (per process) after
+            shuffling the data
+        num_threads : integer
+            Number of IO threads to use for writing the output dataset.
+            For `0` (default), no dedicated IO threads will be used.
+        dtypes : dict
+            Dictionary containing desired datatypes for output columns.
+            Keys are column names, values are datatypes.
+        suffix : str or False, default ".arrow"
+            File-name extension to use for all output files.
+        """
+        shuffle = _check_shuffle_arg(shuffle)
+        ddf = self.to_ddf(shuffle=shuffle)
+        if dtypes:
+            _meta = _set_dtypes(ddf._meta, dtypes)
+            ddf = ddf.map_partitions(_set_dtypes, dtypes, meta=_meta)
+
+        fs = get_fs_token_paths(output_path)[0]
+        fs.mkdirs(output_path, exist_ok=True)
+
+        tf_metadata = TensorflowMetadata.from_merlin_schema(self.schema)
+        tf_metadata.to_proto_text_file(output_path)
+
+        _ddf_to_dataset(
+            ddf,
+            fs,
+            output_path,
+            shuffle,
+            file_partition_map,
+            out_files_per_proc,
+            [],
+            [],
+            [],
+            "ipc",
+            num_threads,
+            self.cpu,
+            suffix=suffix,
         )
 
     def to_hugectr(
@@ -1021,6 +1280,17 @@ class Dataset:
     def npartitions(self):
         return self.to_ddf().npartitions
 
+    def _key_columns(self, keys):
+        # Resolve column names and/or schema tags to column names
+        keys = keys if isinstance(keys, (list, tuple)) else [keys]
+        columns = []
+        for key in keys:
+            if isinstance(key, Tags):
+                columns += self.schema.select_by_tag(key).column_names
+            else:
+                columns.append(key)
+        return columns
+
     def validate_dataset(self, **kwargs):
         """Validate for efficient processing.
 
@@ -15,12 +15,20 @@
 #
 
 import io
-from threading import Thread
+import math
+import os
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 # Check if fsspec.parquet module is available
 import fsspec
 import numpy as np
+from fsspec.implementations.local import LocalFileSystem
+from fsspec.utils import tokenize
 from packaging.version import Version
+from pyarrow import fs as pa_fs
 from pyarrow import parquet as pq
 
 if Version(fsspec.__version__) > Version("2021.11.0"):
@@ -208,8 +216,18 @@ def _get_parquet_byte_ranges(
         footer_sample = fs.tail(path, footer_size + 8)
 
     # Step 3 - Collect required byte ranges
-    byte_ranges = []
     md = pq.ParquetFile(io.BytesIO(footer_sample)).metadata
+    byte_ranges = _parquet_column_chunk_ranges(md, rgs, columns)
+
+    return byte_ranges, footer_sample, file_size
+
+
+def _parquet_column_chunk_ranges(md, rgs, columns):
+    # Return the byte ranges (as `(offset, size)` tuples) of the
+    # column chunks needed to read `columns` of the row-groups
+    # `rgs` (all columns/row-groups if `None`), according to
+    # the footer metadata `md`
+    byte_ranges = []
     for r in range(md.num_row_groups):
         # Skip this row-group if we are targeting
         # specific row-groups
@@ -233,8 +251,7 @@ def _get_parquet_byte_ranges(
                         file_offset0 = column.data_page_offset
                     num_bytes = column.total_compressed_size
                     byte_ranges.append((file_offset0, num_bytes))
-
-    return byte_ranges, footer_sample, file_size
+    return byte_ranges
 
 
 #
@@ -242,6 +259,266 @@ def _get_parquet_byte_ranges(
 #
 
 
+def _arrow_filesystem(fs):
+    # Convert an fsspec file system into a pyarrow file
+    # system (needed by the `pyarrow.dataset` fragment API).
+    # Local files use the native (memory-mapped) pyarrow
+    # implementation.
+    if isinstance(fs, LocalFileSystem):
+        return pa_fs.LocalFileSystem(use_mmap=True)
+    return pa_fs.PyFileSystem(pa_fs.FSSpecHandler(fs))
+
+
+class _RangeStats:
+    """Observed request costs of a single file system
+
+    Every fetch is recorded as a ``(nbytes, seconds, rounds)`` sample,
+    where ``rounds`` is the number of request latencies the fetch
+    waited for (one for a single request, or the number of batches
+    of a concurrent ``cat_ranges`` call), and an exponentially-decaying
+    least-squares fit of ``seconds = latency * rounds + nbytes /
+    bandwidth`` is kept up to date.
+    The gap threshold used to coalesce byte ranges is the number of
+    bytes that could be transferred in the time it takes to issue
+    one more request (``latency * bandwidth``).
+    """
+
+    # Weight of the previous samples after each new sample
+    decay = 0.98
+    # Bounds of the adaptive coalescing parameters
+    min_gap, max_gap = 4_096, 32_000_000
+    min_block = 8_000_000
+    # Target duration of a single (coalesced) request
+    block_seconds = 1.0
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._fit = np.zeros(6)  # sum of w, r*r, r*x, x*x, r*y, x*y
+        self.requests = 0
+        self.bytes_fetched = 0
+        self.seconds = 0.0
+        self.ranges_requested = 0
+        self.bytes_requested = 0
+        self.ranges_merged = 0
+        self.bytes_merged = 0
+
+    def observe(self, nbytes, seconds, requests=1, rounds=1):
+        """Record a fetch of ``nbytes`` (with ``requests`` requests,
+        issued in ``rounds`` concurrent rounds) taking ``seconds``"""
+        r, x, y = float(rounds), float(nbytes), seconds
+        with self._lock:
+            self._fit *= self.decay
+            self._fit += (1.0, r * r, r * x, x * x, r * y, x * y)
+            self.requests += requests
+            self.bytes_fetched += nbytes
+            self.seconds += seconds
+
+    def observe_merge(self, byte_ranges, merged_ranges):
+        with self._lock:
+            self.ranges_requested += len(byte_ranges)
+            self.bytes_requested += sum(size for _, size in byte_ranges)
+            self.ranges_merged += len(merged_ranges)
+            self.bytes_merged += sum(size for _, size in merged_ranges)
+
+    def model(self):
+        """Return the fitted ``(latency, bandwidth)`` (or ``None``)"""
+        with self._lock:
+            _, rr, rx, xx, ry, xy = self._fit
+            requests = self.requests
+        # Solve the normal equations of the (two-parameter) fit
+        det = rr * xx - rx * rx
+        if requests < 4 or det <= 1e-9 * max(rr * xx, 1.0):
+            return None
+        latency = (ry * xx - rx * xy) / det
+        slope = (rr * xy - rx * ry) / det
+        if slope <= 0 or latency < 0:
+            return None
+        return latency, 1.0 / slope
+
+    def coalescing(self, max_gap, max_block):
+        """Return the tuned ``(max_gap, max_block)``
+
+        The arguments are used until enough requests were observed.
+        The tuned block size never exceeds ``max_block`` (if it is
+        not None).
+        """
+        model = self.model()
+        if model is None:
+            return max_gap, max_block
+        latency, bandwidth = model
+        gap = int(min(max(latency * bandwidth, self.min_gap), self.max_gap))
+        block = int(max(bandwidth * self.block_seconds, self.min_block, gap))
+        return gap, block if max_block is None else min(block, max_block)
+
+    def to_dict(self):
+        model = self.model()
+        max_gap, max_block = self.coalescing(_DEFAULT_MAX_GAP, None)
+        return {
+            "requests": self.requests,
+            "bytes_fetched": self.bytes_fetched,
+            "seconds": self.seconds,
+            "latency": model[0] if model else None,
+            "bandwidth": model[1] if model else None,
+            "max_gap": max_gap,
+            "max_block": max_block,
+            "requests_saved": self.ranges_requested - self.ranges_merged,
+            "bytes_over_read": self.bytes_merged - self.bytes_requested,
+        }
+
+
+_RANGE_STATS = {}
+_RANGE_STATS_LOCK = threading.Lock()
+
+
+def _fs_token(fs):
+    # Identifier of a (configured) fsspec file system. Unlike
+    # `fs._fs_token` (which depends on the process and thread
+    # ids), this is the same for every instance with the same
+    # protocol and storage options
+    protocol = getattr(fs, "protocol", None) or type(fs).__name__
+    if not isinstance(protocol, str):
+        protocol = protocol[0]
+    options = getattr(fs, "storage_options", None)
+    if not options:
+        return protocol
+    return f"{protocol}-{tokenize(sorted((str(k), repr(v)) for k, v in options.items()))}"
+
+
+def _range_stats(fs):
+    token = fs if isinstance(fs, str) else _fs_token(fs)
+    with _RANGE_STATS_LOCK:
+        if token not in _RANGE_STATS:
+            _RANGE_STATS[token] = _RangeStats()
+        return _RANGE_STATS[token]
+
+
+def range_fetch_stats(fs_token=None):
+    """Return statistics of the byte-range requests of this process
+
+    Returns a dict (or a dict of dicts, keyed by ``fs_token``, if
+    ``fs_token`` is not specified; the token of a file system is its
+    protocol, followed by a hash of its storage options, if any) with the number of requests and
+    fetched bytes, the fitted request latency (seconds) and bandwidth
+    (bytes/second), the coalescing parameters currently used by
+    ``_merge_ranges``, the number of requests saved by coalescing
+    byte ranges, and the number of extra (gap) bytes read because
+    of it.
+    """
+    with _RANGE_STATS_LOCK:
+        stats = dict(_RANGE_STATS)
+    if fs_token is not None:
+        return stats[fs_token].to_dict() if fs_token in stats else None
+    return {token: s.to_dict() for token, s in stats.items()}
+
+
+def reset_range_fetch_stats():
+    """Forget the observed byte-range request costs"""
+    with _RANGE_STATS_LOCK:
+        _RANGE_STATS.clear()
+
+
+# Upper bound on the number of concurrent requests used
+# to fetch byte ranges (e.g. parquet footers or column chunks)
+_MAX_FETCH_WORKERS = 32
+
+_FETCH_POOL = None
+_FETCH_POOL_PID = None
+_FETCH_POOL_LOCK = threading.Lock()
+
+
+def _fetch_pool():
+    # Process-wide pool of threads used to fetch byte ranges from
+    # file systems without an async implementation. Sharing a
+    # single bounded pool keeps the number of concurrent requests
+    # (and connections) in check, no matter how many reads are
+    # running at the same time. A new pool is created after a fork.
+    global _FETCH_POOL, _FETCH_POOL_PID
+    with _FETCH_POOL_LOCK:
+        if _FETCH_POOL is None or _FETCH_POOL_PID != os.getpid():
+            _FETCH_POOL = ThreadPoolExecutor(
+                max_workers=_MAX_FETCH_WORKERS, thread_name_prefix="merlin-fetch"
+            )
+            _FETCH_POOL_PID = os.getpid()
+        return _FETCH_POOL
+
+
+def _on_fetch_thread():
+    # Whether the current thread belongs to the fetch pool
+    return threading.current_thread().name.startswith("merlin-fetch")
+
+
+def _cat_ranges(fs, paths, starts, ends, max_workers=None):
+    # Fetch the byte range `[starts[i], ends[i])` of every
+    # `paths[i]` concurrently. Async file systems (s3fs, gcsfs,
+    # ...) use `cat_ranges`, which issues all requests from a
+    # single event loop (and reuses its connections). Other file
+    # systems use the shared fetch pool, with (at most) one open
+    # file handle per task, so that the ranges of the same file
+    # don't each pay for a new `fs.open`. Nested calls (from a
+    # task that is already running on the fetch pool, e.g. when
+    # `fs` reads through a `BlockCache`) fetch their ranges inline,
+    # since waiting on the bounded pool could deadlock.
+    if not paths:
+        return []
+    max_workers = min(max_workers or _MAX_FETCH_WORKERS, _MAX_FETCH_WORKERS)
+    stats = _range_stats(fs)
+    if getattr(fs, "async_impl", False):
+        start_time = time.perf_counter()
+        out = fs.cat_ranges(list(paths), list(starts), list(ends), batch_size=max_workers)
+        for data in out:
+            if isinstance(data, Exception):
+                raise data
+        # Concurrent requests - Record the whole call as a single
+        # sample, which waited for one latency per batch of requests
+        stats.observe(
+            sum(len(data) for data in out),
+            time.perf_counter() - start_time,
+            requests=len(out),
+            rounds=math.ceil(len(out) / max_workers),
+        )
+        return out
+
+    def _fetch(f, path, start, end):
+        start_time = time.perf_counter()
+        if f is None:
+            data = fs.cat_file(path, start=start, end=end)
+        else:
+            f.seek(start)
+            data = f.read(end - start)
+        stats.observe(len(data), time.perf_counter() - start_time)
+        return data
+
+    if len(paths) == 1:
+        return [_fetch(None, paths[0], starts[0], ends[0])]
+
+    # Group the ranges by path, and split the ranges of each
+    # path into (up to) `max_workers` tasks overall
+    by_path = defaultdict(list)
+    for i, path in enumerate(paths):
+        by_path[path].append(i)
+    per_task = max(1, math.ceil(len(paths) / max_workers))
+    tasks = [
+        (path, indices[j : j + per_task])
+        for path, indices in by_path.items()
+        for j in range(0, len(indices), per_task)
+    ]
+
+    def _read_task(task):
+        path, indices = task
+        if len(indices) == 1:
+            i = indices[0]
+            return [_fetch(None, path, starts[i], ends[i])]
+        with fs.open(path, mode="rb", cache_type="none") as f:
+            return [_fetch(f, path, starts[i], ends[i]) for i in indices]
+
+    out = [None] * len(paths)
+    results = map(_read_task, tasks) if _on_fetch_thread() else _fetch_pool().map(_read_task, tasks)
+    for (_, indices), data in zip(tasks, results):
+        for i, chunk in zip(indices, data):
+            out[i] = chunk
+    return out
+
+
 def _fsspec_data_transfer(
     path_or_fob,
     fs,
@@ -250,7 +527,7 @@ def _fsspec_data_transfer(
     file_size=None,
     add_par1_magic=None,
     bytes_per_thread=256_000_000,
-    max_gap=64_000,
+    max_gap=None,
     mode="rb",
     **kwargs,
 ):
@@ -271,6 +548,7 @@ def _fsspec_data_transfer(
             byte_ranges,
             max_block=bytes_per_thread,
             max_gap=max_gap,
+            fs=fs,
         )
 
         # Call multi-threaded data transfer of
@@ -312,13 +590,28 @@ def _fsspec_data_transfer(
     return io.BytesIO(buf)
 
 
-def _merge_ranges(byte_ranges, max_block=256_000_000, max_gap=64_000):
-    # Simple utility to merge small/adjacent byte ranges
+# Gap threshold used by `_merge_ranges` until the request
+# costs of the file system are known
+_DEFAULT_MAX_GAP = 64_000
+
+
+def _merge_ranges(byte_ranges, max_block=256_000_000, max_gap=None, fs=None):
+    # Simple utility to merge small/adjacent byte ranges.
+    # If `fs` is specified, the gap threshold (unless `max_gap`
+    # is given) and block size are tuned to the request costs
+    # observed for `fs` (see `_RangeStats`)
     new_ranges = []
     if not byte_ranges:
         # Early return
         return new_ranges
 
+    stats = _range_stats(fs) if fs is not None else None
+    if stats is not None:
+        tuned_gap, max_block = stats.coalescing(_DEFAULT_MAX_GAP, max_block)
+        max_gap = tuned_gap if max_gap is None else max_gap
+    elif max_gap is None:
+        max_gap = _DEFAULT_MAX_GAP
+
     offset, size = byte_ranges[0]
     for (new_offset, new_size) in byte_ranges[1:]:
         gap = new_offset - (offset + size)
@@ -330,18 +623,11 @@ def _merge_ranges(byte_ranges, max_block=256_000_000, max_gap=64_000):
             continue
         size += new_size + gap
     new_ranges.append((offset, size))
+    if stats is not None:
+        stats.observe_merge(byte_ranges, new_ranges)
     return new_ranges
 
 
-def _assign_block(fs, path_or_fob, local_buffer, offset, nbytes):
-    with fs.open(path_or_fob, mode="rb", cache_type="none") as fob:
-        fob.seek(offset)
-        local_buffer[offset : offset + nbytes] = np.frombuffer(
-            fob.read(nbytes),
-            dtype="b",
-        )
-
-
 def _read_byte_ranges(
     path_or_fob,
     ranges,
@@ -349,16 +635,13 @@ def _read_byte_ranges(
     fs,
     **kwargs,
 ):
-
-    workers = []
-    for (offset, nbytes) in ranges:
-        if len(ranges) > 1:
-            workers.append(
-                Thread(target=_assign_block, args=(fs, path_or_fob, local_buffer, offset, nbytes))
-            )
-            workers[-1].start()
-        else:
-            _assign_block(fs, path_or_fob, local_buffer, offset, nbytes)
-
-    for worker in workers:
-        worker.join()
+    # Fetch every `(offset, nbytes)` range of `path_or_fob`
+    # (with the shared fetch pool) into `local_buffer`
+    chunks = _cat_ranges(
+        fs,
+        [path_or_fob] * len(ranges),
+        [offset for offset, _ in ranges],
+        [offset + nbytes for offset, nbytes in ranges],
+    )
+    for (offset, nbytes), chunk in zip(ranges, chunks):
+        local_buffer[offset : offset + nbytes] = np.frombuffer(chunk, dtype="b")
@@ -57,18 +57,6 @@ class HugeCTRWriter(ThreadedWriter):
                 self.data_writers[idx].write(nnz.tobytes())
                 self.data_writers[idx].write(np_cats[i][j].tobytes())
 
-    def _write_thread(self):
-        while True:
-            item = self.queue.get()
-            try:
-                if item is self._eod:
-                    break
-                idx, data = item
-                with self.write_locks[idx]:
-                    self._write_table(idx, data)
-            finally:
-                self.queue.task_done()
-
     def _close_writers(self):
         for i, writer in enumerate(self.data_writers):
             if self.cats:
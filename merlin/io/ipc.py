@@ -0,0 +1,319 @@
+#
+# Copyright (c) 2022, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import functools
+import math
+import os
+import struct
+import threading
+
+import fsspec
+import numpy as np
+import pyarrow as pa
+from dask.base import tokenize
+from dask.dataframe.core import new_dd_object
+from dask.utils import parse_bytes
+from fsspec.implementations.local import LocalFileSystem
+
+from merlin.io.arrow_utils import _select, _table_to_frame
+from merlin.io.dataset_engine import DatasetEngine
+from merlin.io.fsspec_utils import _cat_ranges
+from merlin.io.metadata_cache import get_metadata_cache
+from merlin.io.parquet import guid
+from merlin.io.writer import ThreadedWriter
+
+# File extensions of the IPC files in a dataset directory
+IPC_SUFFIXES = (".arrow", ".feather", ".ipc")
+
+# Target in-memory size of the record batches written by `IPCWriter`
+_IPC_BATCH_BYTES = parse_bytes("64MiB")
+
+# Magic bytes at the start and end of an IPC file
+_IPC_MAGIC = b"ARROW1"
+
+# Number of bytes fetched from the end of a file to read its footer
+# (larger footers are fetched with a second request)
+_IPC_TAIL_SIZE = 65_536
+
+
+class IPCDatasetEngine(DatasetEngine):
+    """IPCDatasetEngine
+
+    Reads Arrow IPC files (also known as Feather V2 files). Local
+    files are memory-mapped, so that the record batches of a partition
+    are not copied (or decoded) before they are converted to a pandas
+    or cudf DataFrame. Consecutive record batches of each file are
+    packed into partitions of roughly ``part_size`` bytes, using the
+    row count and body size of every batch. These are taken from the
+    file footer and the (small) metadata of every batch message, so
+    the batches themselves are never read to plan the partitions.
+    The index of every file is cached in the process-wide metadata
+    cache.
+    """
+
+    def __init__(self, paths, part_size, storage_options=None, cpu=False, **kwargs):
+        # pylint: disable=access-member-before-definition
+        super().__init__(paths, part_size, storage_options=storage_options, cpu=cpu)
+        if kwargs:
+            raise ValueError("Unexpected IPCDatasetEngine argument(s).")
+
+        # Use the IPC files of a (flat) directory
+        if len(self.paths) == 1 and self.fs.isdir(self.paths[0]):
+            self.paths = sorted(
+                path
+                for path in self.fs.glob(self.fs.sep.join([self.paths[0], "*"]))
+                if path.endswith(IPC_SUFFIXES)
+            )
+        self._pieces = None
+
+    def to_ddf(self, columns=None, cpu=None):
+
+        # Check if we are using cpu
+        cpu = self.cpu if cpu is None else cpu
+        if isinstance(columns, str):
+            columns = [columns]
+
+        meta = _table_to_frame(_select(self._schema.empty_table(), columns), cpu)
+        token = tokenize(self.fs, self.paths, self.part_size, columns, cpu)
+        name = "read-ipc-" + token
+        dsk = {
+            (name, i): (_read_ipc_piece, self.fs, path, start, stop, columns, cpu)
+            for i, (path, start, stop, _) in enumerate(self.pieces)
+        }
+        return new_dd_object(dsk, name, meta, [None] * (len(self.pieces) + 1))
+
+    def to_cpu(self):
+        self.cpu = True
+
+    def to_gpu(self):
+        self.cpu = False
+
+    @property
+    def pieces(self):
+        """Partitions of the dataset, as ``(path, start, stop, num_rows)``
+        tuples (each partition holds the record batches ``start:stop``
+        of ``path``)"""
+        if self._pieces is None:
+            self._pieces = _plan_pieces(self.paths, self._batch_indexes, self.part_size)
+        return self._pieces
+
+    @property
+    def num_rows(self):
+        return sum(self._partition_lens)
+
+    @property
+    def _partition_lens(self):
+        return [num_rows for _, _, _, num_rows in self.pieces]
+
+    @property
+    def _file_partition_map(self):
+        _pp_map = {}
+        for i, (path, _, _, _) in enumerate(self.pieces):
+            _pp_map.setdefault(path.split(self.fs.sep)[-1], []).append(i)
+        return {fn: np.array(parts) for fn, parts in _pp_map.items()}
+
+    @property  # type: ignore
+    @functools.lru_cache(1)
+    def _batch_indexes(self):
+        # Row count and body size of every record batch of every file
+        indexes = get_metadata_cache().get_many(
+            "ipc-batch-index", self.fs, self.paths, _scan_batch_indexes
+        )
+        return [np.frombuffer(index, dtype="int64").reshape(-1, 2) for index in indexes]
+
+    @property  # type: ignore
+    @functools.lru_cache(1)
+    def _schema(self):
+        with _open_ipc_file(self.fs, self.paths[0]) as reader:
+            return reader.schema
+
+
+class _open_ipc_file:
+    # Context manager returning a `pa.ipc.RecordBatchFileReader`
+    # (memory-mapping local files)
+    def __init__(self, fs, path):
+        self.fs = fs
+        self.path = path
+        self.source = None
+
+    def __enter__(self):
+        if isinstance(self.fs, LocalFileSystem):
+            self.source = pa.memory_map(self.path, "r")
+        else:
+            self.source = self.fs.open(self.path, "rb")
+        return pa.ipc.open_file(self.source)
+
+    def __exit__(self, *args):
+        self.source.close()
+
+
+def _scan_batch_indexes(fs, paths, infos):
+    # Serialized batch index of every path
+    return [_scan_batch_index(fs, path, int(info["size"])) for path, info in zip(paths, infos)]
+
+
+def _scan_batch_index(fs, path, size):
+    # Read the blocks of the record batches from the file footer,
+    # and the row count of every batch from its message metadata
+    # (fetched concurrently), without reading the batch bodies
+    tail = _cat_ranges(fs, [path], [max(size - _IPC_TAIL_SIZE, 0)], [size])[0]
+    if len(tail) < 10 or tail[-6:] != _IPC_MAGIC:
+        raise ValueError(f"{path} is not an Arrow IPC file.")
+    footer_size = struct.unpack_from("<i", tail, len(tail) - 10)[0]
+    if footer_size + 10 > len(tail):
+        start = size - 10 - footer_size
+        tail = _cat_ranges(fs, [path], [start], [size])[0]
+    footer = tail[len(tail) - 10 - footer_size : len(tail) - 10]
+
+    # Footer table: `recordBatches` (field 3) is a vector of
+    # `Block` structs (offset: int64, metaDataLength: int32,
+    # bodyLength: int64), 24 bytes each
+    blocks = []
+    vector = _fb_field_offset(footer, _fb_root(footer), 3)
+    if vector is not None:
+        count = struct.unpack_from("<I", footer, vector)[0]
+        for i in range(count):
+            offset, meta_len, body_len = struct.unpack_from("<qi4xq", footer, vector + 4 + 24 * i)
+            blocks.append((offset, meta_len, body_len))
+
+    index = np.zeros((len(blocks), 2), dtype="int64")
+    metadata = _cat_ranges(
+        fs,
+        [path] * len(blocks),
+        [offset for offset, _, _ in blocks],
+        [offset + meta_len for offset, meta_len, _ in blocks],
+    )
+    for i, (message, (_, _, body_len)) in enumerate(zip(metadata, blocks)):
+        index[i] = _message_num_rows(message), body_len
+    return index.tobytes()
+
+
+def _message_num_rows(message):
+    # Row count (`length`) of the `RecordBatch` header of an
+    # encapsulated IPC message (with or without the continuation
+    # marker of the current format)
+    start = 8 if message[:4] == b"\xff\xff\xff\xff" else 4
+    buf = memoryview(message)[start:]
+    # Message table: `header` (field 2) is the `RecordBatch` table,
+    # whose `length` (field 0) is an int64
+    header = _fb_field_offset(buf, _fb_root(buf), 2)
+    pos = _fb_field_pos(buf, header, 0)
+    return 0 if pos is None else struct.unpack_from("<q", buf, pos)[0]
+
+
+def _fb_root(buf):
+    # Position of the root table of a flatbuffer
+    return struct.unpack_from("<I", buf, 0)[0]
+
+
+def _fb_field_pos(buf, table, field):
+    # Position of the inline value of a table field (or
+    # `None` if the field is not set)
+    vtable = table - struct.unpack_from("<i", buf, table)[0]
+    vtable_size = struct.unpack_from("<H", buf, vtable)[0]
+    entry = 4 + 2 * field
+    if entry >= vtable_size:
+        return None
+    offset = struct.unpack_from("<H", buf, vtable + entry)[0]
+    return table + offset if offset else None
+
+
+def _fb_field_offset(buf, table, field):
+    # Position of the table or vector referenced by a table field
+    pos = _fb_field_pos(buf, table, field)
+    return None if pos is None else pos + struct.unpack_from("<I", buf, pos)[0]
+
+
+def _plan_pieces(paths, indexes, part_size):
+    # Pack the consecutive record batches of every file
+    # into partitions of (roughly) `part_size` bytes
+    part_size = parse_bytes(part_size) if part_size else None
+    pieces = []
+    for path, index in zip(paths, indexes):
+        start, nbytes = 0, 0
+        for i, (_, batch_bytes) in enumerate(index):
+            nbytes += batch_bytes
+            if part_size and nbytes >= part_size:
+                pieces.append((path, start, i + 1, int(index[start : i + 1, 0].sum())))
+                start, nbytes = i + 1, 0
+        if start < len(index) or not len(index):
+            pieces.append((path, start, len(index), int(index[start:, 0].sum())))
+    return pieces
+
+
+def _read_ipc_piece(fs, path, start, stop, columns, cpu):
+    # Read the record batches `start:stop` of an IPC file
+    with _open_ipc_file(fs, path) as reader:
+        batches = [reader.get_batch(i) for i in range(start, stop)]
+        table = pa.Table.from_batches(batches, schema=reader.schema)
+    return _table_to_frame(_select(table, columns), cpu)
+
+
+class IPCWriter(ThreadedWriter):
+    """Writes the partitions of a Dataset to Arrow IPC files
+
+    The data is written (uncompressed) in record batches of
+    roughly 64MiB, which ``IPCDatasetEngine`` packs into partitions.
+    """
+
+    def __init__(self, out_dir, suffix=".arrow", **kwargs):
+        super().__init__(out_dir, **kwargs)
+        self.suffix = suffix or ".arrow"
+        self.data_files = []
+        self.data_schemas = []
+        self._lock = threading.RLock()
+
+    def _get_filename(self, i):
+        if self.fns:
+            fn = self.fns[i]
+        elif self.use_guid:
+            fn = f"{i}.{guid()}{self.suffix}"
+        else:
+            fn = f"{i}{self.suffix}"
+        return os.path.join(self.out_dir, fn)
+
+    def _get_or_create_writer(self, idx, schema):
+        # lazily initializes a writer for the given index
+        with self._lock:
+            while len(self.data_writers) <= idx:
+                path = self._get_filename(len(self.data_writers))
+                self.data_paths.append(path)
+                f = fsspec.open(path, mode="wb").open()
+                self.data_files.append(f)
+                self.data_writers.append(pa.ipc.new_file(f, schema))
+                self.data_schemas.append(schema)
+            return self.data_writers[idx], self.data_schemas[idx]
+
+    def _write_table(self, idx, data):
+        if self.cpu:
+            table = pa.Table.from_pandas(data, preserve_index=False)
+        else:
+            table = data.to_arrow(preserve_index=False)
+        writer, schema = self._get_or_create_writer(idx, table.schema)
+        if not len(table):
+            # Nothing to write (but the file still gets a schema)
+            return
+        if table.schema != schema:
+            table = table.cast(schema)
+        row_bytes = table.nbytes / len(table)
+        max_chunksize = max(math.ceil(_IPC_BATCH_BYTES / row_bytes), 1) if row_bytes else None
+        writer.write_table(table, max_chunksize=max_chunksize)
+
+    def _close_writers(self):
+        for writer in self.data_writers:
+            writer.close()
+        for f in self.data_files:
+            f.close()
+        return {}
@@ -0,0 +1,205 @@
+#
+# Copyright (c) 2022, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import functools
+
+import numpy as np
+import pyarrow as pa
+from dask.base import tokenize
+from dask.dataframe.core import new_dd_object
+from dask.utils import parse_bytes
+from fsspec.utils import infer_compression
+from pyarrow import json as pa_json
+
+from merlin.io.arrow_utils import _select, _table_to_frame
+from merlin.io.csv import _block_line_counts, _csv_block_offsets, _read_sample
+from merlin.io.dataset_engine import DatasetEngine
+from merlin.io.fsspec_utils import _cat_ranges
+from merlin.io.metadata_cache import get_metadata_cache
+
+# Default size of the blocks parsed (in parallel) by the pyarrow JSON reader
+_JSON_BLOCK_SIZE = 1 << 20
+
+
+class JSONLDatasetEngine(DatasetEngine):
+    """JSONLDatasetEngine
+
+    Reads newline-delimited JSON (JSON lines) files. Like the CSV
+    engine, every file is split into newline-aligned blocks of
+    (roughly) `part_size` bytes, using a cached block index, and
+    every block is parsed (in parallel) by the pyarrow JSON reader.
+    The blocks are parsed with an explicit schema, which is either
+    passed as `json_schema` (a ``pyarrow.Schema``), or inferred once
+    from the start of the first file. Nested JSON arrays are read as
+    list columns. Like the CSV engine, the row count of every block
+    is a cached count of its (non-empty) lines.
+    """
+
+    def __init__(
+        self, paths, part_size, storage_options=None, cpu=False, json_schema=None, **kwargs
+    ):
+        # pylint: disable=access-member-before-definition
+        super().__init__(paths, part_size, storage_options=storage_options, cpu=cpu)
+        if kwargs:
+            raise ValueError("Unexpected JSONLDatasetEngine argument(s).")
+        self.json_schema = json_schema
+
+        # Use the files of a (flat) directory
+        if len(self.paths) == 1 and self.fs.isdir(self.paths[0]):
+            self.paths = self.fs.glob(self.fs.sep.join([self.paths[0], "*"]))
+
+    def to_ddf(self, columns=None, cpu=None):
+
+        # Check if we are using cpu
+        cpu = self.cpu if cpu is None else cpu
+        if isinstance(columns, str):
+            columns = [columns]
+
+        schema = self._schema
+        meta = _table_to_frame(_select(schema.empty_table(), columns), cpu)
+        pieces = [
+            (path, int(start), int(end))
+            for path, offsets in zip(self.paths, self._block_index())
+            for start, end in zip(offsets[:-1], offsets[1:])
+        ]
+        token = tokenize(self.fs, self.paths, self.part_size, schema, columns, cpu)
+        name = "read-jsonl-" + token
+        dsk = {
+            (name, i): (
+                _read_jsonl_block,
+                self.fs,
+                path,
+                start,
+                end,
+                self._compression,
+                schema,
+                columns,
+                cpu,
+            )
+            for i, (path, start, end) in enumerate(pieces)
+        }
+        return new_dd_object(dsk, name, meta, [None] * (len(pieces) + 1))
+
+    def to_cpu(self):
+        self.cpu = True
+
+    def to_gpu(self):
+        self.cpu = False
+
+    @property  # type: ignore
+    @functools.lru_cache(1)
+    def _file_partition_map(self):
+        ind = 0
+        _pp_map = {}
+        for path, offsets in zip(self.paths, self._block_index()):
+            blocks = len(offsets) - 1
+            _pp_map[path.split(self.fs.sep)[-1]] = np.arange(ind, ind + blocks)
+            ind += blocks
+        return _pp_map
+
+    @property  # type: ignore
+    @functools.lru_cache(1)
+    def _partition_lens(self):
+        blocksize = parse_bytes(self.part_size) if self.part_size else None
+        counts = _block_line_counts(
+            self.fs,
+            self.paths,
+            self._block_index(),
+            f"jsonl-line-counts-{blocksize}-{self._compression}",
+            self._compression,
+        )
+        return [int(count) for file_counts in counts for count in file_counts]
+
+    @property
+    def num_rows(self):
+        return sum(self._partition_lens)
+
+    @property
+    def _compression(self):
+        return infer_compression(self.paths[0])
+
+    def _block_index(self):
+        # Newline-aligned block offsets of every file
+        # (planned like the blocks of the CSV engine)
+        blocksize = parse_bytes(self.part_size) if self.part_size else None
+        if self._compression or not blocksize:
+            # Compressed files can't be split
+            return [np.array([0, self.fs.size(path)]) for path in self.paths]
+
+        def _loader(fs, paths, infos):
+            return [
+                _csv_block_offsets(fs, path, int(info["size"]), blocksize).tobytes()
+                for path, info in zip(paths, infos)
+            ]
+
+        index = get_metadata_cache().get_many(
+            f"jsonl-block-index-{blocksize}", self.fs, self.paths, _loader
+        )
+        return [np.frombuffer(offsets, dtype="int64") for offsets in index]
+
+    @property  # type: ignore
+    @functools.lru_cache(1)
+    def _schema(self):
+        if self.json_schema is not None:
+            return self.json_schema
+        sample = _read_sample(self.fs, self.paths[0], self._compression)
+        table = pa_json.read_json(pa.py_buffer(sample), read_options=_read_options(sample))
+        return _normalize_schema(table.schema)
+
+
+def _normalize_schema(schema):
+    # Columns that are null in the sample are read as strings,
+    # so that the explicit schema can parse any later values
+    fields = []
+    for field in schema:
+        typ = field.type
+        if pa.types.is_null(typ):
+            typ = pa.string()
+        elif pa.types.is_list(typ) and pa.types.is_null(typ.value_type):
+            typ = pa.list_(pa.string())
+        fields.append(field.with_type(typ))
+    return pa.schema(fields)
+
+
+def _read_options(data):
+    # pyarrow parses the data in blocks that must hold (at least)
+    # one complete line, so the blocks can't be smaller than the
+    # longest line of `data`
+    arr = np.frombuffer(data, dtype="uint8")
+    ends = np.flatnonzero(arr == ord("\n"))
+    bounds = np.concatenate([[-1], ends, [len(arr)]])
+    longest = int(np.diff(bounds).max())
+    return pa_json.ReadOptions(use_threads=True, block_size=max(_JSON_BLOCK_SIZE, longest + 1))
+
+
+def _read_jsonl_block(fs, path, start, end, compression, schema, columns, cpu):
+    # Parse the lines in the bytes `[start, end)` of a file
+    # with the (multithreaded) pyarrow JSON reader
+    if compression:
+        with fs.open(path, "rb", compression=compression) as f:
+            data = f.read()
+    else:
+        data = _cat_ranges(fs, [path], [start], [end])[0] if end > start else b""
+    if not data.strip():
+        table = schema.empty_table()
+    else:
+        table = pa_json.read_json(
+            pa.py_buffer(data),
+            read_options=_read_options(data),
+            parse_options=pa_json.ParseOptions(
+                explicit_schema=schema, unexpected_field_behavior="ignore"
+            ),
+        )
+    return _table_to_frame(_select(table, columns), cpu)
@@ -0,0 +1,256 @@
+#
+# Copyright (c) 2022, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import json
+import math
+import posixpath
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import dask
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as pa_ds
+import pyarrow.parquet as pq
+
+from merlin.core.utils import global_dask_client
+
+# Name of the sidecar file written to the root of a dataset
+LOOKUP_INDEX_FILE = "_lookup_index.parquet"
+
+# Key of the sidecar schema metadata holding the index options
+_INDEX_METADATA_KEY = b"merlin.lookup_index"
+
+
+class LookupIndex:
+    """Per-row-group Bloom filters and min/max ranges of key columns
+
+    The index has one entry for every row-group of every file of a
+    parquet dataset. For each key column, an entry holds the minimum
+    and maximum value of the column, and a Bloom filter of its values,
+    so that the row-groups that may contain a given set of values can
+    be found without reading the data. The index is stored in a
+    "_lookup_index.parquet" sidecar file at the root of the dataset.
+
+    Parameters
+    ----------
+    table : pyarrow.Table
+        Index entries, with "file", "row_group" and "num_rows" columns,
+        and "<column>.min", "<column>.max" and "<column>.bloom" columns
+        for every key column.
+    columns : list of str
+        Key columns of the index.
+    num_hashes : int
+        Number of hash functions used by the Bloom filters.
+    """
+
+    def __init__(self, table, columns, num_hashes):
+        self.table = table
+        self.columns = list(columns)
+        self.num_hashes = num_hashes
+
+    @classmethod
+    def build(cls, fs, path, columns, fpp=0.01):
+        """Build the index of the parquet dataset at ``path``
+
+        The files (and row-groups) of the dataset are found in its
+        "_metadata" file(s), and only the key columns are read back.
+        The files are indexed in parallel (on the global Dask client,
+        if there is one).
+        """
+        columns = [columns] if isinstance(columns, str) else list(columns)
+        num_hashes = max(1, round(-math.log2(fpp)))
+        files = _dataset_files(fs, path)
+        tasks = [dask.delayed(_index_file)(fs, path, fn, columns, fpp, num_hashes) for fn in files]
+        client = global_dask_client()
+        if client:
+            entries = client.compute(tasks, sync=True)
+        else:
+            entries = dask.compute(tasks, scheduler="synchronous")[0]
+
+        rows = [row for file_rows in entries for row in file_rows]
+        data = {name: [row[name] for row in rows] for name in ("file", "row_group", "num_rows")}
+        for col in columns:
+            for kind in ("min", "max", "bloom"):
+                name = f"{col}.{kind}"
+                data[name] = [row[name] for row in rows]
+        table = pa.table(data)
+        return cls(table, columns, num_hashes)
+
+    @classmethod
+    def read(cls, fs, path):
+        """Read the index of the dataset at ``path``"""
+        with fs.open(posixpath.join(path, LOOKUP_INDEX_FILE), "rb") as f:
+            table = pq.read_table(f)
+        options = json.loads(table.schema.metadata[_INDEX_METADATA_KEY])
+        return cls(table.replace_schema_metadata(), options["columns"], options["num_hashes"])
+
+    def write(self, fs, path):
+        """Write the index to the root of the dataset at ``path``"""
+        options = {"columns": self.columns, "num_hashes": self.num_hashes}
+        table = self.table.replace_schema_metadata({_INDEX_METADATA_KEY: json.dumps(options)})
+        with fs.open(posixpath.join(path, LOOKUP_INDEX_FILE), "wb") as f:
+            pq.write_table(table, f)
+
+    def key_type(self, column):
+        """Arrow type of the values of key ``column``"""
+        return self.table.schema.field(f"{column}.min").type
+
+    def candidates(self, column, values):
+        """Return the row-groups that may contain any of ``values``
+
+        The result maps file paths (relative to the root of the
+        dataset) to lists of row-group indices.
+        """
+        if column not in self.columns:
+            raise ValueError(f"{column} is not a key column of this index: {self.columns}")
+        mins = self.table.column(f"{column}.min")
+        values = _key_array(pa.array(values).cast(self.key_type(column)))
+        keys, hashes = values.to_pylist(), _hash_values(values, unique=False)
+
+        out = defaultdict(list)
+        lo, hi = mins.to_pylist(), self.table.column(f"{column}.max").to_pylist()
+        blooms = self.table.column(f"{column}.bloom").to_pylist()
+        files = self.table.column("file").to_pylist()
+        row_groups = self.table.column("row_group").to_pylist()
+        for i, bloom in enumerate(blooms):
+            if bloom is None:
+                continue
+            in_range = [j for j, key in enumerate(keys) if lo[i] <= key <= hi[i]]
+            if in_range and _bloom_contains(bloom, hashes[in_range], self.num_hashes):
+                out[files[i]].append(row_groups[i])
+        return dict(out)
+
+
+def lookup(fs, path, column, values, columns=None, index=None):
+    """Read the rows of the parquet dataset at ``path`` where
+    ``column`` is one of ``values`` (as a ``pyarrow.Table``)
+
+    Only the row-groups listed by the index as candidates are read.
+    """
+    index = index or LookupIndex.read(fs, path)
+    candidates = {
+        posixpath.join(path, fn): row_groups
+        for fn, row_groups in index.candidates(column, values).items()
+    }
+    if not candidates:
+        return None
+
+    dataset = pa_ds.dataset(
+        list(candidates),
+        filesystem=fs,
+        format="parquet",
+        partitioning="hive",
+        partition_base_dir=path,
+    )
+    mask = pc.field(column).isin(pa.array(values).cast(index.key_type(column)))
+
+    def _read(fragment):
+        fragment = fragment.subset(row_group_ids=candidates[fragment.path])
+        return fragment.to_table(columns=columns, filter=mask)
+
+    fragments = list(dataset.get_fragments())
+    with ThreadPoolExecutor(max_workers=min(len(fragments), 16)) as pool:
+        tables = list(pool.map(_read, fragments))
+    return pa.concat_tables(tables)
+
+
+def _dataset_files(fs, path):
+    # Relative paths of the files listed in the "_metadata"
+    # file(s) of the dataset at `path` (in order)
+    files = []
+    metadata_paths = sorted(p for p in fs.find(path) if posixpath.basename(p) == "_metadata")
+    for metadata_path in metadata_paths:
+        directory = posixpath.relpath(posixpath.dirname(metadata_path), path.rstrip("/"))
+        with fs.open(metadata_path, "rb") as f:
+            md = pq.read_metadata(f)
+        for i in range(md.num_row_groups):
+            fn = md.row_group(i).column(0).file_path
+            fn = fn if directory == "." else posixpath.join(directory, fn)
+            if not files or files[-1] != fn:
+                files.append(fn)
+    if not files:
+        raise ValueError(f"Cannot build a lookup index without a _metadata file in {path}")
+    return files
+
+
+def _index_file(fs, path, fn, columns, fpp, num_hashes):
+    # Index entries of every row-group of a single file
+    rows = []
+    with fs.open(posixpath.join(path, fn), "rb") as f:
+        pf = pq.ParquetFile(f)
+        for i in range(pf.metadata.num_row_groups):
+            table = pf.read_row_group(i, columns=columns)
+            row = {"file": fn, "row_group": i, "num_rows": table.num_rows}
+            for col in columns:
+                values = _key_array(table.column(col))
+                min_max = pc.min_max(values)
+                row[f"{col}.min"] = min_max["min"].as_py()
+                row[f"{col}.max"] = min_max["max"].as_py()
+                row[f"{col}.bloom"] = (
+                    _bloom_filter(_hash_values(values), fpp, num_hashes) if len(values) else None
+                )
+            rows.append(row)
+    return rows
+
+
+def _key_array(values):
+    # Flat, non-null array of key values (dictionary-encoded
+    # columns are indexed by value)
+    if isinstance(values, pa.ChunkedArray):
+        values = values.combine_chunks()
+    if pa.types.is_dictionary(values.type):
+        values = values.dictionary_decode()
+    return values.drop_null()
+
+
+def _hash_values(values, unique=True):
+    # 64-bit hashes of the key values. Integers and floats
+    # are widened first, so that the hashes don't depend
+    # on the width of the column type
+    if pa.types.is_integer(values.type):
+        values = values.cast(pa.int64())
+    elif pa.types.is_floating(values.type):
+        values = values.cast(pa.float64())
+    hashes = pd.util.hash_array(values.to_numpy(zero_copy_only=False))
+    return np.unique(hashes) if unique else hashes
+
+
+def _bloom_filter(hashes, fpp, num_hashes):
+    # Bloom filter (as bytes) sized for `len(hashes)` distinct values
+    # and a false-positive probability of `fpp`
+    num_bits = max(64, int(math.ceil(-len(hashes) * math.log(fpp) / math.log(2) ** 2)))
+    num_bits = 8 * int(math.ceil(num_bits / 8))
+    bits = np.zeros(num_bits, dtype=bool)
+    bits[_bit_positions(hashes, num_bits, num_hashes)] = True
+    return np.packbits(bits).tobytes()
+
+
+def _bloom_contains(bloom, hashes, num_hashes):
+    # Whether any of the values with `hashes` may be in `bloom`
+    bits = np.unpackbits(np.frombuffer(bloom, dtype=np.uint8)).astype(bool)
+    positions = _bit_positions(hashes, len(bits), num_hashes)
+    return bool(bits[positions].all(axis=0).any())
+
+
+def _bit_positions(hashes, num_bits, num_hashes):
+    # Bit positions of every hash (with double hashing), as
+    # an array of shape (num_hashes, len(hashes))
+    h1 = hashes & np.uint64(0xFFFFFFFF)
+    h2 = (hashes >> np.uint64(32)) | np.uint64(1)
+    i = np.arange(num_hashes, dtype=np.uint64)[:, None]
+    return ((h1 + i * h2) % np.uint64(num_bits)).astype(np.int64)
@@ -0,0 +1,214 @@
+#
+# Copyright (c) 2022, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from dask.utils import parse_bytes
+
+LOG = logging.getLogger("merlin")
+
+# Schema of the sidecar file: one row per `(kind, file_identity)` key
+_SIDECAR_SCHEMA = pa.schema(
+    [
+        ("kind", pa.string()),
+        ("protocol", pa.string()),
+        ("path", pa.string()),
+        ("size", pa.int64()),
+        ("version", pa.string()),
+        ("value", pa.binary()),
+    ]
+)
+
+# Keys of `fs.info` results that identify a specific
+# version of a file (in order of preference)
+_VERSION_KEYS = ("ETag", "etag", "md5Hash", "mtime", "LastModified", "updated", "created")
+
+
+def file_identity(fs, path, info=None):
+    """Return a hashable key identifying a specific version of ``path``
+
+    The key is made of the file-system protocol, the path, the file
+    size, and the etag (or modification time) reported by ``fs.info``.
+    If the file changes, so does the key, so stale cache entries are
+    never returned.
+    """
+    info = info or fs.info(path)
+    version = None
+    for key in _VERSION_KEYS:
+        if info.get(key) is not None:
+            version = info[key]
+            break
+    protocol = fs.protocol if isinstance(fs.protocol, str) else fs.protocol[0]
+    return (protocol, str(path), int(info["size"]), str(version))
+
+
+class FileMetadataCache:
+    """Process-wide cache of serialized per-file metadata
+
+    Entries are byte strings (e.g. a serialized parquet footer)
+    keyed by ``(kind, file_identity)``, so a single cache can hold
+    several kinds of metadata for the same file. The cache is
+    bounded by the total size of the stored entries, and evicts
+    the least-recently-used entries first.
+
+    Parameters
+    ----------
+    sidecar_path : str, optional
+        Local (parquet) file used to persist the cache between
+        processes. If the file exists, its entries are loaded when the cache
+        is created. New entries are only written back by ``flush``.
+    max_bytes : int or str, default "512MiB"
+        Upper limit for the total size of the cached entries.
+    """
+
+    def __init__(self, sidecar_path=None, max_bytes="512MiB"):
+        self.sidecar_path = sidecar_path
+        self.max_bytes = parse_bytes(max_bytes)
+        self._entries = OrderedDict()
+        self._nbytes = 0
+        self._dirty = False
+        self._lock = threading.RLock()
+        if sidecar_path and os.path.exists(sidecar_path):
+            self._load()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, kind, fs, path, loader, info=None):
+        """Return the ``kind`` metadata for ``path``
+
+        ``loader(fs, path, info)`` is only called (and its result
+        cached) if there is no entry for the current version of
+        the file.
+        """
+        info = info or fs.info(path)
+        key = (kind, file_identity(fs, path, info=info))
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                return value
+        value = loader(fs, path, info)
+        self.put(key, value)
+        return value
+
+    def get_many(self, kind, fs, paths, loader, max_workers=32):
+        """Return the ``kind`` metadata for every path in ``paths``
+
+        Unlike ``get``, ``loader(fs, paths, infos)`` is called once
+        for all the paths that are missing from the cache, so that
+        it can fetch the metadata concurrently. It must return one
+        entry per path.
+        """
+        paths = list(paths)
+        if len(paths) > 1:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(paths))) as pool:
+                infos = list(pool.map(fs.info, paths))
+        else:
+            infos = [fs.info(path) for path in paths]
+        keys = [(kind, file_identity(fs, path, info=info)) for path, info in zip(paths, infos)]
+
+        values = [None] * len(paths)
+        with self._lock:
+            for i, key in enumerate(keys):
+                values[i] = self._entries.get(key)
+                if values[i] is not None:
+                    self._entries.move_to_end(key)
+
+        missing = [i for i, value in enumerate(values) if value is None]
+        if missing:
+            loaded = loader(fs, [paths[i] for i in missing], [infos[i] for i in missing])
+            for i, value in zip(missing, loaded):
+                values[i] = value
+                self.put(keys[i], value)
+        return values
+
+    def put(self, key, value):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._nbytes -= len(old)
+            self._entries[key] = value
+            self._nbytes += len(value)
+            self._dirty = True
+            while self._nbytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._nbytes -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+            self._dirty = True
+
+    def flush(self):
+        """Write the cache to the sidecar file (if one was specified)"""
+        with self._lock:
+            if not (self.sidecar_path and self._dirty):
+                return
+            entries = dict(self._entries)
+            self._dirty = False
+
+        # Write to a temporary file first, so concurrent
+        # readers never see a partially-written sidecar
+        tmp_path = f"{self.sidecar_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        rows = [(kind, *identity, bytes(value)) for (kind, identity), value in entries.items()]
+        columns = zip(*rows) if rows else [[]] * len(_SIDECAR_SCHEMA)
+        table = pa.table(
+            dict(zip(_SIDECAR_SCHEMA.names, map(list, columns))), schema=_SIDECAR_SCHEMA
+        )
+        try:
+            pq.write_table(table, tmp_path)
+            os.replace(tmp_path, self.sidecar_path)
+        except OSError as exc:
+            LOG.warning(f"Failed to write metadata cache to {self.sidecar_path}: {exc}")
+
+    def _load(self):
+        try:
+            table = pq.read_table(self.sidecar_path).select(_SIDECAR_SCHEMA.names)
+        except (OSError, KeyError, pa.ArrowException) as exc:
+            LOG.warning(f"Ignoring unreadable metadata cache {self.sidecar_path}: {exc}")
+            return
+        columns = [table.column(name).to_pylist() for name in _SIDECAR_SCHEMA.names]
+        for kind, protocol, path, size, version, value in zip(*columns):
+            self.put((kind, (protocol, path, size, version)), value)
+        self._dirty = False
+
+
+_CACHES = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def get_metadata_cache(sidecar_path=None):
+    """Return the process-wide ``FileMetadataCache``
+
+    Every Dataset in the process shares the same in-memory cache
+    for a given ``sidecar_path`` (``None`` meaning memory-only).
+    """
+    if sidecar_path is not None:
+        sidecar_path = os.path.abspath(os.path.expanduser(str(sidecar_path)))
+    with _CACHES_LOCK:
+        if sidecar_path not in _CACHES:
+            _CACHES[sidecar_path] = FileMetadataCache(sidecar_path=sidecar_path)
+        return _CACHES[sidecar_path]
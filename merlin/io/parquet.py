@@ -15,7 +15,6 @@
 #
 import functools
 import io as py_io
-import itertools
 import logging
 import math
 import operator
@@ -37,6 +36,7 @@ except ImportError:
 import dask
 import dask.dataframe as dd
 import fsspec
+import numpy as np
 import pandas as pd
 import pyarrow as pa
 import pyarrow.dataset as pa_ds
@@ -50,6 +50,7 @@ from dask.delayed import Delayed
 from dask.highlevelgraph import HighLevelGraph
 from dask.utils import natural_sort_key, parse_bytes
 from fsspec.core import get_fs_token_paths
+from fsspec.implementations.local import LocalFileSystem
 from pyarrow import parquet as pq
 from pyarrow.parquet import ParquetWriter as pwriter_pyarrow
 
@@ -59,10 +60,20 @@ else:
     aggregate_row_groups = None
 
 from merlin.core.utils import run_on_worker
+from merlin.io.block_cache import BlockCache, BlockCacheFileSystem
 from merlin.io.dataset_engine import DatasetEngine
-from merlin.io.fsspec_utils import _optimized_read_partition_remote, _optimized_read_remote
+from merlin.io.fsspec_utils import (
+    _arrow_filesystem,
+    _cat_ranges,
+    _merge_ranges,
+    _optimized_read_partition_remote,
+    _optimized_read_remote,
+    _parquet_column_chunk_ranges,
+)
+from merlin.io.metadata_cache import get_metadata_cache
 from merlin.io.shuffle import Shuffle, shuffle_df
-from merlin.io.writer import ThreadedWriter
+from merlin.io.writer import _MEMORY_SAMPLE_ROWS, ThreadedWriter, _row_memory_usage
+from merlin.schema import Tags
 
 LOG = logging.getLogger("merlin")
 
@@ -78,7 +89,7 @@ class CPUParquetEngine(ArrowDatasetEngine):
 
     @classmethod
     def read_partition(cls, *args, **kwargs):
-        part = ArrowDatasetEngine.read_partition(*args, **kwargs)
+        part = super().read_partition(*args, **kwargs)
         # NVTabular does NOT currently support nullable pandas dtypes.
         # Convert everything to non-nullable dtypes instead:
         # (TODO: Fix issues in Merlin/NVTabular for nullable dtypes)
@@ -93,6 +104,163 @@ class CPUParquetEngine(ArrowDatasetEngine):
                 part[k] = part[k].astype("O")
         return part
 
+    @classmethod
+    def _read_table(
+        cls,
+        path_or_frag,
+        fs,
+        row_groups,
+        columns,
+        schema,
+        filters,
+        partitions,
+        partition_keys,
+        **kwargs,
+    ):
+        read_kwargs = kwargs.get("read", {})
+        filter_pushdown, read_dictionary = False, None
+        if "filter_pushdown" in read_kwargs or "read_dictionary" in read_kwargs:
+            # Don't let our own options reach `pq.ParquetFile.read`
+            read_kwargs = read_kwargs.copy()
+            filter_pushdown = read_kwargs.pop("filter_pushdown", False)
+            read_dictionary = read_kwargs.pop("read_dictionary", None)
+            kwargs = {**kwargs, "read": read_kwargs}
+        if isinstance(path_or_frag, str) and not partitions:
+            if filter_pushdown and filters:
+                return _read_table_pushdown(
+                    path_or_frag, fs, row_groups, columns, schema, filters, read_dictionary
+                )
+            # Our own readers only support the default read options
+            default_read = not read_kwargs.get("open_file_options") and not (
+                set(read_kwargs) - {"open_file_options"}
+            )
+            if default_read:
+                if isinstance(fs, LocalFileSystem):
+                    return _read_table_local(path_or_frag, fs, row_groups, columns, read_dictionary)
+                return _read_table_remote(path_or_frag, fs, row_groups, columns, read_dictionary)
+        # Otherwise, dictionary columns are converted to
+        # categoricals by Dask (using the `categories` argument)
+        return super()._read_table(
+            path_or_frag,
+            fs,
+            row_groups,
+            columns,
+            schema,
+            filters,
+            partitions,
+            partition_keys,
+            **kwargs,
+        )
+
+
+def _read_table_pushdown(path, fs, row_groups, columns, schema, filters, read_dictionary=None):
+    # Read a single parquet piece with the `filters` pushed down
+    # into pyarrow. Row groups whose statistics can't satisfy the
+    # filters are never read, and the remaining rows are filtered
+    # in Arrow (before any conversion to pandas). Upstream Dask only
+    # uses `filters` to drop row groups from the partitioning plan.
+    read_options = {}
+    if read_dictionary:
+        read_options["dictionary_columns"] = read_dictionary
+        schema = _dictionary_schema(schema, read_dictionary)
+    fragment = pa_ds.ParquetFileFormat(read_options=read_options).make_fragment(
+        path,
+        filesystem=_arrow_filesystem(fs),
+        row_groups=None if row_groups == [None] else row_groups,
+    )
+    if columns is not None:
+        # ParquetDatasetEngine always reads with `index=False`
+        columns = [name for name in columns if name is not None]
+    return fragment.to_table(
+        schema=schema,
+        columns=columns,
+        filter=_filters_to_expression(filters),
+        use_threads=False,
+        fragment_scan_options=pa_ds.ParquetFragmentScanOptions(pre_buffer=True),
+    )
+
+
+def _dictionary_schema(schema, read_dictionary):
+    # Return `schema` with the `read_dictionary` columns
+    # converted to dictionary types
+    for name in read_dictionary:
+        index = schema.get_field_index(name)
+        if index >= 0 and not pa.types.is_dictionary(schema.field(index).type):
+            field = schema.field(index)
+            schema = schema.set(index, field.with_type(pa.dictionary(pa.int32(), field.type)))
+    return schema
+
+
+def _read_table_local(path, fs, row_groups, columns, read_dictionary=None):
+    # Read a single parquet piece from the local file system.
+    # The file is memory-mapped (so that column chunks are not
+    # copied through Python file objects), the column chunks we
+    # need are read with coalesced (pre-buffered) reads, and the
+    # footer comes from the process-wide metadata cache. Decoded
+    # buffers are allocated from (and recycled by) the default
+    # Arrow memory pool of the worker process.
+    md = _read_parquet_metadata(path, fs)
+    with pa.memory_map(path, "r") as source:
+        pf = pq.ParquetFile(source, metadata=md, pre_buffer=True, read_dictionary=read_dictionary)
+        if row_groups == [None]:
+            return pf.read(columns=columns, use_threads=False, use_pandas_metadata=True)
+        return pf.read_row_groups(
+            row_groups, columns=columns, use_threads=False, use_pandas_metadata=True
+        )
+
+
+def _read_table_remote(path, fs, row_groups, columns, read_dictionary=None):
+    # Read a single parquet piece from remote storage. The footer
+    # comes from the process-wide metadata cache, so that only the
+    # column chunks of the selected row groups (and columns) need to
+    # be fetched. These byte ranges are coalesced and fetched in
+    # parallel, and then copied to their offsets in a sparse
+    # in-memory image of the file, which pyarrow decodes without
+    # any further IO.
+    md = _read_parquet_metadata(path, fs)
+    row_groups = None if row_groups == [None] else row_groups
+    if columns is not None:
+        # ParquetDatasetEngine always reads with `index=False`, but
+        # `use_pandas_metadata` also reads the stored index columns
+        columns = [name for name in columns if name is not None]
+        columns_and_index = columns + _pandas_index_columns(md)
+    else:
+        columns_and_index = None
+
+    byte_ranges = _merge_ranges(
+        _parquet_column_chunk_ranges(md, row_groups, columns_and_index), fs=fs
+    )
+    if byte_ranges:
+        starts = [offset for offset, _ in byte_ranges]
+        ends = [offset + size for offset, size in byte_ranges]
+        buf = np.zeros(max(ends), dtype="u1")
+        chunks = _cat_ranges(fs, [path] * len(byte_ranges), starts, ends)
+        for start, chunk in zip(starts, chunks):
+            buf[start : start + len(chunk)] = np.frombuffer(chunk, dtype="u1")
+    else:
+        buf = np.zeros(0, dtype="u1")
+
+    pf = pq.ParquetFile(
+        pa.BufferReader(pa.py_buffer(buf)), metadata=md, read_dictionary=read_dictionary
+    )
+    if row_groups is None:
+        return pf.read(columns=columns, use_threads=False, use_pandas_metadata=True)
+    return pf.read_row_groups(
+        row_groups, columns=columns, use_threads=False, use_pandas_metadata=True
+    )
+
+
+def _pandas_index_columns(md):
+    # Names of the index columns stored in a parquet file by pandas
+    pandas_metadata = md.schema.to_arrow_schema().pandas_metadata or {}
+    return [name for name in pandas_metadata.get("index_columns", []) if isinstance(name, str)]
+
+
+# `filters_to_expression` was made public in pyarrow-10
+_filters_to_expression = getattr(pq, "filters_to_expression", None) or getattr(
+    pq, "_filters_to_expression"
+)
+
 
 # Define GPUParquetEngine if cudf is available
 if cudf is not None:
@@ -184,11 +352,88 @@ if cudf is not None:
                     df._data[col_name] = col.astype(typ)
 
 
-def _read_partition_lens(part, fs):
+# Number of bytes to fetch from the tail of a parquet file
+# when reading its footer. Larger footers need a second request.
+_FOOTER_SAMPLE_SIZE = 64_000
+
+
+def _read_parquet_footers(fs, paths, infos=None):
+    # Fetch the footers of many parquet files concurrently, and
+    # return each of them as a serialized (and self-contained)
+    # metadata blob. Only the tail of each file is transferred.
+    infos = infos or [fs.info(path) for path in paths]
+    sizes = [int(info["size"]) for info in infos]
+
+    # Step 1 - Fetch a fixed-size sample from the tail of every file
+    tails = _cat_ranges(
+        fs,
+        paths,
+        [max(0, size - _FOOTER_SAMPLE_SIZE) for size in sizes],
+        sizes,
+    )
+
+    # Step 2 - Re-fetch the (few) footers that are larger than the sample
+    footer_sizes = []
+    for path, tail in zip(paths, tails):
+        if len(tail) < 12 or tail[-4:] != b"PAR1":
+            raise ValueError(f"{path} is not a valid parquet file.")
+        footer_sizes.append(int.from_bytes(tail[-8:-4], "little"))
+    redo = [i for i, tail in enumerate(tails) if len(tail) < footer_sizes[i] + 8]
+    if redo:
+        refetched = _cat_ranges(
+            fs,
+            [paths[i] for i in redo],
+            [sizes[i] - footer_sizes[i] - 8 for i in redo],
+            [sizes[i] for i in redo],
+        )
+        for i, tail in zip(redo, refetched):
+            tails[i] = tail
+
+    # Prepend the magic bytes so that each blob has the
+    # same layout as a stand-alone `_metadata` file
+    return [
+        b"PAR1" + tail[len(tail) - footer_size - 8 :]
+        for tail, footer_size in zip(tails, footer_sizes)
+    ]
+
+
+def _read_parquet_footer(fs, path, info=None):
+    return _read_parquet_footers(fs, [path], None if info is None else [info])[0]
+
+
+def _read_parquet_metadata(path, fs, cache=None):
+    """Return the footer metadata of a parquet file
+
+    The serialized footer is stored in a `FileMetadataCache`
+    (keyed by the path, size and version of the file), so that
+    the same footer is only read once per process. A new
+    `FileMetaData` object is returned on every call, because
+    callers are free to modify it (e.g. with `set_file_path`).
+    """
+    if cache is None:
+        cache = get_metadata_cache()
+    footer = cache.get("parquet-footer", fs, path, _read_parquet_footer)
+    return pq.read_metadata(pa.BufferReader(footer))
+
+
+def _read_parquet_metadata_many(paths, fs, cache=None):
+    """Return a dict mapping each path to its footer metadata
+
+    Footers that are not cached yet are fetched concurrently.
+    """
+    if cache is None:
+        cache = get_metadata_cache()
+    paths = list(dict.fromkeys(paths))
+    footers = cache.get_many("parquet-footer", fs, paths, _read_parquet_footers)
+    return {path: pq.read_metadata(pa.BufferReader(footer)) for path, footer in zip(paths, footers)}
+
+
+def _read_partition_lens(part, fs, cache=None, metadata=None):
     # Manually read row-count statistics from the Parquet
     # metadata for a single `read_parquet` `part`. Return
     # the result in the same format that `read_metadata`
-    # returns statistics
+    # returns statistics. Footers are taken from the
+    # `metadata` dict when it is specified.
 
     if not isinstance(part, list):
         part = [part]
@@ -200,8 +445,10 @@ def _read_partition_lens(part, fs):
         row_groups = piece[1]
         if row_groups == [None]:
             row_groups = None
-        with fs.open(path, default_cache="none") as f:
-            md = pq.ParquetFile(f).metadata
+        if metadata is not None and path in metadata:
+            md = metadata[path]
+        else:
+            md = _read_parquet_metadata(path, fs, cache=cache)
         if row_groups is None:
             row_groups = list(range(md.num_row_groups))
         for rg in row_groups:
@@ -305,6 +552,93 @@ def _override_read_metadata(
     return read_metadata_result
 
 
+class ParquetPartitionPlan:
+    """Assignment of parquet row-groups to Dataset partitions
+
+    Parameters
+    ----------
+    partitions : list of list of tuple
+        The ``(path, row_group)`` pairs to read for each partition
+        (in order).
+    num_rows : list of int, optional
+        Number of rows in each partition.
+    nbytes : list of int, optional
+        Estimated in-memory size of each partition (in bytes).
+    """
+
+    def __init__(self, partitions, num_rows=None, nbytes=None):
+        self.partitions = [[(path, int(rg)) for path, rg in part] for part in partitions]
+        self.num_rows = num_rows
+        self.nbytes = nbytes
+
+    @classmethod
+    def from_row_groups(cls, row_groups, part_size, memory_ratio=1.0, aggregate_files=False):
+        """Pack row-groups into partitions of (approximately) ``part_size`` bytes
+
+        Parameters
+        ----------
+        row_groups : iterable of tuple
+            ``(path, row_group, num_rows, total_byte_size)`` for every
+            row-group to read, where ``total_byte_size`` is the
+            uncompressed size recorded in the parquet footer.
+        part_size : int or str
+            Target in-memory size of each partition.
+        memory_ratio : float, default 1.0
+            Ratio of the in-memory size of a row-group to its
+            ``total_byte_size`` in the footer.
+        aggregate_files : bool or str, default False
+            Whether row-groups from different files may be packed into
+            the same partition. If a string is specified, only files
+            within the same directory are aggregated.
+        """
+        part_size = parse_bytes(part_size)
+        partitions, num_rows, nbytes = [], [], []
+        current, current_rows, current_bytes, current_key = [], 0, 0, None
+        for path, rg, rg_rows, rg_size in row_groups:
+            if not aggregate_files:
+                key = path
+            elif isinstance(aggregate_files, str):
+                key = os.path.dirname(path)
+            else:
+                key = None
+            rg_bytes = int(rg_size * memory_ratio)
+            if current and (key != current_key or current_bytes + rg_bytes > part_size):
+                partitions.append(current)
+                num_rows.append(current_rows)
+                nbytes.append(current_bytes)
+                current, current_rows, current_bytes = [], 0, 0
+            current.append((path, rg))
+            current_rows += rg_rows
+            current_bytes += rg_bytes
+            current_key = key
+        if current:
+            partitions.append(current)
+            num_rows.append(current_rows)
+            nbytes.append(current_bytes)
+        return cls(partitions, num_rows=num_rows, nbytes=nbytes)
+
+    @property
+    def npartitions(self):
+        return len(self.partitions)
+
+    def __len__(self):
+        return len(self.partitions)
+
+    def __iter__(self):
+        return iter(self.partitions)
+
+    def __dask_tokenize__(self):
+        return tuple(tuple(part) for part in self.partitions)
+
+    def __repr__(self):
+        if self.nbytes:
+            return (
+                f"ParquetPartitionPlan(npartitions={self.npartitions}, "
+                f"min_bytes={min(self.nbytes)}, max_bytes={max(self.nbytes)})"
+            )
+        return f"ParquetPartitionPlan(npartitions={self.npartitions})"
+
+
 class ParquetDatasetEngine(DatasetEngine):
     """ParquetDatasetEngine is a Dask-based version of cudf.read_parquet."""
 
@@ -330,16 +664,51 @@ class ParquetDatasetEngine(DatasetEngine):
         self.aggregate_files = self.read_parquet_kwargs.pop("aggregate_files", False)
         self.filters = self.read_parquet_kwargs.pop("filters", None)
         self.dataset_kwargs = self.read_parquet_kwargs.pop("dataset", {})
-
-        if row_groups_per_part is None:
+        self.metadata_cache_path = self.read_parquet_kwargs.pop("metadata_cache_path", None)
+        self.filter_pushdown = self.read_parquet_kwargs.pop("filter_pushdown", False)
+        self._plan_option = self.read_parquet_kwargs.pop("partition_plan", None)
+        self.read_dictionary = self.read_parquet_kwargs.pop("read_dictionary", None)
+        self.block_cache = self.read_parquet_kwargs.pop("block_cache", None)
+        self._plan = None
+        self._memory_ratio = 1.0
+
+        if isinstance(self._plan_option, ParquetPartitionPlan):
+            self._plan = self._plan_option
+        elif self._plan_option not in (None, "bytes"):
+            raise ValueError(
+                f"partition_plan must be None, 'bytes' or a ParquetPartitionPlan. "
+                f"Got {self._plan_option}"
+            )
+        if self._plan_option is not None and not hasattr(dd, "from_map"):
+            raise ValueError("This version of Dask does not support the `partition_plan` argument.")
+
+        # Read remote files through a local-disk block cache
+        if self.block_cache is not None and not isinstance(self.fs, LocalFileSystem):
+            if isinstance(self.block_cache, (str, os.PathLike)):
+                self.block_cache = BlockCache(self.block_cache)
+            elif isinstance(self.block_cache, dict):
+                self.block_cache = BlockCache(**self.block_cache)
+            self.fs = BlockCacheFileSystem(self.fs, self.block_cache)
+
+        if row_groups_per_part is None or self._plan_option == "bytes":
             self._real_meta, rg_byte_size_0 = run_on_worker(
                 _sample_row_group,
                 self._path0,
                 self.fs,
                 cpu=self.cpu,
                 memory_usage=True,
+                metadata_cache_path=self.metadata_cache_path,
                 **self.read_parquet_kwargs,
             )
+
+            if self._plan_option == "bytes":
+                # Measure how much bigger (or smaller) a row-group is in
+                # memory than its uncompressed size in the footer
+                md = _read_parquet_metadata(self._path0, self.fs, cache=self._metadata_cache)
+                if md.num_row_groups and md.row_group(0).total_byte_size:
+                    self._memory_ratio = rg_byte_size_0 / md.row_group(0).total_byte_size
+
+        if row_groups_per_part is None:
             row_groups_per_part = self.part_size / rg_byte_size_0
             if row_groups_per_part < 1.0:
                 warnings.warn(
@@ -392,6 +761,23 @@ class ParquetDatasetEngine(DatasetEngine):
             dataset = pa_ds.dataset(paths[0], filesystem=fs)
         return dataset
 
+    @property
+    def _metadata_cache(self):
+        # Footer cache shared by all Dataset objects in this
+        # process (and persisted to `metadata_cache_path`)
+        return get_metadata_cache(self.metadata_cache_path)
+
+    @property
+    def partition_plan(self):
+        """The ``ParquetPartitionPlan`` used to read this dataset
+
+        This is ``None`` unless the engine was created with
+        ``partition_plan="bytes"`` (or with an explicit plan).
+        """
+        if self._plan is None and self._plan_option is not None:
+            _ = self.to_ddf()
+        return self._plan
+
     @property
     def _file_partition_map(self):
         if self._pp_map is None:
@@ -400,15 +786,19 @@ class ParquetDatasetEngine(DatasetEngine):
 
     @property
     def _partition_lens(self):
+        if self.cpu and self.filter_pushdown and self.filters:
+            # Rows are filtered within the row groups, so the
+            # footer row counts don't match the partitions
+            return None
         if self._pp_nrows is None:
             self._process_parquet_metadata()
         return self._pp_nrows
 
     @property
     def num_rows(self):
-        # TODO: Avoid parsing metadata once upstream dask
-        # can get the length efficiently (in all practical cases)
-        if self._partition_lens:
+        # The row counts come from the (cached) parquet footers,
+        # so the data itself is only read if they are unknown
+        if self._partition_lens is not None:
             return sum(self._partition_lens)
         return len(self.to_ddf().index)
 
@@ -426,8 +816,16 @@ class ParquetDatasetEngine(DatasetEngine):
         stats = self._pp_metadata["stats"]
         if not stats:
             # Update stats if `dd.read_parquet` didn't populate it
-            stats = [_read_partition_lens(part, self.fs) for part in parts]
+            # Fetch all the footers we need concurrently
+            cache = self._metadata_cache
+            part_paths = []
+            for part in parts:
+                for p in part if isinstance(part, list) else [part]:
+                    part_paths.append(p["piece"][0])
+            metadata = _read_parquet_metadata_many(part_paths, self.fs, cache=cache)
+            stats = [_read_partition_lens(part, self.fs, metadata=metadata) for part in parts]
             self._pp_metadata["stats"] = stats
+            cache.flush()
         _pp_map = {}
         _pp_nrows = []
         distinct_files = True
@@ -457,6 +855,22 @@ class ParquetDatasetEngine(DatasetEngine):
         metadata_collector = {"stats": [], "parts": []}
         dataset_kwargs = {"metadata_collector": metadata_collector}
         dataset_kwargs.update(self.dataset_kwargs)
+        read_parquet_kwargs = self.read_parquet_kwargs.copy()
+        read_options = {}
+        if cpu and self.filter_pushdown:
+            # Ask `CPUParquetEngine` to filter rows within pyarrow
+            read_options["filter_pushdown"] = True
+        if cpu and isinstance(self.read_dictionary, list) and self.read_dictionary:
+            # Ask `CPUParquetEngine` to read these columns as Arrow
+            # dictionaries, and Dask to produce pandas categoricals
+            read_options["read_dictionary"] = self.read_dictionary
+            categories = list(read_parquet_kwargs.get("categories") or [])
+            categories += [
+                name for name in self.read_dictionary if columns is None or name in columns
+            ]
+            read_parquet_kwargs["categories"] = categories
+        if read_options:
+            read_parquet_kwargs["read"] = {**read_parquet_kwargs.get("read", {}), **read_options}
         ddf = dd.read_parquet(
             self.paths,
             columns=columns,
@@ -464,14 +878,92 @@ class ParquetDatasetEngine(DatasetEngine):
             index=False,
             aggregate_files=self.aggregate_files,
             filters=self.filters,
-            split_row_groups=self.row_groups_per_part,
-            storage_options=self.storage_options,
+            # Read one row-group per partition if we are going to
+            # repartition the collection with a `ParquetPartitionPlan`
+            split_row_groups=1 if self._plan_option is not None else self.row_groups_per_part,
             dataset=dataset_kwargs,
-            **self.read_parquet_kwargs,
+            **self._filesystem_kwargs,
+            **read_parquet_kwargs,
         )
+        if self._plan_option is not None:
+            ddf = self._apply_partition_plan(ddf, metadata_collector)
         self._pp_metadata = metadata_collector
         return ddf
 
+    @property
+    def _filesystem_kwargs(self):
+        # Pass the (wrapped) file system itself to Dask
+        # if the files are read through a block cache
+        if isinstance(self.fs, BlockCacheFileSystem):
+            return {"filesystem": self.fs}
+        return {"storage_options": self.storage_options}
+
+    def _apply_partition_plan(self, ddf, metadata_collector):
+        # Replace the single-row-group partitions of `ddf` with the
+        # partitions of `self.partition_plan`. The plan is generated
+        # from the row-group sizes in the parquet footers (unless the
+        # user specified one), and the partitions are read by the same
+        # IO function that `dd.read_parquet` generated for `ddf`.
+        parts = metadata_collector["parts"]
+        if not parts:
+            return ddf
+
+        cache = self._metadata_cache
+        metadata = _read_parquet_metadata_many([part["piece"][0] for part in parts], self.fs, cache)
+        cache.flush()
+        row_groups, partition_keys = [], {}
+        for part in parts:
+            path, rgs, keys = part["piece"]
+            md = metadata[path]
+            if rgs is None or rgs == [None]:
+                rgs = range(md.num_row_groups)
+            elif not isinstance(rgs, list):
+                rgs = [rgs]
+            for rg in rgs:
+                rg_md = md.row_group(rg)
+                row_groups.append((path, rg, rg_md.num_rows, rg_md.total_byte_size))
+                partition_keys[(path, rg)] = keys
+
+        if self._plan is None:
+            self._plan = ParquetPartitionPlan.from_row_groups(
+                row_groups,
+                self.part_size,
+                memory_ratio=self._memory_ratio,
+                aggregate_files=self.aggregate_files,
+            )
+        plan = self._plan
+
+        # Convert the plan into `read_parquet` parts, with a single
+        # piece for each file (and a list of pieces if the partition
+        # spans multiple files)
+        rg_rows = {(path, rg): nrows for path, rg, nrows, _ in row_groups}
+        new_parts, stats = [], []
+        for partition in plan:
+            pieces, nrows = [], 0
+            for path, rg in partition:
+                if (path, rg) not in partition_keys:
+                    raise ValueError(f"Row-group {rg} of {path} is not part of this dataset.")
+                if pieces and pieces[-1]["piece"][0] == path:
+                    pieces[-1]["piece"][1].append(rg)
+                else:
+                    pieces.append({"piece": (path, [rg], partition_keys[(path, rg)])})
+                nrows += rg_rows[(path, rg)]
+            new_parts.append(pieces[0] if len(pieces) == 1 else pieces)
+            stats.append({"num-rows": nrows, "columns": []})
+        metadata_collector["parts"] = new_parts
+        metadata_collector["stats"] = stats
+
+        io_func = ddf.dask.layers[ddf._name].io_func
+        return dd.from_map(
+            io_func,
+            new_parts,
+            meta=ddf._meta,
+            divisions=[None] * (len(new_parts) + 1),
+            label="read-parquet",
+            token=tokenize(ddf._name, plan),
+            enforce_metadata=False,
+        )
+
     def to_cpu(self):
         self.cpu = True
 
@@ -503,6 +995,7 @@ class ParquetDatasetEngine(DatasetEngine):
             cpu=self.cpu,
             n=n,
             memory_usage=False,
+            metadata_cache_path=self.metadata_cache_path,
             **self.read_parquet_kwargs,
         ).take(list(range(n)))
 
@@ -588,13 +1081,18 @@ class ParquetDatasetEngine(DatasetEngine):
         else:
             # No metadata file - Collect manually
             metadata = None
+            cache = self._metadata_cache
+            piece_metadata = _read_parquet_metadata_many(
+                [piece.path for piece in pa_dataset.pieces], self.fs, cache=cache
+            )
             for piece, fn in zip(pa_dataset.pieces, fns):
-                md = piece.get_metadata()
+                md = piece_metadata[piece.path]
                 md.set_file_path(fn)
                 if metadata:
                     _append_row_groups(metadata, md, schema_errors, piece.path)
                 else:
                     metadata = md
+            cache.flush()
 
             # Check for inconsistent schemas.
             # This is not a problem if a _metadata file exists
@@ -955,8 +1453,199 @@ def _write_data(data_list, output_path, fs, fn):
     return {fn: {"md": writer.close(metadata_file_path=fn), "rows": rows}}
 
 
+# `write_page_index` was added to `pq.ParquetWriter` in pyarrow-13
+_PAGE_INDEX_SUPPORTED = Version(pa.__version__) >= Version("13.0.0")
+
+
+class ParquetWriteProfile:
+    """Encoding and compression options for the parquet writers
+
+    Parameters
+    ----------
+    compression : str, optional
+        Codec to use for every column (e.g. "zstd", "lz4" or "snappy").
+        By default, the data is not compressed.
+    compression_level : int, optional
+        Compression level for ``compression`` (if the codec supports it).
+        Columns that ``column_compression`` moves to another codec don't
+        use this level.
+    column_compression : dict, optional
+        Per-column codecs, overriding ``compression``. The keys are
+        column names or schema ``Tags`` (resolved with ``resolve``),
+        and the values are a codec name or a ``(codec, level)`` tuple.
+        Explicit column names take precedence over tags.
+    use_dictionary : bool or list of str, default True
+        Whether to dictionary-encode the data (or the list of
+        columns to dictionary-encode).
+    data_page_size : int or str, optional
+        Target size of the (uncompressed) data pages.
+    row_group_size : int or str, default "128MB"
+        Target in-memory size of the data written to each row-group.
+    row_group_encoded_size : int or str, optional
+        Target encoded (compressed) size of each row-group. If specified,
+        the CPU writer adapts the number of rows per row-group to the
+        encoded size of the data it has written so far, instead of
+        targeting ``row_group_size``.
+    write_statistics : bool or list of str, default True
+        Whether to write column statistics (or the list of columns to
+        write statistics for).
+    write_page_index : bool, default False
+        Whether to write the column and offset indexes (page-level
+        statistics), which let readers skip individual pages.
+
+    Notes
+    -----
+    The GPU writer only supports a single codec, the statistics
+    options and the row-group and page size targets.
+    """
+
+    def __init__(
+        self,
+        compression=None,
+        compression_level=None,
+        column_compression=None,
+        use_dictionary=True,
+        data_page_size=None,
+        row_group_size="128MB",
+        row_group_encoded_size=None,
+        write_statistics=True,
+        write_page_index=False,
+    ):
+        self.compression = compression
+        self.compression_level = compression_level
+        self.column_compression = dict(column_compression or {})
+        self.use_dictionary = use_dictionary
+        self.data_page_size = parse_bytes(data_page_size) if data_page_size else None
+        self.row_group_size = parse_bytes(row_group_size)
+        self.row_group_encoded_size = (
+            parse_bytes(row_group_encoded_size) if row_group_encoded_size else None
+        )
+        self.write_statistics = write_statistics
+        self.write_page_index = write_page_index
+
+    @classmethod
+    def from_arg(cls, write_profile):
+        # Convert a `to_parquet(write_profile=...)` argument
+        if write_profile is None or isinstance(write_profile, cls):
+            return write_profile
+        if isinstance(write_profile, dict):
+            return cls(**write_profile)
+        raise TypeError(f"{type(write_profile)} not a supported type for `write_profile`.")
+
+    def _options(self):
+        return dict(
+            compression=self.compression,
+            compression_level=self.compression_level,
+            column_compression=self.column_compression,
+            use_dictionary=self.use_dictionary,
+            data_page_size=self.data_page_size,
+            row_group_size=self.row_group_size,
+            row_group_encoded_size=self.row_group_encoded_size,
+            write_statistics=self.write_statistics,
+            write_page_index=self.write_page_index,
+        )
+
+    def resolve(self, schema):
+        """Return a copy of this profile with the ``Tags`` keys of
+        ``column_compression`` replaced by the matching column names
+        in ``schema``"""
+        column_compression = {}
+        for key, codec in self.column_compression.items():
+            if isinstance(key, Tags):
+                for name in schema.select_by_tag(key).column_names:
+                    column_compression.setdefault(name, codec)
+        column_compression.update(
+            {k: v for k, v in self.column_compression.items() if not isinstance(k, Tags)}
+        )
+        return type(self)(**{**self._options(), "column_compression": column_compression})
+
+    def pyarrow_kwargs(self, schema):
+        """Return the ``pq.ParquetWriter`` options for the ``pa.Schema`` ``schema``"""
+        kwargs = {
+            "compression": self.compression,
+            "use_dictionary": self.use_dictionary,
+            "write_statistics": self.write_statistics,
+        }
+        if self.compression_level is not None:
+            kwargs["compression_level"] = self.compression_level
+        if self.column_compression:
+            # pyarrow expects the codec of every leaf column
+            # (a column without a codec is not compressed)
+            codecs, levels = {}, {}
+            for field in schema:
+                codec = self.column_compression.get(field.name, self.compression)
+                level = None
+                if isinstance(codec, tuple):
+                    codec, level = codec
+                elif str(codec).lower() == str(self.compression).lower():
+                    # The default level only applies to the default codec
+                    level = self.compression_level
+                for path in _leaf_column_paths(field):
+                    codecs[path] = codec or "none"
+                    if level is not None:
+                        levels[path] = level
+            kwargs["compression"] = codecs
+            kwargs["compression_level"] = levels or None
+        if self.data_page_size:
+            kwargs["data_page_size"] = self.data_page_size
+        if self.write_page_index:
+            if _PAGE_INDEX_SUPPORTED:
+                kwargs["write_page_index"] = True
+            else:
+                warnings.warn("write_page_index requires pyarrow>=13.0.0, and will be ignored.")
+        return kwargs
+
+    def cudf_kwargs(self):
+        """Return the ``cudf`` ParquetWriter options"""
+        if self.column_compression:
+            warnings.warn("column_compression is not supported by the GPU parquet writer.")
+        if self.write_page_index:
+            statistics = "PAGE"
+        elif self.write_statistics:
+            statistics = "ROWGROUP"
+        else:
+            statistics = "NONE"
+        kwargs = {
+            "compression": self.compression,
+            "statistics": statistics,
+            "row_group_size_bytes": self.row_group_size,
+        }
+        if self.data_page_size:
+            kwargs["max_page_size_bytes"] = self.data_page_size
+        return kwargs
+
+    def __dask_tokenize__(self):
+        return tokenize(sorted((k, str(v)) for k, v in self._options().items()))
+
+    def __repr__(self):
+        options = ", ".join(f"{k}={v!r}" for k, v in self._options().items())
+        return f"ParquetWriteProfile({options})"
+
+
+def _leaf_column_paths(field, prefix=""):
+    # Return the parquet column paths of the leaf
+    # columns written for the Arrow field `field`
+    path = prefix + field.name
+    field_type = field.type
+    if pa.types.is_dictionary(field_type):
+        field_type = field_type.value_type
+    if pa.types.is_list(field_type) or pa.types.is_large_list(field_type):
+        return _leaf_column_paths(field_type.value_field, path + ".list.")
+    if pa.types.is_struct(field_type):
+        return [
+            leaf
+            for i in range(field_type.num_fields)
+            for leaf in _leaf_column_paths(field_type[i], path + ".")
+        ]
+    if pa.types.is_map(field_type):
+        return _leaf_column_paths(field_type.key_field, path + ".key_value.") + (
+            _leaf_column_paths(field_type.item_field, path + ".key_value.")
+        )
+    return [path]
+
+
 class BaseParquetWriter(ThreadedWriter):
-    def __init__(self, out_dir, suffix=".parquet", **kwargs):
+    def __init__(self, out_dir, suffix=".parquet", write_profile=None, **kwargs):
         super().__init__(out_dir, **kwargs)
         self.data_files = []
         self.data_bios = []
@@ -964,6 +1653,7 @@ class BaseParquetWriter(ThreadedWriter):
         self.pwriter = self._pwriter
         self.pwriter_kwargs = {}
         self.suffix = suffix
+        self.write_profile = write_profile or ParquetWriteProfile()
 
     @property
     def _pwriter(self):
@@ -1016,22 +1706,18 @@ class BaseParquetWriter(ThreadedWriter):
         """Write data"""
         raise (NotImplementedError)
 
-    def _write_thread(self):
-        while True:
-            item = self.queue.get()
-            try:
-                if item is self._eod:
-                    break
-                idx, data = item
-                with self.write_locks[idx]:
-                    self._write_table(idx, data)
-            finally:
-                self.queue.task_done()
+    @classmethod
+    def merge_special_metadata(cls, data_list, per_directory=False):
+        """Merge the parquet metadata of many writers (in order)"""
+        return ParquetMetadataShards.merge(
+            [ParquetMetadataShards.from_arg(data, per_directory) for data in data_list],
+            per_directory=per_directory,
+        )
 
     @classmethod
     def write_special_metadata(cls, data, fs, out_dir):
-        """Write global _metadata file"""
-        raise (NotImplementedError)
+        """Write global (or per-directory) _metadata file(s)"""
+        ParquetMetadataShards.from_arg(data).write(fs, out_dir)
 
     def _close_writers(self):
         """Close writers and return extracted metadata"""
@@ -1054,6 +1740,8 @@ class GPUParquetWriter(BaseParquetWriter):
         # Passing index=False when creating ParquetWriter
         # to avoid bug: https://github.com/rapidsai/cudf/issues/7011
         self.pwriter_kwargs = {"compression": None, "index": False}
+        if kwargs.get("write_profile") is not None:
+            self.pwriter_kwargs.update(self.write_profile.cudf_kwargs())
 
     @property
     def _pwriter(self):
@@ -1064,21 +1752,14 @@ class GPUParquetWriter(BaseParquetWriter):
 
     def _to_parquet(self, df, sink):
         fn = sink.split(self.fs.sep)[-1]
-        return df.to_parquet(sink, metadata_file_path=fn, compression=None, index=False)
+        return df.to_parquet(
+            sink, metadata_file_path=fn, **tlz.dissoc(self.pwriter_kwargs, "index"), index=False
+        )
 
     def _write_table(self, idx, data):
         writer = self._get_or_create_writer(idx)
         writer.write_table(data)
 
-    @classmethod
-    def write_special_metadata(cls, data, fs, out_dir):
-        # Sort metadata by file name and convert list of
-        # tuples to a list of metadata byte-blobs
-        md_list = [m[1] for m in sorted(list(data.items()), key=lambda x: natural_sort_key(x[0]))]
-
-        # Aggregate metadata and write _metadata file
-        _write_pq_metadata_file_cudf(md_list, fs, out_dir)
-
     def _close_writers(self):
         md_dict = {}
         _fns = self.fns or [path.split(self.fs.sep)[-1] for path in self.data_paths]
@@ -1089,11 +1770,76 @@ class GPUParquetWriter(BaseParquetWriter):
         return md_dict
 
 
+class _RowGroupSizer:
+    """Running estimate of the number of rows to write to each
+    row-group, so that row-groups are close to a target size
+
+    The number of rows is derived from the in-memory size of the
+    rows being written. If ``encoded=True``, the target is the
+    encoded (compressed) size of the row-groups, and the in-memory
+    size is scaled by an exponentially-weighted average of the
+    encoded/in-memory size ratio observed in previous writes.
+    """
+
+    def __init__(self, target_bytes, encoded=False, weight=0.5):
+        self.target_bytes = target_bytes
+        self.encoded = encoded
+        self.weight = weight
+        self.ratio = None
+        self._lock = threading.Lock()
+
+    def num_rows(self, row_memory):
+        row_bytes = row_memory * (self.ratio or 1.0) if self.encoded else row_memory
+        return max(math.ceil(self.target_bytes / max(row_bytes, 1e-3)), 1)
+
+    def update(self, row_memory, row_encoded):
+        if row_memory <= 0 or row_encoded <= 0:
+            return
+        with self._lock:
+            ratio = row_encoded / row_memory
+            if self.ratio is None:
+                self.ratio = ratio
+            else:
+                self.ratio += self.weight * (ratio - self.ratio)
+
+
+def _row_group_sizes(metadata_list):
+    # Encoded (compressed) size of every row-group in `metadata_list`
+    sizes = []
+    for md in metadata_list:
+        for i in range(md.num_row_groups):
+            row_group = md.row_group(i)
+            sizes.append(
+                sum(row_group.column(j).total_compressed_size for j in range(row_group.num_columns))
+            )
+    return sizes
+
+
+def _describe_sizes(sizes):
+    # Summarize a distribution of (row-group) sizes
+    sizes = sorted(sizes)
+    if not sizes:
+        return {"count": 0}
+    return {
+        "count": len(sizes),
+        "min": sizes[0],
+        "median": sizes[len(sizes) // 2],
+        "p90": sizes[min(int(len(sizes) * 0.9), len(sizes) - 1)],
+        "max": sizes[-1],
+        "mean": sum(sizes) / len(sizes),
+    }
+
+
 class CPUParquetWriter(BaseParquetWriter):
     def __init__(self, out_dir, **kwargs):
         super().__init__(out_dir, **kwargs)
         self.md_collectors = {}
-        self.pwriter_kwargs = {"compression": None}
+        self.row_group_sizes = []
+        self._schema = None
+        encoded_size = self.write_profile.row_group_encoded_size
+        self._sizer = _RowGroupSizer(
+            encoded_size or self.write_profile.row_group_size, encoded=encoded_size is not None
+        )
 
     @property
     def _pwriter(self):
@@ -1102,23 +1848,26 @@ class CPUParquetWriter(BaseParquetWriter):
     def _read_parquet(self, source):
         return pd.read_parquet(source, engine="pyarrow")
 
-    def _get_row_group_size(self, df):
+    def _get_row_group_size(self, df, row_memory=None):
         # Make sure our `row_group_size` argument (which corresponds
         # to the number of rows in each row-group) will produce
-        # row-groups ~128MB in size.
-        if not hasattr(self, "_row_group_size"):
-            row_size = df.memory_usage(deep=True).sum() / max(len(df), 1)
-            self._row_group_size = math.ceil(128_000_000 / row_size)
-        return self._row_group_size
+        # row-groups close to the target size of the write profile
+        # (~128MB in memory by default). The size of the rows is
+        # estimated for every DataFrame, since it may change a lot
+        # between partitions (e.g. longer strings or lists).
+        if row_memory is None:
+            row_memory = _row_memory_usage(df)
+        return self._sizer.num_rows(row_memory)
 
     def _to_parquet(self, df, sink):
         md = []
+        schema = pa.Schema.from_pandas(df, preserve_index=False)
         df.to_parquet(
             sink,
             row_group_size=self._get_row_group_size(df),
             metadata_collector=md,
-            compression=None,
             index=False,
+            **self.write_profile.pyarrow_kwargs(schema),
         )
         fn = sink.split(self.fs.sep)[-1]
         md[0].set_file_path(fn)
@@ -1129,7 +1878,10 @@ class CPUParquetWriter(BaseParquetWriter):
         # Define "metadata collector" for pyarrow
         _md_collector = []
         _args = [schema]
-        _kwargs = {"metadata_collector": _md_collector}
+        _kwargs = {
+            "metadata_collector": _md_collector,
+            **self.write_profile.pyarrow_kwargs(schema),
+        }
 
         # Use `BaseParquetWriter` logic
         super()._append_writer(path, add_args=_args, add_kwargs=_kwargs)
@@ -1137,19 +1889,52 @@ class CPUParquetWriter(BaseParquetWriter):
         # Keep track of "metadata collector" for pyarrow
         self.md_collectors[path] = _md_collector
 
+    def _to_arrow(self, data):
+        # Convert with the schema of the first chunk, so that the
+        # types are only inferred once per writer (as long as the
+        # columns and dtypes of the data don't change)
+        key = (tuple(data.columns), tuple(str(dtype) for dtype in data.dtypes))
+        if self._schema is not None and key == self._schema[0]:
+            try:
+                return pa.Table.from_pandas(data, schema=self._schema[1], preserve_index=False)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                # e.g. an object column changed type - Fall back to inference
+                pass
+        table = _normalize_dictionaries(pa.Table.from_pandas(data, preserve_index=False))
+        self._schema = (key, table.schema)
+        return table
+
     def _write_table(self, idx, data):
-        table = pa.Table.from_pandas(data, preserve_index=False)
+        table = self._to_arrow(data)
         writer = self._get_or_create_writer(idx, schema=table.schema)
-        writer.write_table(table, row_group_size=self._get_row_group_size(data))
+        row_memory = _row_memory_usage(data)
+        if self._sizer.encoded and self._sizer.ratio is None and len(table):
+            # Encode a sample of the data to get a first
+            # estimate of the encoded size of each row
+            sample = table.slice(0, _MEMORY_SAMPLE_ROWS)
+            sink = pa.BufferOutputStream()
+            pq.write_table(sample, sink, **self.write_profile.pyarrow_kwargs(sample.schema))
+            self._sizer.update(row_memory, sink.tell() / len(sample))
+        start = _writer_position(writer) if self._sizer.encoded else None
+        writer.write_table(table, row_group_size=self._get_row_group_size(data, row_memory))
+        if start is not None and len(table):
+            # Track the encoded size of the data we just wrote
+            end = _writer_position(writer)
+            if end is not None:
+                self._sizer.update(row_memory, (end - start) / len(table))
 
     @classmethod
     def write_special_metadata(cls, data, fs, out_dir):
-        # Sort metadata by file name and convert list of
-        # tuples to a list of metadata byte-blobs
-        md_list = [m[1] for m in sorted(list(data.items()), key=lambda x: natural_sort_key(x[0]))]
+        data = ParquetMetadataShards.from_arg(data)
+
+        # Report the distribution of row-group sizes
+        if data.shards:
+            stats = _describe_sizes(
+                _row_group_sizes(md for entries in data.shards.values() for _, md in entries)
+            )
+            LOG.info(f"Encoded row-group sizes (bytes) of {out_dir}: {stats}")
 
-        # Aggregate metadata and write _metadata file
-        _write_pq_metadata_file_pyarrow(md_list, fs, out_dir)
+        super().write_special_metadata(data, fs, out_dir)
 
     def _close_writers(self):
         _fns = self.fns or [path.split(self.fs.sep)[-1] for path in self.data_paths]
@@ -1158,32 +1943,140 @@ class CPUParquetWriter(BaseParquetWriter):
             _path = self.fs.sep.join([str(self.out_dir), fn])
             if _path in self.md_collectors:
                 self.md_collectors[_path][0].set_file_path(fn)
+                self.row_group_sizes += _row_group_sizes(self.md_collectors[_path])
         return self.md_collectors
 
 
-def _write_pq_metadata_file_cudf(md_list, fs, path):
-    """Converts list of parquet metadata objects into a single shared _metadata file."""
-    if md_list:
-        metadata_path = fs.sep.join([path, "_metadata"])
-        _meta = cudf.io.merge_parquet_filemetadata(md_list) if len(md_list) > 1 else md_list[0]
-        with fs.open(metadata_path, "wb") as fil:
-            fil.write(bytes(_meta))
-    return
-
-
-def _write_pq_metadata_file_pyarrow(md_list, fs, path):
-    """Converts list of parquet metadata objects into a single shared _metadata file."""
-    if md_list:
-        metadata_path = fs.sep.join([path, "_metadata"])
-        _meta = None
-        for md in itertools.chain(*md_list):
-            if _meta is None:
-                _meta = md
+def _writer_position(writer):
+    # Number of bytes written by a `pq.ParquetWriter` so far
+    # (or None if the position of the sink is unknown)
+    try:
+        return (writer.file_handle or writer.where).tell()
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def _normalize_dictionaries(table):
+    # The index type of the Arrow dictionary converted from a pandas
+    # categorical depends on the number of categories. Use int32
+    # indices everywhere, so that the schema of every table written
+    # to the same file matches
+    for i, field in enumerate(table.schema):
+        if pa.types.is_dictionary(field.type) and field.type.index_type != pa.int32():
+            dict_type = pa.dictionary(pa.int32(), field.type.value_type, field.type.ordered)
+            table = table.set_column(i, field.with_type(dict_type), table.column(i).cast(dict_type))
+    return table
+
+
+class ParquetMetadataShards:
+    """Parquet metadata of written files, grouped by directory
+
+    Maps each directory (relative to the output path) to a list of
+    ``(file path, pyarrow.parquet.FileMetaData)`` entries (one per
+    written file), kept in natural order of the file paths. Metadata
+    of many writers is combined with ``merge``, so that the footers of
+    a large dataset can be collected with a tree reduction (rather than
+    on a single task). The row-groups are only appended into a single
+    ``FileMetaData`` object by ``write``, so that the "_metadata" file
+    lists them in the order of the files (even if the files written
+    by different workers interleave).
+
+    Parameters
+    ----------
+    shards : dict, optional
+        Mapping of directory names to lists of ``(file path, FileMetaData)``
+        tuples.
+    per_directory : bool, default False
+        Whether ``write`` should write a separate "_metadata" file
+        to every directory. In this case, the file paths of the
+        row-groups are relative to their own directory (rather
+        than the output path).
+    """
+
+    def __init__(self, shards=None, per_directory=False):
+        self.shards = shards or {}
+        self.per_directory = per_directory
+
+    @classmethod
+    def from_arg(cls, data, per_directory=False):
+        """Convert the "special" metadata returned by a parquet writer
+
+        ``data`` maps file names to ``FileMetaData`` objects (or lists
+        of them), or to serialized footers (written by cudf).
+        """
+        if isinstance(data, cls):
+            return data
+        shards = {}
+        for _, file_md in (data or {}).items():
+            if file_md is None:
+                continue
+            if not isinstance(file_md, (list, tuple)):
+                file_md = [file_md]
+            for md in file_md:
+                if not isinstance(md, pq.FileMetaData):
+                    md = pq.read_metadata(pa.BufferReader(bytes(md)))
+                path = md.row_group(0).column(0).file_path if md.num_row_groups else ""
+                directory, _, fn = path.rpartition("/")
+                if per_directory and md.num_row_groups:
+                    md.set_file_path(fn)
+                shards.setdefault(directory, []).append((path, md))
+        return cls(_sort_shards(shards), per_directory=per_directory)
+
+    @classmethod
+    def merge(cls, parts, per_directory=False):
+        """Merge a list of ``ParquetMetadataShards``
+
+        The row-groups of every directory are ordered by file path,
+        regardless of the order of ``parts``.
+        """
+        shards = {}
+        for part in parts:
+            for directory, entries in part.shards.items():
+                shards.setdefault(directory, []).extend(entries)
+        return cls(_sort_shards(shards), per_directory=per_directory)
+
+    def metadata(self, directory):
+        """Return a single ``FileMetaData`` object for ``directory``"""
+        md = None
+        for _, file_md in self.shards[directory]:
+            if md is None:
+                md = file_md
             else:
-                _meta.append_row_groups(md)
-        with fs.open(metadata_path, "wb") as fil:
-            _meta.write_metadata_file(fil)
-    return
+                md.append_row_groups(file_md)
+        return md
+
+    def write(self, fs, out_dir):
+        """Write the "_metadata" file(s) under ``out_dir``"""
+        directories = sorted(self.shards, key=natural_sort_key)
+        if self.per_directory:
+            for directory in directories:
+                _write_metadata_shard(self.metadata(directory), fs, out_dir, directory)
+        elif directories:
+            md = self.metadata(directories[0])
+            for directory in directories[1:]:
+                md.append_row_groups(self.metadata(directory))
+            _write_metadata_shard(md, fs, out_dir)
+
+    def __repr__(self):
+        return f"ParquetMetadataShards(directories={sorted(self.shards)})"
+
+
+def _sort_shards(shards):
+    # Order the (file path, metadata) entries of every directory by
+    # file path (the sort is stable, so the metadata objects of a
+    # single file keep their order)
+    return {
+        directory: sorted(entries, key=lambda x: natural_sort_key(x[0]))
+        for directory, entries in shards.items()
+    }
+
+
+def _write_metadata_shard(md, fs, path, directory=""):
+    metadata_path = fs.sep.join(
+        [path, directory, "_metadata"] if directory else [path, "_metadata"]
+    )
+    with fs.open(metadata_path, "wb") as fil:
+        md.write_metadata_file(fil)
 
 
 def guid():
@@ -1220,17 +2113,24 @@ def _split_part(x, split):
     return out
 
 
-def _sample_row_group(path, fs, cpu=False, n=1, memory_usage=False, **kwargs):
+def _sample_row_group(
+    path, fs, cpu=False, n=1, memory_usage=False, metadata_cache_path=None, **kwargs
+):
     """Return the first Parquet Row-Group for a given path
 
     The memory_usage of the row-group will also be returned
     if `memory_usage=True`.
     """
     if cpu:
-        with fs.open(path, "rb") as f0:
+        # Re-use the cached footer (if any) rather than
+        # parsing it again from the file
+        md = _read_parquet_metadata(path, fs, cache=get_metadata_cache(metadata_cache_path))
+        # Memory-map local files rather than reading them through fsspec
+        f0 = pa.memory_map(path, "r") if isinstance(fs, LocalFileSystem) else fs.open(path, "rb")
+        with f0:
             # Use pyarrow for CPU version.
             # Pandas does not enable single-row-group access.
-            _df = pq.ParquetFile(f0).read_row_group(0).to_pandas()
+            _df = pq.ParquetFile(f0, metadata=md).read_row_group(0).to_pandas()
     else:
         if cudf.utils.ioutils._is_local_filesystem(fs):
             # Allow cudf to open the file if this is a local file
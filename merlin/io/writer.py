@@ -13,6 +13,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+import collections
 import json
 import math
 import queue
@@ -25,6 +26,7 @@ except ImportError:
     cp = None
 
 import numpy as np
+from dask.utils import parse_bytes
 from fsspec.core import get_fs_token_paths
 
 from merlin.core.dispatch import annotate
@@ -42,6 +44,10 @@ class Writer:
     def write_general_metadata(cls, data, fs, out_dir, schema):
         raise NotImplementedError()
 
+    @classmethod
+    def merge_special_metadata(cls, data_list, per_directory=False):
+        raise NotImplementedError()
+
     @classmethod
     def write_special_metadata(cls, data, fs, out_dir):
         raise NotImplementedError()
@@ -66,6 +72,7 @@ class ThreadedWriter(Writer):
         cpu=False,
         fns=None,
         suffix=None,
+        max_inflight_bytes=None,
     ):
         # set variables
         self.out_dir = out_dir
@@ -101,6 +108,15 @@ class ThreadedWriter(Writer):
         # Resolve file system
         self.fs = fs or get_fs_token_paths(str(out_dir))[0]
 
+        # With `max_inflight_bytes`, `add_data` returns as soon as the
+        # data is queued (as long as the total size of the data that is
+        # queued or being written stays within this budget), so that the
+        # next partition can be computed while this one is written
+        self.max_inflight_bytes = parse_bytes(max_inflight_bytes) if max_inflight_bytes else None
+        self._inflight_bytes = 0
+        self._inflight_cond = threading.Condition()
+        self._write_error = None
+
         # Only use threading if num_threads > 1
         self.queue = None
         if self.num_threads > 1:
@@ -126,7 +142,49 @@ class ThreadedWriter(Writer):
         return
 
     def _write_thread(self):
-        return
+        while True:
+            item = self.queue.get()
+            try:
+                if item is self._eod:
+                    break
+                idx, data, nbytes = item
+                try:
+                    with self.write_locks[idx]:
+                        self._write_table(idx, data)
+                except Exception as exc:  # pylint: disable=broad-except
+                    # Re-raised by the producer (in `add_data` or `close`)
+                    self._write_error = self._write_error or exc
+                finally:
+                    del data
+                    with self._inflight_cond:
+                        self._inflight_bytes -= nbytes
+                        self._inflight_cond.notify_all()
+            finally:
+                self.queue.task_done()
+
+    def _enqueue(self, idx, data):
+        # Queue `data` for the write threads, waiting for earlier
+        # writes to drain if the in-flight byte budget is exhausted.
+        # An item larger than the budget is queued once nothing
+        # else is in flight.
+        nbytes = 0
+        if self.max_inflight_bytes:
+            # (A sampled `deep=True` estimate, so that string and
+            # list columns count with the size of their elements)
+            nbytes = int(_row_memory_usage(data) * len(data))
+            with self._inflight_cond:
+                self._inflight_cond.wait_for(
+                    lambda: self._write_error is not None
+                    or not self._inflight_bytes
+                    or self._inflight_bytes + nbytes <= self.max_inflight_bytes
+                )
+                self._inflight_bytes += nbytes
+        self._raise_write_error()
+        self.queue.put((idx, data, nbytes))
+
+    def _raise_write_error(self):
+        if self._write_error is not None:
+            raise self._write_error
 
     @annotate("add_data", color="orange", domain="merlin_python")
     def add_data(self, df):
@@ -156,10 +214,12 @@ class ThreadedWriter(Writer):
             else:
                 self._add_data_scatter(df)
 
-        # wait for all writes to finish before exiting
-        # (so that we aren't using memory)
         if self.num_threads > 1:
-            self.queue.join()
+            if not self.max_inflight_bytes:
+                # wait for all writes to finish before exiting
+                # (so that we aren't using memory)
+                self.queue.join()
+            self._raise_write_error()
 
     def _add_data_scatter(self, gdf):
         """Write scattered pieces.
@@ -186,7 +246,7 @@ class ThreadedWriter(Writer):
             if self.shuffle:
                 group = shuffle_df(group)
             if self.num_threads > 1:
-                self.queue.put((x, group))
+                self._enqueue(x, group)
             else:
                 self._write_table(x, group)
 
@@ -210,7 +270,7 @@ class ThreadedWriter(Writer):
             to_write = df.iloc[start:end]
             self.num_samples[x] = self.num_samples[x] + to_write.shape[0]
             if self.num_threads > 1:
-                self.queue.put((x, to_write))
+                self._enqueue(x, to_write)
             else:
                 self._write_table(x, to_write)
 
@@ -222,7 +282,7 @@ class ThreadedWriter(Writer):
                 df = shuffle_df(df)
             self.num_samples[x] = self.num_samples[x] + df.shape[0]
             if self.num_threads > 1:
-                self.queue.put((x, df))
+                self._enqueue(x, df)
             else:
                 self._write_table(x, df)
 
@@ -234,7 +294,7 @@ class ThreadedWriter(Writer):
         df = shuffle_df(df) if self.shuffle else df
         self.num_samples[0] = self.num_samples[0] + df.shape[0]
         if self.num_threads > 1:
-            self.queue.put((0, df))
+            self._enqueue(0, df)
         else:
             self._write_table(0, df)
 
@@ -292,6 +352,10 @@ class ThreadedWriter(Writer):
                     except KeyError:
                         pass
 
+    @classmethod
+    def merge_special_metadata(cls, data_list, per_directory=False):
+        return dict(collections.ChainMap(*[data for data in data_list if data]))
+
     @classmethod
     def write_special_metadata(cls, data, fs, out_dir):
         pass
@@ -309,6 +373,7 @@ class ThreadedWriter(Writer):
 
             # wait for pending writes to finish
             self.queue.join()
+            self._raise_write_error()
 
         # Close writers and collect various metadata
         _general_meta = self.package_general_metadata()
@@ -322,3 +387,15 @@ class ThreadedWriter(Writer):
 
     def _bytesio_to_disk(self):
         raise NotImplementedError("In-memory buffering/shuffling not implemented for this format.")
+
+
+# Number of rows used to estimate the memory usage of a DataFrame
+_MEMORY_SAMPLE_ROWS = 10_000
+
+
+def _row_memory_usage(df):
+    # Estimate the in-memory size of each row in `df` from (at most)
+    # `_MEMORY_SAMPLE_ROWS` rows, since `memory_usage(deep=True)` is
+    # slow for object columns
+    sample = df.iloc[:_MEMORY_SAMPLE_ROWS]
+    return sample.memory_usage(deep=True, index=False).sum() / max(len(sample), 1)
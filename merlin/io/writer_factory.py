@@ -16,6 +16,7 @@
 from fsspec.core import get_fs_token_paths
 
 from merlin.io.hugectr import HugeCTRWriter
+from merlin.io.ipc import IPCWriter
 from merlin.io.parquet import CPUParquetWriter, GPUParquetWriter
 
 
@@ -30,11 +31,15 @@ def writer_factory(
     cpu=False,
     fns=None,
     suffix=None,
+    write_profile=None,
+    max_inflight_bytes=None,
 ):
     if output_format is None:
         return None
 
     writer_cls, fs = _writer_cls_factory(output_format, output_path, cpu=cpu)
+    # Only the parquet writers support `write_profile`
+    kwargs = {"write_profile": write_profile} if write_profile is not None else {}
     return writer_cls(
         output_path,
         num_out_files=out_files_per_proc,
@@ -46,18 +51,24 @@ def writer_factory(
         cpu=cpu,
         fns=fns,
         suffix=suffix,
+        max_inflight_bytes=max_inflight_bytes,
+        **kwargs,
     )
 
 
 def _writer_cls_factory(output_format, output_path, cpu=None):
+    writer_cls = _writer_cls(output_format, cpu=cpu)
+    fs = get_fs_token_paths(output_path)[0]
+    return writer_cls, fs
+
+
+def _writer_cls(output_format, cpu=None):
     if output_format == "parquet" and cpu:
-        writer_cls = CPUParquetWriter
+        return CPUParquetWriter
     elif output_format == "parquet":
-        writer_cls = GPUParquetWriter
+        return GPUParquetWriter
     elif output_format == "hugectr":
-        writer_cls = HugeCTRWriter
-    else:
-        raise ValueError("Output format not yet supported.")
-
-    fs = get_fs_token_paths(output_path)[0]
-    return writer_cls, fs
+        return HugeCTRWriter
+    elif output_format == "ipc":
+        return IPCWriter
+    raise ValueError("Output format not yet supported.")
@@ -32,3 +32,76 @@ def test_dictarray_matches_protocols(protocol):
     obj = DictArray({}, {})
 
     assert isinstance(obj, protocol)
+
+
+def test_column_array_interface_shares_memory():
+    values = np.arange(10, dtype=np.int64)
+    column = Column(values)
+
+    assert np.shares_memory(np.asarray(column), values)
+    assert np.shares_memory(np.from_dlpack(column), values)
+
+
+def test_column_arrow_roundtrip_shares_memory():
+    values = np.arange(10, dtype=np.float32)
+    column = Column(values)
+
+    array = column.to_arrow()
+    roundtrip = Column.from_arrow(array)
+
+    assert roundtrip == column
+    assert np.shares_memory(roundtrip.values, values)
+
+
+def test_dictarray_arrow_roundtrip():
+    values = {"a": np.arange(10, dtype=np.int32), "b": np.arange(10, dtype=np.float64)}
+    dictarray = DictArray(values)
+
+    table = dictarray.to_arrow()
+    assert table.column_names == ["a", "b"]
+
+    roundtrip = DictArray.from_arrow(table)
+    for key, value in values.items():
+        assert np.shares_memory(roundtrip[key], value)
+        assert roundtrip.dtypes[key] == value.dtype
+
+
+def test_dictarray_to_pandas_shares_memory():
+    values = {"a": np.arange(10, dtype=np.int32), "b": np.arange(10, dtype=np.float64)}
+    df = DictArray(values).to_pandas()
+
+    assert list(df.columns) == ["a", "b"]
+    for key, value in values.items():
+        assert np.shares_memory(df[key].values, value)
+
+
+def test_column_to_torch_tensor():
+    torch = pytest.importorskip("torch")
+    values = np.arange(10, dtype=np.int64)
+
+    tensor = Column(values).to_tensor("torch")
+    assert tensor.dtype == torch.int64
+    assert np.shares_memory(tensor.numpy(), values)
+
+    # Booleans can't be shared through DLPack, and are converted
+    tensor = Column(values % 2 == 0).to_tensor("torch")
+    assert tensor.dtype == torch.bool
+    assert tensor.tolist() == (values % 2 == 0).tolist()
+
+
+def test_column_to_tf_tensor():
+    tf = pytest.importorskip("tensorflow")
+    values = np.arange(10, dtype=np.float32)
+
+    tensor = Column(values).to_tensor("tf")
+    assert tensor.dtype == tf.float32
+    assert tensor.numpy().tolist() == values.tolist()
+
+    tensor = Column(values > 4).to_tensor("tf")
+    assert tensor.dtype == tf.bool
+    assert tensor.numpy().tolist() == (values > 4).tolist()
+
+
+def test_column_to_tensor_unsupported_framework():
+    with pytest.raises(ValueError):
+        Column(np.arange(10)).to_tensor("jax")
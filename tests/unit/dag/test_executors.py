@@ -17,6 +17,7 @@
 import numpy as np
 import pandas as pd
 
+import merlin.dtypes as md
 from merlin.core.dispatch import make_df
 from merlin.dag import DictArray, Graph
 from merlin.dag.base_operator import BaseOperator
@@ -55,3 +56,15 @@ def test_local_executor_with_dataframe_like():
 
     assert all(result["a"] == df["a"])
     assert "b" not in result.columns
+
+
+def test_local_executor_with_categorical_strings():
+    df = pd.DataFrame({"a": [1, 2, 3], "s": pd.Categorical(["x", "y", "x"])})
+    schema = Schema([ColumnSchema("a", dtype=np.int64), ColumnSchema("s", dtype=md.string)])
+    graph = Graph(["s"] >> BaseOperator())
+    graph.construct_schema(schema)
+
+    result = LocalExecutor().transform(df, [graph.output_node], capture_dtypes=True)
+
+    assert isinstance(result["s"].dtype, pd.CategoricalDtype)
+    assert graph.output_node.output_schema["s"].dtype == md.string
@@ -0,0 +1,73 @@
+#
+# Copyright (c) 2022, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+import merlin.io
+from merlin.io.arrow_engine import ArrowTableDatasetEngine
+
+
+@pytest.fixture
+def df():
+    rows = 10_000
+    return pd.DataFrame(
+        {
+            "a": np.arange(rows),
+            "b": np.random.random(rows),
+            "s": [f"s{i % 7}" for i in range(rows)],
+        }
+    )
+
+
+@pytest.mark.parametrize("npartitions", [1, 3, 7])
+def test_arrow_table_npartitions(df, npartitions):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    ds = merlin.io.Dataset(table, cpu=True, npartitions=npartitions)
+    assert isinstance(ds.engine, ArrowTableDatasetEngine)
+
+    # Row counts are known without computing the partitions
+    assert ds.num_rows == len(df)
+    assert len(ds.partition_lens) == npartitions
+    ddf = ds.to_ddf()
+    assert ds.partition_lens == [len(part) for part in ddf.partitions]
+
+    pd.testing.assert_frame_equal(ddf.compute().reset_index(drop=True), df)
+    pd.testing.assert_frame_equal(
+        ds.to_ddf(columns=["s", "a"]).compute().reset_index(drop=True), df[["s", "a"]]
+    )
+    assert ds.schema.column_names == ["a", "b", "s"]
+
+
+def test_arrow_table_part_size(df):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    ds = merlin.io.Dataset(table, cpu=True, part_size="40KB")
+    assert ds.to_ddf().npartitions == len(ds.partition_lens) > 2
+    assert sum(ds.partition_lens) == len(df)
+    pd.testing.assert_frame_equal(ds.to_ddf().compute().reset_index(drop=True), df)
+
+
+def test_arrow_table_unique_names(df):
+    # Tables with the same shape (that may even share an `id`, once the
+    # first one is garbage collected) never share graph names
+    names = set()
+    for i in range(3):
+        table = pa.Table.from_pandas(df.assign(a=df["a"] + i), preserve_index=False)
+        ddf = merlin.io.Dataset(table, cpu=True, npartitions=2).to_ddf()
+        names.add(ddf._name)
+        del table, ddf
+    assert len(names) == 3
@@ -23,8 +23,10 @@ from dask.dataframe.io.demo import names as name_list
 
 import merlin.io
 
-cudf = pytest.importorskip("cudf")
-dask_cudf = pytest.importorskip("dask_cudf")
+try:
+    import cudf
+except ImportError:
+    cudf = None
 
 # Require uavro and fastavro library.
 # Note that fastavro is only required to write
@@ -37,7 +39,11 @@ pytest.importorskip("uavro")
 @pytest.mark.parametrize("part_size", [None, "1KB"])
 @pytest.mark.parametrize("size", [100, 5000])
 @pytest.mark.parametrize("nfiles", [1, 2])
-def test_avro_basic(tmpdir, part_size, size, nfiles):
+@pytest.mark.parametrize("cpu", [True, False])
+def test_avro_basic(tmpdir, part_size, size, nfiles, cpu):
+    if not cpu and cudf is None:
+        pytest.skip("cudf is required to read avro data on the GPU")
+
     # Define avro schema
     schema = fa.parse_schema(
         {
@@ -72,7 +78,7 @@ def test_avro_basic(tmpdir, part_size, size, nfiles):
         paths = paths[0]
 
     # Read back with dask.dataframe
-    df = merlin.io.Dataset(paths, part_size=part_size, engine="avro").to_ddf()
+    df = merlin.io.Dataset(paths, part_size=part_size, engine="avro", cpu=cpu).to_ddf()
 
     # Check basic length and partition count
     if part_size == "1KB":
@@ -83,3 +89,55 @@ def test_avro_basic(tmpdir, part_size, size, nfiles):
     expect = pd.DataFrame.from_records(records)
     expect["age"] = expect["age"].astype("int32")
     assert_eq(df.compute().reset_index(drop=True), expect)
+
+
+def _write_avro_files(tmpdir, nfiles, size, sync_interval=1000):
+    schema = fa.parse_schema(
+        {
+            "name": "avro.example.User",
+            "type": "record",
+            "fields": [
+                {"name": "name", "type": "string"},
+                {"name": "age", "type": "int"},
+            ],
+        }
+    )
+    paths = [os.path.join(str(tmpdir), f"test.{i}.avro") for i in range(nfiles)]
+    records = []
+    for path in paths:
+        names = np.random.choice(name_list, size)
+        ages = np.random.randint(18, 100, size)
+        data = [{"name": names[i], "age": ages[i]} for i in range(size)]
+        with open(path, "wb") as f:
+            fa.writer(f, schema, data, sync_interval=sync_interval)
+        records += data
+    return paths, records
+
+
+@pytest.mark.parametrize("cpu", [True, False])
+def test_avro_block_index(tmpdir, monkeypatch, cpu):
+    if not cpu and cudf is None:
+        pytest.skip("cudf is required to read avro data on the GPU")
+    from merlin.io import avro
+
+    paths, records = _write_avro_files(tmpdir, 3, 5000)
+    ds = merlin.io.Dataset(paths, part_size="1KB", engine="avro", cpu=cpu)
+    assert ds.num_rows == len(records)
+    assert ds.partition_lens == [len(part) for part in ds.to_ddf().partitions]
+    # The lengths are computed once
+    assert ds.partition_lens is ds.partition_lens
+
+    # Every file is scanned once, and the
+    # partitions are read from the cached index
+    scans = []
+    scan_blocks = avro.ua.core.scan_blocks
+
+    def _counting_scan(fo, *args):
+        scans.append(fo)
+        return scan_blocks(fo, *args)
+
+    monkeypatch.setattr(avro.ua.core, "scan_blocks", _counting_scan)
+    df = merlin.io.Dataset(paths, part_size="1KB", engine="avro", cpu=cpu).to_ddf()
+    assert df.npartitions > len(paths)
+    assert len(df.compute()) == len(records)
+    assert not scans
@@ -0,0 +1,163 @@
+#
+# Copyright (c) 2022, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import os
+import pickle
+import subprocess
+import sys
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import fsspec
+import numpy as np
+import pandas as pd
+from fsspec.implementations.local import LocalFileSystem
+from fsspec.implementations.memory import MemoryFileSystem
+
+import merlin.io
+from merlin.io import block_cache, fsspec_utils
+from merlin.io.block_cache import BlockCache, BlockCacheFileSystem
+from merlin.io.metadata_cache import file_identity
+
+
+class CountingFileSystem(LocalFileSystem):
+    """Local file system that counts the calls to `open`"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.opened = 0
+
+    def _open(self, *args, **kwargs):
+        self.opened += 1
+        return super()._open(*args, **kwargs)
+
+
+def _write_file(tmpdir, nbytes=100_000):
+    data = np.random.default_rng(0).integers(0, 255, nbytes, dtype="uint8").tobytes()
+    path = str(tmpdir.join("data.bin"))
+    with open(path, "wb") as f:
+        f.write(data)
+    return path, data
+
+
+def test_block_cache_read(tmpdir):
+    path, data = _write_file(tmpdir)
+    fs = CountingFileSystem(skip_instance_cache=True)
+    cache = BlockCache(str(tmpdir.join("cache")), block_size=4096)
+
+    for start, end in [(0, 10), (5000, 20_000), (99_000, 200_000), (10, 10)]:
+        assert cache.read(fs, path, start, end) == data[start:end]
+    fetched = fs.opened
+
+    # Cached blocks are not fetched again
+    assert cache.read(fs, path, 4096, 16_000) == data[4096:16_000]
+    assert fs.opened == fetched
+
+    # Modifying the file invalidates its blocks
+    with open(path, "wb") as f:
+        f.write(data[::-1])
+    os.utime(path, (0, 0))
+    assert cache.read(fs, path, 4096, 16_000) == data[::-1][4096:16_000]
+    assert fs.opened > fetched
+
+    cache = pickle.loads(pickle.dumps(cache))
+    assert cache.read(fs, path, 0, 10) == data[::-1][:10]
+
+
+def test_block_cache_eviction(tmpdir):
+    path, data = _write_file(tmpdir)
+    fs = LocalFileSystem()
+    cache = BlockCache(str(tmpdir.join("cache")), max_bytes=40_000, block_size=4096)
+
+    for start in range(0, len(data), 4096):
+        assert cache.read(fs, path, start, start + 4096) == data[start : start + 4096]
+    assert cache.nbytes() <= 40_000
+
+    # The most-recently-used blocks are kept
+    last = (len(data) - 1) // 4096 * 4096
+    assert cache._get(_prefix(fs, path), last // 4096) == data[last:]
+
+
+def _prefix(fs, path):
+    return file_identity(fs, path)
+
+
+def test_block_cache_shared_across_processes(tmpdir):
+    path, data = _write_file(tmpdir)
+    cache_dir = str(tmpdir.join("cache"))
+    cache = BlockCache(cache_dir, block_size=4096)
+    assert cache.read(LocalFileSystem(), path, 0, len(data)) == data
+    blocks = sorted(path for _, _, path in cache._scan())
+
+    # Another process reads the same blocks, without writing new ones
+    script = (
+        "from fsspec.implementations.local import LocalFileSystem\n"
+        "from merlin.io.block_cache import BlockCache\n"
+        f"cache = BlockCache({cache_dir!r}, block_size=4096)\n"
+        f"data = cache.read(LocalFileSystem(skip_instance_cache=True), {path!r}, 0, {len(data)})\n"
+        f"assert len(data) == {len(data)}\n"
+    )
+    root = os.path.dirname(os.path.dirname(merlin.io.__file__))
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([root, os.environ.get("PYTHONPATH", "")])}
+    subprocess.run([sys.executable, "-c", script], check=True, env=env)
+    assert sorted(path for _, _, path in cache._scan()) == blocks
+
+
+def test_block_cache_dataset(tmpdir):
+    df = pd.DataFrame({"a": np.arange(10_000), "b": np.random.random(10_000)})
+    path = f"memory://{uuid.uuid4().hex}"
+    memory_fs = fsspec.filesystem("memory")
+    memory_fs.mkdir(path)
+    with memory_fs.open(f"{path}/part.0.parquet", "wb") as f:
+        df.to_parquet(f, row_group_size=1000)
+
+    cache_dir = str(tmpdir.join("cache"))
+    ds = merlin.io.Dataset(path, engine="parquet", cpu=True, block_cache=cache_dir)
+    assert isinstance(ds.engine.fs, BlockCacheFileSystem)
+    pd.testing.assert_frame_equal(ds.to_ddf().compute().reset_index(drop=True), df)
+    assert BlockCache(cache_dir).nbytes() > 0
+
+
+def test_block_cache_nested_fetch(tmpdir, monkeypatch):
+    # Reading through the cache from the (bounded) fetch pool
+    # fetches the missing blocks inline, rather than deadlocking
+    monkeypatch.setattr(fsspec_utils, "_MAX_FETCH_WORKERS", 2)
+    monkeypatch.setattr(fsspec_utils, "_FETCH_POOL", None)
+    data = np.random.default_rng(0).integers(0, 255, 32_000, dtype="uint8").tobytes()
+    mem = MemoryFileSystem(skip_instance_cache=True)
+    mem.pipe_file("/f.bin", data)
+    cache = BlockCache(str(tmpdir.join("cache")), block_size=1000)
+    for start in range(0, len(data), 2000):
+        cache.read(mem, "/f.bin", start, start + 1000)
+    bfs = BlockCacheFileSystem(mem, cache)
+
+    # Every range spans two runs of missing blocks
+    starts = list(range(0, len(data), 4000))
+    ends = [start + 4000 for start in starts]
+    future = ThreadPoolExecutor(1).submit(
+        fsspec_utils._cat_ranges, bfs, ["/f.bin"] * len(starts), starts, ends
+    )
+    assert b"".join(future.result(timeout=60)) == data
+    fsspec_utils._fetch_pool().shutdown()
+
+
+def test_block_cache_info_limit(tmpdir, monkeypatch):
+    monkeypatch.setattr(block_cache, "_MAX_CACHED_INFOS", 3)
+    mem = MemoryFileSystem(skip_instance_cache=True)
+    bfs = BlockCacheFileSystem(mem, BlockCache(str(tmpdir.join("cache"))))
+    for i in range(5):
+        mem.pipe_file(f"/f-{i}.bin", b"x" * i)
+        assert bfs.info(f"/f-{i}.bin")["size"] == i
+    assert list(bfs._infos) == ["/f-2.bin", "/f-3.bin", "/f-4.bin"]
@@ -0,0 +1,146 @@
+#
+# Copyright (c) 2022, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import dask.dataframe as dd
+import numpy as np
+import pandas as pd
+import pytest
+from fsspec.implementations.local import LocalFileSystem
+
+import merlin.io
+from merlin.io import csv
+
+
+@pytest.fixture
+def csv_dir(tmpdir):
+    rows = 20_000
+    df = pd.DataFrame(
+        {
+            "timestamp": pd.date_range("2022-01-01", periods=rows, freq="s").astype(str),
+            "id": np.arange(rows),
+            "x": np.random.random(rows),
+            "name": [None if i % 13 == 0 else f"name-{i % 5}" for i in range(rows)],
+        }
+    )
+    df.iloc[: rows // 2].to_csv(str(tmpdir.join("dataset-0.csv")), index=False)
+    df.iloc[rows // 2 :].to_csv(str(tmpdir.join("dataset-1.csv")), index=False)
+    return str(tmpdir)
+
+
+def _read_expected(path, **kwargs):
+    return pd.concat(
+        [pd.read_csv(f"{path}/dataset-{i}.csv", **kwargs) for i in range(2)]
+    ).reset_index(drop=True)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {},
+        {"usecols": ["x", "id"], "dtype": {"id": "int32"}},
+        {"header": None, "names": ["t", "i", "x", "n"], "skiprows": 1},
+    ],
+)
+def test_csv_arrow_reader(csv_dir, kwargs):
+    ds = merlin.io.Dataset(csv_dir, engine="csv", cpu=True, part_size="50KB", **kwargs)
+    # `skiprows` is not supported by the pyarrow reader
+    assert (ds.engine._arrow_csv_options is None) == ("skiprows" in kwargs)
+
+    ddf = ds.to_ddf()
+    assert ddf.npartitions == dd.read_csv(f"{csv_dir}/*.csv", blocksize="50KB").npartitions
+    assert ddf.npartitions == sum(len(parts) for parts in ds.engine._file_partition_map.values())
+    result = ddf.compute().reset_index(drop=True)
+    pd.testing.assert_frame_equal(result, _read_expected(csv_dir, **kwargs))
+
+
+def test_csv_block_index_cached(csv_dir, monkeypatch):
+    calls = []
+    _csv_block_offsets = csv._csv_block_offsets
+
+    def _counting_offsets(fs, path, *args):
+        calls.append(path)
+        return _csv_block_offsets(fs, path, *args)
+
+    monkeypatch.setattr(csv, "_csv_block_offsets", _counting_offsets)
+
+    ds = merlin.io.Dataset(csv_dir, engine="csv", cpu=True, part_size="40KB")
+    ds.to_ddf()
+    assert len(calls) == 2
+    # A new Dataset reuses the cached index
+    merlin.io.Dataset(csv_dir, engine="csv", cpu=True, part_size="40KB").to_ddf()
+    assert len(calls) == 2
+
+
+def test_csv_block_offsets(tmpdir):
+    path = str(tmpdir.join("data.csv"))
+    lines = [b"a" * 10, b"b" * 300, b"c", b"d" * 50]
+    with open(path, "wb") as f:
+        f.write(b"\n".join(lines) + b"\n")
+    fs = LocalFileSystem()
+    offsets = csv._csv_block_offsets(fs, path, fs.size(path), 100)
+    data = open(path, "rb").read()
+    blocks = [data[start:end] for start, end in zip(offsets[:-1], offsets[1:])]
+    assert b"".join(blocks) == data
+    # Every block holds whole lines (or nothing)
+    assert all(not block or block.endswith(b"\n") for block in blocks)
+    assert b"" in blocks
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"header": None, "names": ["t", "i", "x", "n"]}])
+def test_csv_partition_lens(tmpdir, monkeypatch, kwargs):
+    # Blank lines and "\r\n" terminators are not counted as rows
+    lines = [f"2022-01-01,{i},{i * 0.5},name-{i}" for i in range(5000)]
+    with open(str(tmpdir.join("dataset-0.csv")), "w", newline="") as f:
+        f.write("t,i,x,n\r\n" + "\r\n".join(lines[:2000]) + "\r\n\r\n")
+    with open(str(tmpdir.join("dataset-1.csv")), "w") as f:
+        f.write("t,i,x,n\n" + "\n\n".join(lines[2000:]))
+    if kwargs:
+        kwargs["skiprows"] = 1
+
+    ds = merlin.io.Dataset(str(tmpdir), engine="csv", cpu=True, part_size="20KB", **kwargs)
+    if "skiprows" in kwargs:
+        # Rows can't be counted without parsing
+        assert ds.partition_lens is None
+        return
+
+    # Counting rows doesn't parse the blocks
+    read_csv_block = csv._read_csv_block
+    monkeypatch.setattr(csv, "_read_csv_block", None)
+    assert ds.num_rows == len(lines)
+    assert len(ds.partition_lens) > 2
+
+    monkeypatch.setattr(csv, "_read_csv_block", read_csv_block)
+    ddf = ds.to_ddf()
+    assert ds.partition_lens == [len(part) for part in ddf.partitions]
+    assert len(ds.to_iter()) == len(lines)
+
+    # The GPU reader splits the files differently
+    monkeypatch.setattr(ds.engine, "cpu", False)
+    assert ds.partition_lens is None
+    assert ds.num_rows == len(lines)
+
+
+@pytest.mark.parametrize("names", [None, ["t", "i", "x", "n"]])
+def test_csv_no_header(tmpdir, names):
+    df = pd.DataFrame({"t": ["a", "b"] * 500, "i": range(1000), "x": np.arange(1000) * 0.5})
+    df["n"] = "name"
+    df.to_csv(str(tmpdir.join("dataset-0.csv")), index=False, header=False)
+
+    ds = merlin.io.Dataset(str(tmpdir), engine="csv", cpu=True, header=None, names=names)
+    assert ds.engine._arrow_csv_options is not None
+    result = ds.to_ddf().compute().reset_index(drop=True)
+    expected = pd.read_csv(str(tmpdir.join("dataset-0.csv")), header=None, names=names)
+    pd.testing.assert_frame_equal(result, expected)
+    assert ds.num_rows == len(df)
@@ -0,0 +1,36 @@
+#
+# Copyright (c) 2022, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import numpy as np
+import pandas as pd
+
+import merlin.io
+from merlin.io.dataframe_engine import DataFrameDatasetEngine
+
+
+def test_dataframe_partition_lens():
+    df = pd.DataFrame({"a": np.arange(100), "b": np.random.random(100)})
+
+    # In-memory partitions have known lengths
+    ds = merlin.io.Dataset(df, cpu=True, npartitions=3)
+    assert isinstance(ds.engine, DataFrameDatasetEngine)
+    assert ds.partition_lens == [len(part) for part in ds.to_ddf().partitions]
+    assert ds.num_rows == len(df)
+    assert len(ds.to_iter(columns=["a"])) == len(df)
+
+    # Lazy partitions don't
+    ds = merlin.io.Dataset(ds.to_ddf().map_partitions(lambda part: part[part.a % 2 == 0]))
+    assert ds.partition_lens is None
+    assert ds.num_rows == len(ds.to_iter()) == 50
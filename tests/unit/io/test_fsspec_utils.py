@@ -0,0 +1,168 @@
+#
+# Copyright (c) 2022, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import io
+import pickle
+
+import fsspec
+import numpy as np
+import pytest
+from fsspec.implementations.local import LocalFileSystem
+
+from merlin.io import fsspec_utils
+
+
+class CountingFileSystem(LocalFileSystem):
+    """Local file system that counts the calls to `open`"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.opened = 0
+
+    def _open(self, *args, **kwargs):
+        self.opened += 1
+        return super()._open(*args, **kwargs)
+
+
+def _write_file(tmpdir, nbytes=100_000):
+    data = np.random.default_rng(0).integers(0, 255, nbytes, dtype="uint8").tobytes()
+    path = str(tmpdir.join("data.bin"))
+    with open(path, "wb") as f:
+        f.write(data)
+    return path, data
+
+
+def test_cat_ranges_reuses_handles(tmpdir, monkeypatch):
+    monkeypatch.setattr(fsspec_utils, "_MAX_FETCH_WORKERS", 4)
+    path, data = _write_file(tmpdir)
+    fs = CountingFileSystem(skip_instance_cache=True)
+
+    starts = list(range(0, 100_000, 1000))
+    ends = [start + 500 for start in starts]
+    out = fsspec_utils._cat_ranges(fs, [path] * len(starts), starts, ends)
+    assert out == [data[start:end] for start, end in zip(starts, ends)]
+    # One handle per task, rather than one per range
+    assert fs.opened <= 4
+
+
+def test_fsspec_data_transfer_byte_ranges(tmpdir):
+    path, data = _write_file(tmpdir)
+    fs = LocalFileSystem()
+
+    byte_ranges = [(0, 100), (200, 300), (50_000, 1000), (99_000, 1000)]
+    buf = fsspec_utils._fsspec_data_transfer(
+        path, fs, byte_ranges=byte_ranges, bytes_per_thread=1000, max_gap=0
+    )
+    assert isinstance(buf, io.BytesIO)
+    result = buf.getvalue()
+    assert len(result) == len(data)
+    for offset, nbytes in byte_ranges:
+        assert result[offset : offset + nbytes] == data[offset : offset + nbytes]
+
+
+def test_range_stats_model():
+    stats = fsspec_utils._RangeStats()
+    assert stats.coalescing(64_000, 256_000_000) == (64_000, 256_000_000)
+    for nbytes in [1_000, 100_000, 1_000_000, 10_000_000] * 10:
+        stats.observe(nbytes, 0.05 + nbytes / 100e6)
+    latency, bandwidth = stats.model()
+    assert abs(latency - 0.05) < 1e-6
+    assert abs(bandwidth - 100e6) / 100e6 < 1e-6
+    # Gap is latency * bandwidth, block is capped by `max_block`
+    assert stats.coalescing(64_000, 50_000_000) == (pytest.approx(5_000_000, rel=1e-3), 50_000_000)
+
+
+def test_fs_token():
+    fs = fsspec.filesystem("memory")
+    assert fsspec_utils._fs_token(fs) == "memory"
+    token = fsspec_utils._fs_token(fsspec.filesystem("memory", skip_instance_cache=True))
+    assert token == "memory"
+
+    class ConfiguredFileSystem:
+        protocol = ("s3", "s3a")
+
+        def __init__(self, **storage_options):
+            self.storage_options = storage_options
+
+    token = fsspec_utils._fs_token(ConfiguredFileSystem(anon=True, key="a"))
+    assert token.startswith("s3-")
+    assert token == fsspec_utils._fs_token(ConfiguredFileSystem(key="a", anon=True))
+    assert token != fsspec_utils._fs_token(ConfiguredFileSystem(key="b", anon=True))
+
+
+def test_merge_ranges_adaptive():
+    fsspec_utils.reset_range_fetch_stats()
+    fs = LocalFileSystem()
+    byte_ranges = [(0, 100), (10_100, 100), (1_000_000, 100)]
+
+    # Default gap threshold until request costs are known
+    assert fsspec_utils._merge_ranges(byte_ranges, fs=fs) == [(0, 10_200), (1_000_000, 100)]
+
+    # Expensive requests - Coalesce across the large gap
+    stats = fsspec_utils._range_stats(fs)
+    for nbytes in [1_000, 1_000_000] * 4:
+        stats.observe(nbytes, 0.1 + nbytes / 10e6)
+    assert fsspec_utils._merge_ranges(byte_ranges, fs=fs) == [(0, 1_000_100)]
+    # An explicit gap threshold is always respected
+    assert len(fsspec_utils._merge_ranges(byte_ranges, max_gap=0, fs=fs)) == 3
+
+    # The stats are shared by every instance with the same options
+    assert fsspec_utils._range_stats(pickle.loads(pickle.dumps(fs))) is stats
+    summary = fsspec_utils.range_fetch_stats("file")
+    assert summary["requests_saved"] == 1 + 2
+    assert summary["bytes_over_read"] == 10_000 + (10_000 + 989_800)
+    assert summary["max_gap"] == pytest.approx(1_000_000, rel=1e-3)
+    fsspec_utils.reset_range_fetch_stats()
+
+
+class AsyncStyleFileSystem:
+    """Fake async file system, whose `cat_ranges` advances a fake
+    clock by one latency per batch, plus the transfer time"""
+
+    async_impl = True
+    protocol = "async-style"
+
+    def __init__(self, data, latency=0.05, bandwidth=100e6):
+        self.data = data
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.now = 0.0
+
+    def perf_counter(self):
+        return self.now
+
+    def cat_ranges(self, paths, starts, ends, batch_size=None):
+        out = [self.data[start:end] for start, end in zip(starts, ends)]
+        rounds = -(-len(out) // batch_size)
+        self.now += self.latency * rounds + sum(len(data) for data in out) / self.bandwidth
+        return out
+
+
+def test_range_stats_async(monkeypatch):
+    fsspec_utils.reset_range_fetch_stats()
+    fs = AsyncStyleFileSystem(b"x" * 20_000_000)
+    monkeypatch.setattr(fsspec_utils.time, "perf_counter", fs.perf_counter)
+
+    # Concurrent calls with few and many ranges of different sizes
+    for count, size in [(1, 1_000), (8, 1_000_000), (40, 10_000), (64, 200_000), (3, 5_000_000)]:
+        starts = [i * size % 10_000_000 for i in range(count)]
+        ends = [start + size for start in starts]
+        fsspec_utils._cat_ranges(fs, ["f"] * count, starts, ends, max_workers=16)
+
+    latency, bandwidth = fsspec_utils._range_stats(fs).model()
+    assert latency == pytest.approx(0.05, rel=1e-3)
+    assert bandwidth == pytest.approx(100e6, rel=1e-3)
+    assert fsspec_utils.range_fetch_stats("async-style")["requests"] == 1 + 8 + 40 + 64 + 3
+    fsspec_utils.reset_range_fetch_stats()
@@ -0,0 +1,100 @@
+#
+# Copyright (c) 2022, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+from fsspec.implementations.local import LocalFileSystem
+
+import merlin.io
+from merlin.io import ipc
+from merlin.io.ipc import IPCDatasetEngine
+
+
+@pytest.fixture
+def df():
+    rows = 10_000
+    return pd.DataFrame(
+        {
+            "a": np.arange(rows),
+            "b": np.random.random(rows),
+            "s": [f"s{i % 7}" for i in range(rows)],
+        }
+    )
+
+
+def test_ipc_roundtrip(tmpdir, df):
+    output_path = str(tmpdir.join("out"))
+    merlin.io.Dataset(df, cpu=True, npartitions=4).to_ipc(output_path, out_files_per_proc=2)
+
+    ds = merlin.io.Dataset(output_path, engine="ipc", cpu=True, part_size="40KB")
+    assert isinstance(ds.engine, IPCDatasetEngine)
+    ddf = ds.to_ddf()
+    assert ddf.npartitions == len(ds.engine.pieces) > 2
+    assert ds.num_rows == len(df)
+    assert ds.partition_lens == [len(part) for part in ddf.partitions]
+    assert sum(len(parts) for parts in ds.file_partition_map.values()) == ddf.npartitions
+
+    result = ddf.compute().sort_values("a").reset_index(drop=True)
+    pd.testing.assert_frame_equal(result, df)
+    assert list(ds.to_ddf(columns=["s", "a"]).compute().columns) == ["s", "a"]
+
+
+def test_ipc_feather_files(tmpdir, df):
+    # Record batches are packed into partitions
+    path = str(tmpdir.join("data.feather"))
+    with pa.ipc.new_file(path, pa.Schema.from_pandas(df, preserve_index=False)) as writer:
+        writer.write_table(pa.Table.from_pandas(df, preserve_index=False), max_chunksize=1000)
+
+    ds = merlin.io.Dataset(path, cpu=True, part_size="50KB", engine="feather")
+    assert ds.engine.pieces[0][1:3] == (0, 3)
+    assert ds.num_rows == len(df)
+    pd.testing.assert_frame_equal(ds.to_ddf().compute().reset_index(drop=True), df)
+
+
+def test_ipc_batch_index_from_metadata(tmpdir, df, monkeypatch):
+    # The batch index is read from the footer and the message
+    # metadata, without fetching the record batch bodies
+    path = str(tmpdir.join("data.arrow"))
+    table = pa.Table.from_pandas(pd.concat([df] * 10), preserve_index=False)
+    with pa.ipc.new_file(path, table.schema) as writer:
+        writer.write_table(table, max_chunksize=10_000)
+
+    fetched = []
+    _cat_ranges = ipc._cat_ranges
+
+    def _counting_cat_ranges(*args, **kwargs):
+        out = _cat_ranges(*args, **kwargs)
+        fetched.extend(len(data) for data in out)
+        return out
+
+    monkeypatch.setattr(ipc, "_cat_ranges", _counting_cat_ranges)
+    index = np.frombuffer(ipc._scan_batch_index(LocalFileSystem(), path, os.path.getsize(path)))
+    index = index.view("int64").reshape(-1, 2)
+    reader = pa.ipc.open_file(path)
+    assert index[:, 0].tolist() == [reader.get_batch(i).num_rows for i in range(10)]
+    assert all(index[:, 1] >= [reader.get_batch(i).nbytes for i in range(10)])
+    assert sum(fetched) < os.path.getsize(path) / 4
+
+
+def test_ipc_writer_empty_partition(tmpdir):
+    writer = ipc.IPCWriter(str(tmpdir), cpu=True)
+    writer._write_table(0, pd.DataFrame({"a": np.array([], "int64")}))
+    writer._write_table(0, pd.DataFrame({"a": np.arange(3)}))
+    writer._close_writers()
+    assert pa.ipc.open_file(writer.data_paths[0]).read_all()["a"].to_pylist() == [0, 1, 2]
@@ -0,0 +1,95 @@
+#
+# Copyright (c) 2022, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import json
+
+import pyarrow as pa
+import pytest
+
+import merlin.io
+from merlin.io.jsonl import JSONLDatasetEngine
+
+
+@pytest.fixture
+def records():
+    return [
+        {
+            "id": i,
+            "x": i * 0.5,
+            "tags": list(range(i % 4)),
+            "name": f"name-{i}" if i % 3 == 0 else None,
+        }
+        for i in range(5000)
+    ]
+
+
+def _write_jsonl(path, records):
+    with open(path, "w") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+
+def test_jsonl_blocks(tmpdir, records):
+    _write_jsonl(str(tmpdir.join("data-0.jsonl")), records[:2500])
+    _write_jsonl(str(tmpdir.join("data-1.jsonl")), records[2500:])
+
+    ds = merlin.io.Dataset(str(tmpdir), engine="jsonl", cpu=True, part_size="20KB")
+    assert isinstance(ds.engine, JSONLDatasetEngine)
+    ddf = ds.to_ddf()
+    assert ddf.npartitions > 2
+    assert ddf.npartitions == sum(len(parts) for parts in ds.file_partition_map.values())
+
+    result = ddf.compute().reset_index(drop=True)
+    assert result["id"].tolist() == [record["id"] for record in records]
+    assert result["x"].tolist() == [record["x"] for record in records]
+    assert [list(tags) for tags in result["tags"]] == [record["tags"] for record in records]
+    assert result["name"].tolist() == [record["name"] for record in records]
+    # Nested arrays are read as list columns
+    assert ds.engine._schema.field("tags").type == pa.list_(pa.int64())
+    assert ds.schema["tags"].is_list
+
+
+def test_jsonl_explicit_schema(tmpdir, records):
+    path = str(tmpdir.join("data.jsonl"))
+    _write_jsonl(path, records)
+    json_schema = pa.schema([("id", pa.int32()), ("tags", pa.list_(pa.int16()))])
+
+    ds = merlin.io.Dataset(path, engine="jsonl", cpu=True, json_schema=json_schema)
+    result = ds.to_ddf().compute()
+    assert list(result.columns) == ["id", "tags"]
+    assert result["id"].dtype == "int32"
+    assert result["tags"].iloc[3].dtype == "int16"
+
+
+def test_jsonl_partition_lens(tmpdir, records):
+    _write_jsonl(str(tmpdir.join("data-0.jsonl")), records[:2500])
+    _write_jsonl(str(tmpdir.join("data-1.jsonl")), records[2500:])
+
+    ds = merlin.io.Dataset(str(tmpdir), engine="jsonl", cpu=True, part_size="20KB")
+    assert ds.num_rows == len(records)
+    assert ds.partition_lens == [len(part) for part in ds.to_ddf().partitions]
+
+
+def test_jsonl_large_records(tmpdir):
+    # Records larger than the default pyarrow block size (1MB)
+    records = [{"id": i, "tags": list(range(300_000))} for i in range(3)]
+    path = str(tmpdir.join("data.jsonl"))
+    _write_jsonl(path, records)
+
+    ds = merlin.io.Dataset(path, engine="jsonl", cpu=True, part_size="2MB")
+    assert ds.to_ddf().npartitions > 1
+    result = ds.to_ddf().compute().reset_index(drop=True)
+    assert result["id"].tolist() == [0, 1, 2]
+    assert [len(tags) for tags in result["tags"]] == [300_000] * 3
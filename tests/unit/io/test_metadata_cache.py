@@ -0,0 +1,154 @@
+#
+# Copyright (c) 2022, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import os
+
+import fsspec
+import pandas as pd
+import pytest
+from pyarrow import parquet as pq
+
+import merlin.io
+from merlin.io import parquet
+from merlin.io.metadata_cache import FileMetadataCache, file_identity
+
+
+@pytest.fixture
+def pq_paths(tmpdir):
+    paths = []
+    for i in range(3):
+        path = str(tmpdir.join(f"part.{i}.parquet"))
+        pd.DataFrame({"a": range(i * 10, i * 10 + 10), "b": [1.0] * 10}).to_parquet(
+            path, row_group_size=4
+        )
+        paths.append(path)
+    return paths
+
+
+def test_file_identity_changes_with_file(tmpdir):
+    fs = fsspec.filesystem("file")
+    path = str(tmpdir.join("data.parquet"))
+    pd.DataFrame({"a": range(10)}).to_parquet(path)
+    before = file_identity(fs, path)
+    pd.DataFrame({"a": range(100)}).to_parquet(path)
+    assert file_identity(fs, path) != before
+
+
+def test_parquet_footer_cached(pq_paths, monkeypatch):
+    fs = fsspec.filesystem("file")
+    cache = FileMetadataCache()
+    reads = []
+
+    def _counting_read(fs, path, info=None):
+        reads.append(path)
+        return _read_parquet_footer(fs, path, info)
+
+    _read_parquet_footer = parquet._read_parquet_footer
+    monkeypatch.setattr(parquet, "_read_parquet_footer", _counting_read)
+
+    for _ in range(2):
+        for path in pq_paths:
+            md = parquet._read_parquet_metadata(path, fs, cache=cache)
+            assert md.num_rows == 10
+            assert md.num_row_groups == 3
+
+    assert reads == pq_paths
+    assert len(cache) == len(pq_paths)
+
+
+def test_metadata_cache_sidecar(tmpdir, pq_paths):
+    fs = fsspec.filesystem("file")
+    sidecar = str(tmpdir.join("footers.cache"))
+
+    cache = FileMetadataCache(sidecar_path=sidecar)
+    for path in pq_paths:
+        parquet._read_parquet_metadata(path, fs, cache=cache)
+    cache.flush()
+    assert os.path.exists(sidecar)
+
+    # A new cache (e.g. in another process) starts from the sidecar
+    reloaded = FileMetadataCache(sidecar_path=sidecar)
+    assert len(reloaded) == len(pq_paths)
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("footer should have been cached")
+
+    for path in pq_paths:
+        footer = reloaded.get("parquet-footer", fs, path, _fail)
+        assert footer
+
+
+def test_metadata_cache_sidecar_format(tmpdir, pq_paths):
+    # The sidecar is a plain parquet table (nothing is unpickled)
+    fs = fsspec.filesystem("file")
+    sidecar = str(tmpdir.join("footers.cache"))
+    cache = FileMetadataCache(sidecar_path=sidecar)
+    parquet._read_parquet_metadata(pq_paths[0], fs, cache=cache)
+    cache.flush()
+    table = pq.read_table(sidecar)
+    assert table.column_names == ["kind", "protocol", "path", "size", "version", "value"]
+    assert table.column("path").to_pylist() == [pq_paths[0]]
+
+    # Unreadable sidecars are ignored
+    with open(sidecar, "wb") as f:
+        f.write(b"not a parquet file")
+    assert len(FileMetadataCache(sidecar_path=sidecar)) == 0
+
+
+def test_metadata_cache_max_bytes():
+    cache = FileMetadataCache(max_bytes=10)
+    cache.put("a", b"12345")
+    cache.put("b", b"12345")
+    cache.put("c", b"12345")
+    assert "a" not in cache
+    assert "b" in cache and "c" in cache
+
+
+def test_dataset_partition_lens_with_sidecar(tmpdir, pq_paths):
+    sidecar = str(tmpdir.join("footers.cache"))
+    ds = merlin.io.Dataset(
+        pq_paths, engine="parquet", cpu=True, part_size="1KB", metadata_cache_path=sidecar
+    )
+    assert ds.num_rows == 30
+    assert sum(ds.partition_lens) == 30
+    assert os.path.exists(sidecar)
+
+
+def test_read_parquet_footers_bulk(tmpdir, pq_paths):
+    fs = fsspec.filesystem("file")
+
+    # Add a file with a footer larger than the initial tail sample
+    wide_path = str(tmpdir.join("wide.parquet"))
+    pd.DataFrame({f"column_{i}": [i] for i in range(2000)}).to_parquet(wide_path)
+    paths = pq_paths + [wide_path]
+
+    cache = FileMetadataCache()
+    metadata = parquet._read_parquet_metadata_many(paths, fs, cache=cache)
+    assert list(metadata) == paths
+    assert [metadata[path].num_rows for path in pq_paths] == [10, 10, 10]
+    assert metadata[wide_path].num_columns == 2000
+    assert len(cache) == len(paths)
+
+    # Footers match what pyarrow reads from the full file
+    for path in paths:
+        assert metadata[path].equals(pq.ParquetFile(path).metadata)
+
+
+def test_read_parquet_footers_invalid(tmpdir):
+    fs = fsspec.filesystem("file")
+    path = str(tmpdir.join("data.csv"))
+    pd.DataFrame({"a": range(10)}).to_csv(path)
+    with pytest.raises(ValueError, match="not a valid parquet file"):
+        parquet._read_parquet_footers(fs, [path])
@@ -0,0 +1,467 @@
+#
+# Copyright (c) 2022, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import logging
+import os
+import uuid
+
+import dask.dataframe as dd
+import fsspec
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from fsspec.implementations.local import LocalFileSystem
+
+import merlin.dtypes as md
+import merlin.io
+from merlin.io import lookup_index, parquet
+from merlin.schema import ColumnSchema, Schema, Tags
+
+
+@pytest.fixture
+def pq_path(tmpdir):
+    path = str(tmpdir.join("data.parquet"))
+    df = pd.DataFrame({"a": range(1000), "b": [str(i) for i in range(1000)]})
+    df.to_parquet(path, row_group_size=100)
+    return path
+
+
+@pytest.mark.parametrize("columns", [None, ["b"]])
+def test_parquet_filter_pushdown(pq_path, columns, monkeypatch):
+    pushdown_reads = []
+    _read_table_pushdown = parquet._read_table_pushdown
+
+    def _counting_read(path, *args):
+        pushdown_reads.append(path)
+        return _read_table_pushdown(path, *args)
+
+    monkeypatch.setattr(parquet, "_read_table_pushdown", _counting_read)
+
+    filters = [("a", ">=", 150), ("a", "<", 170)]
+    ds = merlin.io.Dataset(
+        pq_path, engine="parquet", cpu=True, part_size="1KB", filters=filters, filter_pushdown=True
+    )
+    result = ds.to_ddf(columns=columns).compute()
+
+    expected = pd.read_parquet(pq_path, filters=filters)
+    expected = expected[columns] if columns else expected
+    pd.testing.assert_frame_equal(result.reset_index(drop=True), expected)
+    assert pushdown_reads == [pq_path]
+
+    # The footer row counts don't account for the filtered rows
+    assert ds.partition_lens is None
+    assert ds.num_rows == len(expected)
+    assert len(ds.to_iter()) == len(expected)
+
+
+def test_parquet_partition_plan_bytes(tmpdir):
+    # One file with small row-groups, and one with large row-groups
+    df = pd.DataFrame({"a": range(3000), "b": ["x" * 50] * 3000})
+    df.iloc[:1000].to_parquet(str(tmpdir.join("0.parquet")), row_group_size=50)
+    df.iloc[1000:].to_parquet(str(tmpdir.join("1.parquet")), row_group_size=500)
+
+    ds = merlin.io.Dataset(
+        str(tmpdir), engine="parquet", cpu=True, part_size="30KB", partition_plan="bytes"
+    )
+    ddf = ds.to_ddf()
+    plan = ds.engine.partition_plan
+    assert isinstance(plan, parquet.ParquetPartitionPlan)
+    assert ddf.npartitions == plan.npartitions == 8
+    assert ds.engine._partition_lens == plan.num_rows == [len(part) for part in ddf.partitions]
+    # Row-groups from different files are never packed together
+    assert all(len({path for path, _ in part}) == 1 for part in plan)
+    pd.testing.assert_frame_equal(ddf.compute().reset_index(drop=True), df)
+
+
+def test_parquet_partition_plan_explicit(pq_path):
+    plan = parquet.ParquetPartitionPlan(
+        [[(pq_path, 0), (pq_path, 1), (pq_path, 2)], [(pq_path, 9)]]
+    )
+    ds = merlin.io.Dataset(pq_path, engine="parquet", cpu=True, partition_plan=plan)
+    result = ds.to_ddf().compute().reset_index(drop=True)
+    expected = pd.read_parquet(pq_path).iloc[list(range(300)) + list(range(900, 1000))]
+    pd.testing.assert_frame_equal(result, expected.reset_index(drop=True))
+    assert ds.engine._partition_lens == [300, 100]
+
+
+def test_parquet_local_memory_map(pq_path, monkeypatch):
+    local_reads = []
+    _read_table_local = parquet._read_table_local
+
+    def _counting_read(path, *args):
+        local_reads.append(path)
+        return _read_table_local(path, *args)
+
+    monkeypatch.setattr(parquet, "_read_table_local", _counting_read)
+
+    ds = merlin.io.Dataset(pq_path, engine="parquet", cpu=True, part_size="4KB")
+    result = ds.to_ddf(columns=["b"]).compute()
+    pd.testing.assert_frame_equal(result.reset_index(drop=True), pd.read_parquet(pq_path)[["b"]])
+    assert len(local_reads) == ds.to_ddf().npartitions
+
+
+@pytest.mark.parametrize("columns", [None, ["b"]])
+def test_parquet_remote_byte_ranges(tmpdir, columns, monkeypatch):
+    fs = fsspec.filesystem("memory")
+    path = f"memory://{uuid.uuid4().hex}/data.parquet"
+    df = pd.DataFrame(
+        {"a": range(1000), "b": [str(i) for i in range(1000)], "c": np.random.random(1000)},
+        index=pd.Index(range(1000, 2000), name="idx"),
+    )
+    with fs.open(path, "wb") as f:
+        df.to_parquet(f, row_group_size=100)
+
+    fetched = []
+    _cat_ranges = parquet._cat_ranges
+
+    def _counting_cat_ranges(fs, paths, starts, ends, **kwargs):
+        fetched.extend(end - start for start, end in zip(starts, ends))
+        return _cat_ranges(fs, paths, starts, ends, **kwargs)
+
+    monkeypatch.setattr(parquet, "_cat_ranges", _counting_cat_ranges)
+
+    ds = merlin.io.Dataset(path, engine="parquet", cpu=True, part_size="4KB")
+    ddf = ds.to_ddf(columns=columns)
+    fetched.clear()
+    result = ddf.compute()
+    expected = df.reset_index(drop=True)
+    expected = expected[columns] if columns else expected
+    pd.testing.assert_frame_equal(result.reset_index(drop=True), expected)
+    # Only the column chunks of the selected columns are fetched
+    if columns:
+        assert 0 < sum(fetched) < fs.size(path) / 2
+
+
+@pytest.mark.parametrize("prefetch", [0, 1, 3])
+def test_parquet_to_iter_prefetch(pq_path, prefetch):
+    ds = merlin.io.Dataset(pq_path, engine="parquet", cpu=True, part_size="1KB")
+    npartitions = ds.to_ddf().npartitions
+    assert npartitions > 3
+
+    _iter = ds.to_iter(columns=["a"], epochs=2, prefetch=prefetch)
+    parts = list(_iter)
+    assert len(parts) == 2 * npartitions
+    assert all(list(part.columns) == ["a"] for part in parts)
+    result = pd.concat(parts).reset_index(drop=True)
+    expected = pd.concat([pd.read_parquet(pq_path)[["a"]]] * 2).reset_index(drop=True)
+    pd.testing.assert_frame_equal(result, expected)
+    assert len(_iter) == len(result)
+
+    # Stopping early doesn't hang or leak the prefetched partitions
+    first = next(iter(ds.to_iter(prefetch=prefetch)))
+    assert len(first)
+
+
+@pytest.mark.parametrize("filter_pushdown", [False, True])
+def test_parquet_read_dictionary(tmpdir, filter_pushdown):
+    path = str(tmpdir.join("data.parquet"))
+    # Later row-groups have many more categories than the first ones
+    df = pd.DataFrame(
+        {"a": range(1000), "s": [f"v{i % 7}" if i < 500 else f"w{i}" for i in range(1000)]}
+    )
+    df.to_parquet(path, row_group_size=100)
+
+    schema = Schema(
+        [
+            ColumnSchema("a", dtype=md.int64),
+            ColumnSchema("s", dtype=md.string, tags=[Tags.CATEGORICAL]),
+        ]
+    )
+    ds = merlin.io.Dataset(
+        path,
+        engine="parquet",
+        cpu=True,
+        part_size="4KB",
+        schema=schema,
+        read_dictionary=True,
+        filters=[("a", ">=", 0)],
+        filter_pushdown=filter_pushdown,
+    )
+    assert ds.engine.read_dictionary == ["s"]
+    ddf = ds.to_ddf()
+    assert isinstance(ddf._meta["s"].dtype, pd.CategoricalDtype)
+    result = ddf.compute()
+    assert isinstance(result["s"].dtype, pd.CategoricalDtype)
+    assert result["s"].astype(str).tolist() == df["s"].tolist()
+
+    # Categoricals are written as dictionaries
+    output_path = str(tmpdir.join("output"))
+    ds.to_parquet(output_path, out_files_per_proc=1)
+    written = pd.read_parquet(f"{output_path}/part_0.parquet")
+    assert isinstance(written["s"].dtype, pd.CategoricalDtype)
+    assert written["s"].astype(str).tolist() == df["s"].tolist()
+
+
+@pytest.mark.parametrize("num_threads", [0, 2])
+def test_parquet_write_profile(tmpdir, num_threads):
+    df = pd.DataFrame(
+        {"a": range(1000), "b": [str(i % 10) for i in range(1000)], "c": [[1, 2]] * 1000}
+    )
+    ds = merlin.io.Dataset(df, cpu=True)
+    ds.schema["a"] = ds.schema["a"].with_tags([Tags.CONTINUOUS])
+
+    profile = parquet.ParquetWriteProfile(
+        compression="snappy",
+        column_compression={Tags.CONTINUOUS: ("zstd", 3), "c": "lz4"},
+        write_statistics=["a"],
+    )
+    output_path = str(tmpdir.join("output"))
+    ds.to_parquet(output_path, write_profile=profile, num_threads=num_threads)
+
+    row_group = pq.read_metadata(f"{output_path}/part_0.parquet").row_group(0)
+    columns = [row_group.column(i) for i in range(row_group.num_columns)]
+    assert [col.compression for col in columns] == ["ZSTD", "SNAPPY", "LZ4"]
+    assert [col.is_stats_set for col in columns] == [True, False, False]
+    pd.testing.assert_frame_equal(pd.read_parquet(f"{output_path}/part_0.parquet"), df)
+
+
+def test_parquet_write_profile_compression_level(tmpdir):
+    # The default level doesn't apply to codecs without levels
+    df = pd.DataFrame({"a": range(1000), "b": [str(i % 10) for i in range(1000)]})
+    profile = parquet.ParquetWriteProfile(
+        compression="zstd", compression_level=9, column_compression={"b": "snappy"}
+    )
+    output_path = str(tmpdir.join("output"))
+    merlin.io.Dataset(df, cpu=True).to_parquet(output_path, write_profile=profile)
+
+    row_group = pq.read_metadata(f"{output_path}/part_0.parquet").row_group(0)
+    assert [row_group.column(i).compression for i in range(2)] == ["ZSTD", "SNAPPY"]
+    assert profile.pyarrow_kwargs(pa.schema([("a", pa.int64()), ("b", pa.string())]))[
+        "compression_level"
+    ] == {"a": 9}
+
+
+def test_parquet_write_profile_default(tmpdir):
+    df = pd.DataFrame({"a": range(100)})
+    output_path = str(tmpdir.join("output"))
+    merlin.io.Dataset(df, cpu=True).to_parquet(output_path)
+    assert pq.read_metadata(f"{output_path}/part_0.parquet").row_group(0).column(0).compression == (
+        "UNCOMPRESSED"
+    )
+
+
+def test_parquet_adaptive_row_group_size(tmpdir, caplog):
+    # The rows of the second half of the data are much wider
+    narrow = pd.DataFrame({"a": range(20000), "s": ["x"] * 20000})
+    wide = pd.DataFrame({"a": range(20000), "s": ["y" * 200 + str(i) for i in range(20000)]})
+    ddf = dd.from_pandas(pd.concat([narrow, wide], ignore_index=True), npartitions=8)
+    ds = merlin.io.Dataset(ddf, cpu=True)
+
+    output_path = str(tmpdir.join("memory"))
+    ds.to_parquet(output_path, write_profile={"row_group_size": "200KB"})
+    metadata = pq.read_metadata(f"{output_path}/part_0.parquet")
+    rows = [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)]
+    # Wide rows get (much) smaller row-groups
+    assert max(rows[-5:]) * 2 < max(rows[:5])
+
+    output_path = str(tmpdir.join("encoded"))
+    with caplog.at_level(logging.INFO, logger="merlin"):
+        ds.to_parquet(
+            output_path, write_profile={"compression": "zstd", "row_group_encoded_size": "20KB"}
+        )
+    metadata = pq.read_metadata(f"{output_path}/part_0.parquet")
+    sizes = parquet._row_group_sizes([metadata])
+    assert max(sizes) < 2 * 20_000
+    assert "Encoded row-group sizes" in caplog.text
+
+
+@pytest.mark.parametrize("max_inflight_bytes", [None, 1, "1MB"])
+def test_parquet_pipelined_write(tmpdir, max_inflight_bytes):
+    df = pd.DataFrame({"a": range(10000), "b": [str(i % 7) for i in range(10000)]})
+    ds = merlin.io.Dataset(dd.from_pandas(df, npartitions=5), cpu=True)
+
+    output_path = str(tmpdir.join("output"))
+    ds.to_parquet(output_path, output_files=2, num_threads=2, max_inflight_bytes=max_inflight_bytes)
+    result = merlin.io.Dataset(output_path, engine="parquet", cpu=True).to_ddf().compute()
+    pd.testing.assert_frame_equal(result.reset_index(drop=True), df)
+
+
+def test_parquet_pipelined_write_string_bytes(tmpdir, monkeypatch):
+    # The in-flight budget counts the characters of string columns
+    writer = parquet.CPUParquetWriter(
+        str(tmpdir), num_out_files=1, num_threads=2, cpu=True, max_inflight_bytes="1MB"
+    )
+    queued = []
+    put = writer.queue.put
+
+    def _recording_put(item):
+        if isinstance(item, tuple):
+            queued.append(item[2])
+        put(item)
+
+    monkeypatch.setattr(writer.queue, "put", _recording_put)
+    df = pd.DataFrame({"s": ["x" * 1000] * 1000})
+    writer.add_data(df)
+    writer.close()
+    assert queued[0] >= 1000 * 1000
+
+
+def test_parquet_pipelined_write_error(tmpdir):
+    writer = parquet.CPUParquetWriter(
+        str(tmpdir), num_out_files=2, num_threads=2, cpu=True, max_inflight_bytes="1MB"
+    )
+    writer.add_data(pd.DataFrame({"a": range(10)}))
+    # The second file has a different schema than the first
+    with pytest.raises(ValueError):
+        writer.add_data(pd.DataFrame({"a": ["x"] * 10}))
+        writer.close()
+
+
+@pytest.mark.parametrize("split_every", [2, 32])
+def test_parquet_metadata_tree_reduction(tmpdir, monkeypatch, split_every):
+    monkeypatch.setattr(merlin.io.dask, "_METADATA_SPLIT_EVERY", split_every)
+    df = pd.DataFrame({"a": range(1200), "b": [i % 3 for i in range(1200)]})
+    ds = merlin.io.Dataset(dd.from_pandas(df, npartitions=12), cpu=True)
+
+    output_path = str(tmpdir.join("output"))
+    ds.to_parquet(output_path, output_files=12)
+    metadata = pq.read_metadata(f"{output_path}/_metadata")
+    assert metadata.num_rows == len(df)
+    paths = [metadata.row_group(i).column(0).file_path for i in range(metadata.num_row_groups)]
+    assert paths == [f"part_{i}.parquet" for i in range(12)]
+
+
+def test_parquet_metadata_interleaved_workers(tmpdir):
+    # Two workers write interleaved files, and their (merged)
+    # metadata is gathered in an arbitrary order
+    output_path = str(tmpdir)
+    worker_results = []
+    for indices in [(1, 3), (0, 2, 10)]:
+        special_md = {}
+        for i in indices:
+            fn = f"part_{i}.parquet"
+            collector = []
+            pq.write_table(
+                pa.table({"a": [i] * 10}), f"{output_path}/{fn}", metadata_collector=collector
+            )
+            collector[0].set_file_path(fn)
+            special_md[f"{output_path}/{fn}"] = collector
+        worker_results.append(merlin.io.dask._merge_metadata([({}, special_md)], "parquet", True))
+
+    _, merged = merlin.io.dask._merge_metadata(worker_results, "parquet", True)
+    parquet.CPUParquetWriter.write_special_metadata(merged, LocalFileSystem(), output_path)
+
+    metadata = pq.read_metadata(f"{output_path}/_metadata")
+    paths = [metadata.row_group(i).column(0).file_path for i in range(metadata.num_row_groups)]
+    assert paths == [f"part_{i}.parquet" for i in (0, 1, 2, 3, 10)]
+
+
+@pytest.mark.parametrize("per_directory", [True, False])
+def test_parquet_per_directory_metadata(tmpdir, per_directory):
+    # Metadata of the files written by two writers, each
+    # writing a file to every (hive-partition) directory
+    output_path = str(tmpdir)
+    writer_metadata = []
+    for i in range(2):
+        special_md = {}
+        for b in range(3):
+            fn = f"b={b}/part.{i}.parquet"
+            os.makedirs(f"{output_path}/b={b}", exist_ok=True)
+            collector = []
+            pq.write_table(
+                pa.table({"a": range(10)}), f"{output_path}/{fn}", metadata_collector=collector
+            )
+            collector[0].set_file_path(fn)
+            special_md[fn] = collector
+        writer_metadata.append(special_md)
+
+    merged = parquet.CPUParquetWriter.merge_special_metadata(
+        [
+            parquet.CPUParquetWriter.merge_special_metadata([md], per_directory=per_directory)
+            for md in writer_metadata
+        ],
+        per_directory=per_directory,
+    )
+    parquet.CPUParquetWriter.write_special_metadata(merged, LocalFileSystem(), output_path)
+
+    def _paths(path):
+        metadata = pq.read_metadata(path)
+        return [metadata.row_group(i).column(0).file_path for i in range(metadata.num_row_groups)]
+
+    if per_directory:
+        assert not os.path.exists(f"{output_path}/_metadata")
+        for b in range(3):
+            assert _paths(f"{output_path}/b={b}/_metadata") == ["part.0.parquet", "part.1.parquet"]
+    else:
+        assert _paths(f"{output_path}/_metadata") == [
+            f"b={b}/part.{i}.parquet" for b in range(3) for i in range(2)
+        ]
+
+
+def test_parquet_lookup_index(tmpdir):
+    df = pd.DataFrame({"user": range(20000), "item": [f"i{i % 50}" for i in range(20000)]})
+    ds = merlin.io.Dataset(dd.from_pandas(df, npartitions=4), cpu=True)
+    ds.schema["user"] = ds.schema["user"].with_tags([Tags.USER_ID])
+
+    output_path = str(tmpdir.join("output"))
+    ds.to_parquet(
+        output_path,
+        output_files=2,
+        lookup_index=[Tags.USER_ID, "item"],
+        write_profile={"row_group_size": "16KB"},
+    )
+    result = merlin.io.Dataset(output_path, engine="parquet", cpu=True)
+
+    # Only the row-groups holding the requested users are read
+    index = lookup_index.LookupIndex.read(result.engine.fs, output_path)
+    assert index.columns == ["user", "item"]
+    candidates = index.candidates("user", [3, 15000])
+    assert sum(len(rgs) for rgs in candidates.values()) == 2
+    assert index.table.num_rows > 2
+
+    pd.testing.assert_frame_equal(
+        result.lookup("user", [3, 15000, 10**6]).reset_index(drop=True),
+        df.iloc[[3, 15000]].reset_index(drop=True),
+    )
+    assert len(result.lookup("item", ["i7"], columns=["user"])) == 400
+    assert len(result.lookup("user", [-1])) == 0
+    with pytest.raises(ValueError):
+        result.lookup("missing", [1])
+
+
+@pytest.mark.parametrize("sort_by,cluster_by", [(["b", "a"], None), (None, ["a", "b"])])
+def test_parquet_sorted_write(tmpdir, sort_by, cluster_by):
+    rng = np.random.default_rng(42)
+    df = pd.DataFrame({"a": rng.integers(0, 10000, 10000), "b": rng.integers(0, 100, 10000)})
+    ds = merlin.io.Dataset(dd.from_pandas(df, npartitions=4), cpu=True)
+
+    output_path = str(tmpdir.join("output"))
+    ds.to_parquet(
+        output_path,
+        output_files=2,
+        sort_by=sort_by,
+        cluster_by=cluster_by,
+        write_profile={"row_group_size": "16KB"},
+    )
+    result = merlin.io.Dataset(output_path, engine="parquet", cpu=True).to_ddf().compute()
+    assert sorted(map(tuple, result.values)) == sorted(map(tuple, df.values))
+    if sort_by:
+        expect = result.sort_values(sort_by, kind="stable")
+        assert result[sort_by].values.tolist() == expect[sort_by].values.tolist()
+
+    # The row-groups cover a small range of the (leading) key columns
+    metadata = pq.read_metadata(f"{output_path}/_metadata")
+    for name in sort_by[:1] if sort_by else cluster_by:
+        i = ["a", "b"].index(name)
+        stats = [metadata.row_group(j).column(i).statistics for j in range(4)]
+        assert max(st.max - st.min for st in stats) < {"a": 9000, "b": 90}[name]
+
+
+def test_parquet_sorted_write_shuffle(tmpdir):
+    ds = merlin.io.Dataset(pd.DataFrame({"a": range(10)}), cpu=True)
+    with pytest.raises(ValueError):
+        ds.to_parquet(str(tmpdir), sort_by="a", shuffle=merlin.io.Shuffle.PER_PARTITION)